@@ -0,0 +1,213 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Benchmark suite for the matcher and synchronizer, at directory scale.
+
+Synthetic directories are fed through the dummy LDAP / PostgreSQL clients,
+reporting the time, throughput and peak memory of each synchronization phase.
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from importlib.metadata import version
+from typing import Callable
+
+from postgresql_ldap_sync.clients import DummyLDAPClient, DummyPostgresClient
+from postgresql_ldap_sync.matcher import DefaultMatcher, VectorMatcher
+from postgresql_ldap_sync.models import GroupMembers, Snapshot
+from postgresql_ldap_sync.syncher import Synchronizer
+
+SCALES = {
+    "small": (1_000, 100),
+    "medium": (10_000, 1_000),
+    "large": (100_000, 10_000),
+    "xlarge": (1_000_000, 50_000),
+}
+
+USER_ACTIONS = ["CREATE", "DELETE", "KEEP"]
+GROUP_ACTIONS = ["CREATE", "DELETE", "KEEP"]
+MEMBER_ACTIONS = ["GRANT", "REVOKE", "KEEP"]
+
+MATCHERS = {
+    "default": DefaultMatcher,
+    "vector": VectorMatcher,
+}
+
+
+@dataclass
+class PhaseResult:
+    """Class to store the measurements of a synchronization phase."""
+
+    seconds: float
+    peak_bytes: int
+
+
+@dataclass
+class CaseResult:
+    """Class to store the measurements of a benchmark case."""
+
+    users: int
+    groups: int
+    edges: int
+    skew: float
+    drift: float
+    phases: dict[str, PhaseResult] = field(default_factory=dict)
+    edges_per_second: float = 0.0
+
+
+def generate_snapshot(users: int, groups: int, groups_per_user: int, skew: float) -> Snapshot:
+    """Generate a synthetic directory, with Zipf-like skewed group sizes."""
+    rng = random.Random(0)
+
+    user_names = [f"user_{i:07d}" for i in range(users)]
+    group_names = [f"group_{i:05d}" for i in range(groups)]
+    group_weights = [1 / (rank + 1) ** skew for rank in range(groups)]
+    cum_weights = list(itertools.accumulate(group_weights))
+
+    group_users = {group: [] for group in group_names}
+    for user in user_names:
+        for group in set(rng.choices(group_names, cum_weights=cum_weights, k=groups_per_user)):
+            group_users[group].append(user)
+
+    return Snapshot(
+        users=user_names,
+        groups=group_names,
+        memberships=[GroupMembers(g, u) for g, u in group_users.items() if u],
+    )
+
+
+def drift_snapshot(snapshot: Snapshot, drift: float) -> Snapshot:
+    """Generate a drifted copy of a snapshot, to simulate a PostgreSQL side out of sync."""
+    rng = random.Random(1)
+    keep = lambda _: rng.random() >= drift
+
+    return Snapshot(
+        users=[user for user in snapshot.users if keep(user)] + ["stale_user"],
+        groups=[group for group in snapshot.groups if keep(group)] + ["stale_group"],
+        memberships=[
+            GroupMembers(m.group, [user for user in m.users if keep(user)])
+            for m in snapshot.memberships
+            if keep(m.group)
+        ],
+    )
+
+
+def measure(func: Callable, trace_memory: bool) -> tuple[object, PhaseResult]:
+    """Measure the wall-clock time and, optionally, the peak memory of a function call."""
+    gc.collect()
+
+    if trace_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+
+    peak_bytes = 0
+    if trace_memory:
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return result, PhaseResult(seconds=seconds, peak_bytes=peak_bytes)
+
+
+def run_phases(
+    ldap_snapshot: Snapshot,
+    psql_snapshot: Snapshot,
+    args: argparse.Namespace,
+    trace_memory: bool,
+) -> dict:
+    """Run the fetch, plan and apply phases of a synchronization cycle."""
+    matcher = MATCHERS[args.matcher](keep_matches=args.keep_matches)
+    ldap_client = DummyLDAPClient(
+        ldap_snapshot.users, ldap_snapshot.groups, ldap_snapshot.memberships
+    )
+    psql_client = DummyPostgresClient(
+        psql_snapshot.users, psql_snapshot.groups, psql_snapshot.memberships
+    )
+    synchronizer = Synchronizer(
+        ldap_client=ldap_client,
+        psql_client=psql_client,
+        entity_matcher=matcher,
+    )
+
+    fetch_func = lambda: (ldap_client.search_snapshot(), psql_client.search_snapshot())
+    _, fetch = measure(fetch_func, trace_memory)
+
+    plan_func = lambda: synchronizer.plan(USER_ACTIONS, GROUP_ACTIONS, MEMBER_ACTIONS)
+    sync_plan, plan = measure(plan_func, trace_memory)
+
+    apply_func = lambda: synchronizer.execute(sync_plan)
+    _, apply = measure(apply_func, trace_memory)
+
+    return {"fetch": fetch, "plan": plan, "apply": apply}
+
+
+def run_case(users: int, groups: int, args: argparse.Namespace) -> CaseResult:
+    """Run a benchmark case, measuring time and memory in separate passes."""
+    ldap_snapshot = generate_snapshot(users, groups, args.groups_per_user, args.skew)
+    psql_snapshot = drift_snapshot(ldap_snapshot, args.drift)
+
+    timed_phases = run_phases(ldap_snapshot, psql_snapshot, args, trace_memory=False)
+    if args.memory:
+        traced_phases = run_phases(ldap_snapshot, psql_snapshot, args, trace_memory=True)
+        for name, phase in timed_phases.items():
+            phase.peak_bytes = traced_phases[name].peak_bytes
+
+    edges = sum(len(m.users) for m in ldap_snapshot.memberships)
+    total_seconds = sum(phase.seconds for phase in timed_phases.values())
+
+    return CaseResult(
+        users=users,
+        groups=groups,
+        edges=edges,
+        skew=args.skew,
+        drift=args.drift,
+        phases=timed_phases,
+        edges_per_second=(edges / total_seconds if total_seconds else 0.0),
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the benchmark command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", default="small,medium", help=f"Any of {list(SCALES)}")
+    parser.add_argument("--groups-per-user", type=int, default=3)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of group sizes")
+    parser.add_argument("--drift", type=float, default=0.05, help="Ratio of out-of-sync entities")
+    parser.add_argument("--memory", action="store_true", help="Measure peak memory per phase")
+    parser.add_argument("--matcher", default="default", choices=list(MATCHERS))
+    parser.add_argument("--keep-matches", action="store_true", help="Generate KEEP matches too")
+    parser.add_argument("--output", default="-", help="JSON results file, or '-' for stdout")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmark suite, and report its results as JSON."""
+    args = parse_args()
+    cases = [run_case(*SCALES[scale], args) for scale in args.scales.split(",")]
+
+    results = {
+        "package_version": version("postgresql-ldap-sync"),
+        "python_version": platform.python_version(),
+        "matcher": args.matcher,
+        "cases": [asdict(case) for case in cases],
+    }
+
+    if args.output == "-":
+        json.dump(results, sys.stdout, indent=2)
+    else:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
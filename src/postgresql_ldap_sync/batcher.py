@@ -0,0 +1,54 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from collections import defaultdict
+from typing import (
+    Iterable,
+    Iterator,
+)
+
+from .models.group_matches import GroupMembershipMatch
+from .models.membership_batches import MembershipBatch
+
+
+class DefaultBatcher:
+    """Class to batch group memberships into multi-role statements."""
+
+    def __init__(self, max_batch_size: int = 1000):
+        """Initialize the batcher with the maximum number of memberships per batch."""
+        if max_batch_size < 1:
+            raise ValueError("The maximum batch size must be a positive number")
+
+        self._max_batch_size = max_batch_size
+
+    def _split_batch(
+        self,
+        groups: tuple[str, ...],
+        users: tuple[str, ...],
+    ) -> Iterator[MembershipBatch]:
+        """Split a range of groups and users into batches of the maximum size."""
+        groups_step = min(len(groups), self._max_batch_size)
+
+        for i in range(0, len(groups), groups_step):
+            groups_chunk = groups[i : i + groups_step]
+            users_step = max(1, self._max_batch_size // len(groups_chunk))
+
+            for j in range(0, len(users), users_step):
+                users_chunk = users[j : j + users_step]
+                yield MembershipBatch(groups=groups_chunk, users=users_chunk)
+
+    def batch_group_memberships(
+        self,
+        matches: Iterable[GroupMembershipMatch],
+    ) -> Iterator[MembershipBatch]:
+        """Generate batch objects for the group memberships, grouped by user set."""
+        group_users = defaultdict(set)
+        for match in matches:
+            group_users[match.group_name].add(match.user_name)
+
+        users_groups = defaultdict(list)
+        for group, users in group_users.items():
+            users_groups[frozenset(users)].append(group)
+
+        for users, groups in users_groups.items():
+            yield from self._split_batch(tuple(sorted(groups)), tuple(sorted(users)))
@@ -4,3 +4,5 @@
 from .base import BaseLDAPClient
 from .dummy import DummyLDAPClient
 from .glauth import GLAuthClient
+from .glauth_async import AsyncGLAuthClient
+from .syncrepl import SyncreplLDAPClient
@@ -1,10 +1,11 @@
 # Copyright 2025 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import time
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import Iterable, Iterator
 
-from ...models import GroupMembers
+from ...models import GroupMembers, ScopeIndex, Snapshot, SyncScope
 
 
 class BaseLDAPClient(ABC):
@@ -24,3 +25,50 @@ class BaseLDAPClient(ABC):
     def search_group_memberships(self) -> Iterable[GroupMembers]:
         """Search for LDAP group memberships."""
         raise NotImplementedError()
+
+    def search_snapshot(self) -> Snapshot:
+        """Search for LDAP users, groups and group memberships at once."""
+        return Snapshot(
+            users=list(self.search_users()),
+            groups=list(self.search_groups()),
+            memberships=[
+                GroupMembers(m.group, list(m.users)) for m in self.search_group_memberships()
+            ],
+        )
+
+    def search_scoped_snapshot(self, scope: SyncScope) -> Snapshot:
+        """Search for LDAP groups within a scope, together with their memberships and users.
+
+        Clients without scoped search support filter a complete snapshot instead.
+        """
+        snapshot = self.search_snapshot()
+        index = ScopeIndex.from_memberships(snapshot.memberships, scope)
+
+        return index.to_snapshot(groups=filter(scope.contains, snapshot.groups))
+
+    def search_changes(self, since: str) -> Snapshot:
+        """Search for LDAP users, groups and group memberships changed since a watermark.
+
+        Clients without change tracking support return a complete snapshot instead.
+        """
+        return self.search_snapshot()
+
+    def listen_changes(self, timeout: float = 30.0) -> Iterator[Snapshot]:
+        """Listen for LDAP changes, yielding a complete snapshot first, and then the changes.
+
+        Clients without change notifications support poll for changes every timeout seconds.
+        """
+        snapshot = self.search_snapshot()
+        watermark = snapshot.watermark
+        yield snapshot
+
+        while True:
+            time.sleep(timeout)
+
+            if watermark:
+                snapshot = self.search_changes(watermark)
+            else:
+                snapshot = self.search_snapshot()
+
+            watermark = snapshot.watermark or watermark
+            yield snapshot
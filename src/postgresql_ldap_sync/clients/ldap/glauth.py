@@ -1,34 +1,201 @@
 # Copyright 2025 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import itertools
 import logging
-from typing import Iterator
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
 
 import ldap
+from ldap.controls import SimplePagedResultsControl
+from ldap.filter import escape_filter_chars
+from ldap.ldapobject import LDAPObject
 
-from ...models import GroupMembers
+from ...metrics import BaseMetrics, NoopMetrics
+from ...models import GroupMembers, ScopeIndex, Snapshot, SyncScope
 from .base import BaseLDAPClient
 
 logger = logging.getLogger()
 
 
+class DefaultLDAPPool:
+    """Default LDAP pool of bound connections, opened lazily.
+
+    Connections idle for longer than the liveness interval get checked before being
+    handed out, and those found dead (or failing with SERVER_DOWN) get discarded,
+    so that the next checkout binds a new one.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        bind_username: str,
+        bind_password: str,
+        size: int = 1,
+        liveness_interval: float = 60.0,
+        checkout_timeout: float = 30.0,
+        metrics: BaseMetrics | None = None,
+    ):
+        """Initialize the pool, up to the size number of connections in use at once.
+
+        Borrowing a connection fails after the checkout timeout when all are in use
+        (e.g. interleaving more search generators than connections in a thread).
+        """
+        if size < 1:
+            raise ValueError("The pool size must be a positive number")
+
+        self._uri = uri
+        self._bind_username = bind_username
+        self._bind_password = bind_password
+        self._liveness_interval = liveness_interval
+        self._checkout_timeout = checkout_timeout
+        self._metrics = metrics or NoopMetrics()
+
+        self._idle: list[tuple[LDAPObject, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> LDAPObject:
+        """Open a new connection to the LDAP server, and bind to it."""
+        client = ldap.initialize(self._uri)
+        client.simple_bind_s(self._bind_username, self._bind_password)
+        self._metrics.increment("ldap_connections_total")
+        return client
+
+    @staticmethod
+    def _disconnect(client: LDAPObject) -> None:
+        """Close a connection to the LDAP server, ignoring errors as it may be dead already."""
+        try:
+            client.unbind_s()
+        except ldap.LDAPError:
+            pass
+
+    @staticmethod
+    def _is_alive(client: LDAPObject) -> bool:
+        """Check whether a connection is still usable, with a cheap round-trip."""
+        try:
+            client.whoami_s()
+        except ldap.LDAPError:
+            return False
+        else:
+            return True
+
+    def _checkout(self) -> LDAPObject:
+        """Take an idle connection from the pool, or open a new one."""
+        with self._lock:
+            client, last_used = self._idle.pop() if self._idle else (None, 0.0)
+
+        if client and time.monotonic() - last_used > self._liveness_interval:
+            if not self._is_alive(client):
+                logger.info("Discarding dead LDAP connection")
+                self._metrics.increment("ldap_reconnections_total")
+                self._disconnect(client)
+                client = None
+
+        return client or self._connect()
+
+    @contextmanager
+    def connection(self) -> Iterator[LDAPObject]:
+        """Borrow a bound connection, waiting for one when all of them are in use."""
+        if not self._slots.acquire(timeout=self._checkout_timeout):
+            raise TimeoutError("No LDAP connection available within the checkout timeout")
+
+        try:
+            client = self._checkout()
+            healthy = True
+
+            try:
+                yield client
+            except ldap.SERVER_DOWN:
+                healthy = False
+                raise
+            finally:
+                if healthy:
+                    with self._lock:
+                        self._idle.append((client, time.monotonic()))
+                else:
+                    self._metrics.increment("ldap_reconnections_total")
+                    self._disconnect(client)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close all the idle connections within the pool."""
+        with self._lock:
+            clients = [client for client, _ in self._idle]
+            self._idle.clear()
+
+        for client in clients:
+            self._disconnect(client)
+
+
 class GLAuthClient(BaseLDAPClient):
     """Class to interact with an underlying GLAuth instance."""
 
     _REQUIRED_USER_FILTERS = ("(objectClass=posixAccount)",)
     _REQUIRED_GROUP_FILTERS = ("(objectClass=posixGroup)",)
 
-    def __init__(self, host: str, port: str, base_dn: str, bind_username: str, bind_password: str):
-        """Initialize the ldap internal client."""
+    def __init__(
+        self,
+        host: str,
+        port: str,
+        base_dn: str,
+        bind_username: str,
+        bind_password: str,
+        page_size: int = 1000,
+        watermark_attribute: str = "modifyTimestamp",
+        metrics: BaseMetrics | None = None,
+        filter_chunk_size: int = 100,
+        filter_concurrency: int = 4,
+        connections: int = 1,
+        liveness_interval: float = 60.0,
+        search_retries: int = 1,
+    ):
+        """Initialize the ldap internal client.
+
+        Scoped searches get split into filters of up to the chunk size names,
+        with up to the concurrency number of them in-flight at once.
+
+        Connections are bound lazily, up to the connections number of them, and searches
+        failing with SERVER_DOWN get retried on a new connection up to the retries number.
+        """
+        if filter_chunk_size < 1 or filter_concurrency < 1:
+            raise ValueError("The filter chunk size and concurrency must be positive numbers")
+        if search_retries < 0:
+            raise ValueError("The search retries must be a non-negative number")
+
+        self._uri = f"ldap://{host}:{port}"
         self._base_dn = base_dn
-        self._client = ldap.initialize(f"ldap://{host}:{port}")
-        self._client.simple_bind_s(bind_username, bind_password)
+        self._bind_username = bind_username
+        self._bind_password = bind_password
+        self._page_size = page_size
+        self._watermark_attribute = watermark_attribute
+        self._metrics = metrics or NoopMetrics()
+        self._filter_chunk_size = filter_chunk_size
+        self._filter_concurrency = filter_concurrency
+        self._search_retries = search_retries
+        self._pool = DefaultLDAPPool(
+            uri=self._uri,
+            bind_username=bind_username,
+            bind_password=bind_password,
+            size=connections,
+            liveness_interval=liveness_interval,
+            metrics=self._metrics,
+        )
+
+    def close(self) -> None:
+        """Close all the idle connections to the LDAP server."""
+        self._pool.close()
 
     @staticmethod
     def _decode_name(name: bytes) -> str:
-        """Decode a name from its byte representation."""
+        """Decode a name from its byte representation, interning it."""
         try:
-            return name.decode()
+            return sys.intern(name.decode())
         except UnicodeDecodeError:
             logger.warning(f"Could not decode name '{name}'")
             return ""
@@ -55,56 +222,281 @@ class GLAuthClient(BaseLDAPClient):
             f")"
         )
 
-    def search_users(self, from_groups: list[str] | None = None) -> Iterator[str]:
-        """Search for LDAP users."""
-        if not from_groups:
-            from_groups = ["*"]
+    def _build_scope_filter(self, groups: list[str]) -> str:
+        """Build a group filter string given a range of group names or patterns."""
+        return (
+            f"(&"
+            f"{''.join(self._REQUIRED_GROUP_FILTERS)}"
+            f"(|"
+            f"{''.join(f'(cn={group})' for group in groups)}"
+            f")"
+            f")"
+        )
 
-        filter_str = self._build_user_filter(from_groups)
+    def _chunk_names(self, names: list[str]) -> list[list[str]]:
+        """Split a list of names into chunks of bounded size."""
+        step = self._filter_chunk_size
+        return [names[i : i + step] for i in range(0, len(names), step)]
 
-        users = self._client.search_s(
+    def _parse_names(self, entries: Iterable[tuple[str, dict]]) -> Iterator[str]:
+        """Parse the names out of a range of LDAP entries."""
+        for _, entry in entries:
+            yield self._decode_name(entry["cn"][0])
+
+    def _parse_memberships(self, entries: Iterable[tuple[str, dict]]) -> Iterator[GroupMembers]:
+        """Parse the group memberships out of a range of LDAP entries."""
+        for _, entry in entries:
+            group_name = entry["cn"][0]
+            user_names = entry.get("memberUid", [])
+
+            yield GroupMembers(
+                group=(self._decode_name(group_name)),
+                users=(self._decode_name(user_name) for user_name in user_names),
+            )
+
+    def _send_search(
+        self,
+        client: LDAPObject,
+        filter_str: str,
+        attr_list: list[str],
+        page_control: SimplePagedResultsControl,
+    ) -> int:
+        """Send a search request for a page of LDAP entries, returning its message ID."""
+        return client.search_ext(
             base=self._base_dn,
             scope=ldap.SCOPE_SUBTREE,
             filterstr=filter_str,
-            attrlist=["cn"],
+            attrlist=attr_list,
+            serverctrls=[page_control],
+        )
+
+    @staticmethod
+    def _build_page_control(page_size: int) -> SimplePagedResultsControl:
+        """Build a paged results control, for the first page of results."""
+        return SimplePagedResultsControl(
+            criticality=False,
+            size=page_size,
+            cookie="",
+        )
+
+    @staticmethod
+    def _parse_page_cookie(controls: list) -> bytes | None:
+        """Parse the cookie of the next page of results, if any."""
+        cookies = [
+            control.cookie
+            for control in controls
+            if control.controlType == SimplePagedResultsControl.controlType
+        ]
+
+        return cookies[0] if cookies and cookies[0] else None
+
+    def _retry_search(
+        self,
+        search_func: Callable[[LDAPObject], Iterator[tuple[str, dict]]],
+        dedupe: bool = False,
+    ) -> Iterator[tuple[str, dict]]:
+        """Run a search on a pooled connection, retrying it on a new one upon SERVER_DOWN.
+
+        The entries already yielded before the disconnection get skipped by count,
+        as a restarted search returns them in the same order. Searches whose entries
+        interleave (dedupe) skip them by DN instead.
+        """
+        seen_dns = set()
+        yielded = 0
+
+        for attempt in itertools.count():
+            try:
+                with self._pool.connection() as client:
+                    entries = search_func(client)
+                    if dedupe:
+                        for dn, entry in entries:
+                            if dn not in seen_dns:
+                                seen_dns.add(dn)
+                                yield dn, entry
+                    else:
+                        for dn, entry in itertools.islice(entries, yielded, None):
+                            yielded += 1
+                            yield dn, entry
+                    return
+            except ldap.SERVER_DOWN:
+                if attempt >= self._search_retries:
+                    raise
+                logger.warning("LDAP server connection lost, retrying the search")
+
+    def _search_pages(
+        self,
+        client: LDAPObject,
+        filter_str: str,
+        attr_list: list[str],
+    ) -> Iterator[tuple[str, dict]]:
+        """Search for LDAP entries on a connection, yielding them as each page arrives."""
+        page_control = self._build_page_control(self._page_size)
+
+        while True:
+            with self._metrics.timer("ldap_query_seconds"):
+                message_id = self._send_search(client, filter_str, attr_list, page_control)
+                _, entries, _, controls = client.result3(message_id)
+
+            self._metrics.increment("ldap_entries_total", len(entries))
+            yield from entries
+
+            cookie = self._parse_page_cookie(controls)
+            if not cookie:
+                return
+
+            page_control.cookie = cookie
+
+    def _search_pipelined(
+        self,
+        client: LDAPObject,
+        filter_strs: list[str],
+        attr_list: list[str],
+    ) -> Iterator[tuple[str, dict]]:
+        """Search for LDAP entries on a connection, pipelining the searches of many filters."""
+        queued_filters = deque(filter_strs)
+        in_flight = deque()
+
+        while queued_filters or in_flight:
+            while queued_filters and len(in_flight) < self._filter_concurrency:
+                filter_str = queued_filters.popleft()
+                page_control = self._build_page_control(self._page_size)
+                message_id = self._send_search(client, filter_str, attr_list, page_control)
+                in_flight.append((message_id, filter_str, page_control))
+
+            message_id, filter_str, page_control = in_flight.popleft()
+
+            with self._metrics.timer("ldap_query_seconds"):
+                _, entries, _, controls = client.result3(message_id)
+
+            self._metrics.increment("ldap_entries_total", len(entries))
+
+            if cookie := self._parse_page_cookie(controls):
+                page_control.cookie = cookie
+                message_id = self._send_search(client, filter_str, attr_list, page_control)
+                in_flight.append((message_id, filter_str, page_control))
+
+            yield from entries
+
+    def _search(self, filter_str: str, attr_list: list[str]) -> Iterator[tuple[str, dict]]:
+        """Search for LDAP entries, yielding them as each page of results arrives."""
+        yield from self._retry_search(
+            lambda client: self._search_pages(client, filter_str, attr_list),
         )
 
-        for _, user in users:
-            yield self._decode_name(user["cn"][0])
+    def _search_many(
+        self,
+        filter_strs: list[str],
+        attr_list: list[str],
+    ) -> Iterator[tuple[str, dict]]:
+        """Search for LDAP entries matching any of the filters, pipelining the searches.
+
+        Up to the concurrency number of searches are in-flight at once, and their
+        entries get de-duplicated by DN as each page of results arrives.
+        """
+        if len(filter_strs) == 1:
+            yield from self._search(filter_strs[0], attr_list)
+            return
+
+        yield from self._retry_search(
+            lambda client: self._search_pipelined(client, filter_strs, attr_list),
+            dedupe=True,
+        )
+
+    def search_users(self, from_groups: list[str] | None = None) -> Iterator[str]:
+        """Search for LDAP users."""
+        if not from_groups:
+            from_groups = ["*"]
+
+        filter_strs = [self._build_user_filter(chunk) for chunk in self._chunk_names(from_groups)]
+
+        users = self._search_many(filter_strs, attr_list=["cn"])
+        yield from self._parse_names(users)
 
     def search_groups(self, from_users: list[str] | None = None) -> Iterator[str]:
         """Search for LDAP groups."""
         if not from_users:
             from_users = ["*"]
 
-        filter_str = self._build_group_filter(from_users)
+        filter_strs = [self._build_group_filter(chunk) for chunk in self._chunk_names(from_users)]
 
-        groups = self._client.search_s(
-            base=self._base_dn,
-            scope=ldap.SCOPE_SUBTREE,
-            filterstr=filter_str,
-            attrlist=["cn"],
-        )
-
-        for _, group in groups:
-            yield self._decode_name(group["cn"][0])
+        groups = self._search_many(filter_strs, attr_list=["cn"])
+        yield from self._parse_names(groups)
 
     def search_group_memberships(self) -> Iterator[GroupMembers]:
         """Search for LDAP group memberships."""
         filter_str = self._build_group_filter(["*"])
 
-        memberships = self._client.search_s(
-            base=self._base_dn,
-            scope=ldap.SCOPE_SUBTREE,
-            filterstr=filter_str,
-            attrlist=["cn", "memberUid"],
+        memberships = self._search(filter_str, attr_list=["cn", "memberUid"])
+        yield from self._parse_memberships(memberships)
+
+    def _build_changes_filter(self, filter_str: str, since: str | None) -> str:
+        """Build a filter string restricted to the entries changed since a watermark."""
+        if not since:
+            return filter_str
+
+        return f"(&{filter_str}({self._watermark_attribute}>={since}))"
+
+    def _build_snapshot(
+        self,
+        user_entries: list[tuple[str, dict]],
+        group_entries: list[tuple[str, dict]],
+        complete: bool,
+    ) -> Snapshot:
+        """Build a snapshot out of the user and group LDAP entries.
+
+        The groups are taken from the group memberships entries, as they share the same filter.
+        """
+        memberships = [
+            GroupMembers(m.group, list(m.users)) for m in self._parse_memberships(group_entries)
+        ]
+        watermarks = [
+            self._decode_name(value)
+            for _, entry in itertools.chain(user_entries, group_entries)
+            for value in entry.get(self._watermark_attribute, [])
+        ]
+
+        return Snapshot(
+            users=list(self._parse_names(user_entries)),
+            groups=[membership.group for membership in memberships],
+            memberships=memberships,
+            watermark=max(watermarks, default=None),
+            complete=complete,
         )
 
-        for _, membership in memberships:
-            group_name = membership["cn"][0]
-            user_names = membership["memberUid"]
+    def _search_snapshot(self, since: str | None) -> Snapshot:
+        """Search for LDAP users, groups and group memberships changed since a watermark."""
+        user_filter = self._build_changes_filter(self._build_user_filter(["*"]), since)
+        group_filter = self._build_changes_filter(self._build_group_filter(["*"]), since)
 
-            yield GroupMembers(
-                group=(self._decode_name(group_name)),
-                users=(self._decode_name(user_name) for user_name in user_names),
-            )
+        user_attrs = ["cn", self._watermark_attribute]
+        group_attrs = ["cn", "memberUid", self._watermark_attribute]
+
+        return self._build_snapshot(
+            user_entries=list(self._search(user_filter, attr_list=user_attrs)),
+            group_entries=list(self._search(group_filter, attr_list=group_attrs)),
+            complete=(since is None),
+        )
+
+    def search_snapshot(self) -> Snapshot:
+        """Search for LDAP users, groups and group memberships at once."""
+        return self._search_snapshot(since=None)
+
+    def search_changes(self, since: str) -> Snapshot:
+        """Search for LDAP users, groups and group memberships changed since a watermark."""
+        return self._search_snapshot(since=since)
+
+    def search_scoped_snapshot(self, scope: SyncScope) -> Snapshot:
+        """Search for LDAP groups within a scope, together with their memberships and users.
+
+        Only the group entries in scope get fetched, the users being their members.
+        The group names get escaped, and so does the pattern, except for its wildcards.
+        """
+        chunks = self._chunk_names(list(map(escape_filter_chars, scope.groups)))
+        if scope.pattern:
+            chunks.append(["*".join(map(escape_filter_chars, scope.pattern.split("*")))])
+
+        filter_strs = [self._build_scope_filter(chunk) for chunk in chunks]
+        entries = self._search_many(filter_strs, attr_list=["cn", "memberUid"])
+
+        index = ScopeIndex.from_memberships(self._parse_memberships(entries))
+        return index.to_snapshot()
@@ -0,0 +1,152 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import asyncio
+import itertools
+
+from ...metrics import BaseMetrics
+from ...models import GroupMembers, Snapshot
+from .glauth import GLAuthClient
+
+
+class AsyncGLAuthClient(GLAuthClient):
+    """Class to interact with an underlying GLAuth instance, querying it concurrently."""
+
+    def __init__(
+        self,
+        host: str,
+        port: str,
+        base_dn: str,
+        bind_username: str,
+        bind_password: str,
+        page_size: int = 1000,
+        connections: int = 3,
+        metrics: BaseMetrics | None = None,
+        filter_chunk_size: int = 100,
+        filter_concurrency: int = 4,
+        liveness_interval: float = 60.0,
+        search_retries: int = 1,
+    ):
+        """Initialize the ldap internal client, pooling connections to query concurrently."""
+        super().__init__(
+            host,
+            port,
+            base_dn,
+            bind_username,
+            bind_password,
+            page_size,
+            metrics=metrics,
+            filter_chunk_size=filter_chunk_size,
+            filter_concurrency=filter_concurrency,
+            connections=connections,
+            liveness_interval=liveness_interval,
+            search_retries=search_retries,
+        )
+        self._connections = connections
+
+    async def _asearch(self, filter_str: str, attr_list: list[str]) -> list[tuple[str, dict]]:
+        """Search for LDAP entries asynchronously, paging through the results.
+
+        The search runs on a worker thread, waiting for a pooled connection when all are in use.
+        """
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            None,
+            lambda: list(self._search(filter_str, attr_list)),
+        )
+
+    async def _asearch_many(
+        self,
+        filter_strs: list[str],
+        attr_list: list[str],
+    ) -> list[tuple[str, dict]]:
+        """Search for LDAP entries matching any of the filters concurrently.
+
+        Up to the concurrency number of searches run at once, bounded by the number
+        of pooled connections, and their entries get de-duplicated by DN.
+        """
+        semaphore = asyncio.Semaphore(min(self._filter_concurrency, self._connections))
+
+        async def _asearch_bounded(filter_str: str) -> list[tuple[str, dict]]:
+            async with semaphore:
+                return await self._asearch(filter_str, attr_list)
+
+        results = await asyncio.gather(*(_asearch_bounded(f) for f in filter_strs))
+        entries = {}
+
+        for dn, entry in itertools.chain.from_iterable(results):
+            entries.setdefault(dn, entry)
+
+        return list(entries.items())
+
+    async def asearch_users(self, from_groups: list[str] | None = None) -> list[str]:
+        """Search for LDAP users asynchronously."""
+        if not from_groups:
+            from_groups = ["*"]
+
+        filter_strs = [self._build_user_filter(chunk) for chunk in self._chunk_names(from_groups)]
+
+        users = await self._asearch_many(filter_strs, attr_list=["cn"])
+        return list(self._parse_names(users))
+
+    async def asearch_groups(self, from_users: list[str] | None = None) -> list[str]:
+        """Search for LDAP groups asynchronously."""
+        if not from_users:
+            from_users = ["*"]
+
+        filter_strs = [self._build_group_filter(chunk) for chunk in self._chunk_names(from_users)]
+
+        groups = await self._asearch_many(filter_strs, attr_list=["cn"])
+        return list(self._parse_names(groups))
+
+    async def asearch_group_memberships(self) -> list[GroupMembers]:
+        """Search for LDAP group memberships asynchronously."""
+        filter_str = self._build_group_filter(["*"])
+
+        memberships = await self._asearch(filter_str, attr_list=["cn", "memberUid"])
+        return [
+            GroupMembers(group=membership.group, users=list(membership.users))
+            for membership in self._parse_memberships(memberships)
+        ]
+
+    async def asearch_all(self) -> tuple[list[str], list[str], list[GroupMembers]]:
+        """Search for LDAP users, groups and group memberships concurrently."""
+        users, groups, memberships = await asyncio.gather(
+            self.asearch_users(),
+            self.asearch_groups(),
+            self.asearch_group_memberships(),
+        )
+
+        return users, groups, memberships
+
+    async def _asearch_snapshot(self, since: str | None) -> Snapshot:
+        """Search for LDAP users, groups and group memberships changed since a watermark."""
+        user_filter = self._build_changes_filter(self._build_user_filter(["*"]), since)
+        group_filter = self._build_changes_filter(self._build_group_filter(["*"]), since)
+
+        user_attrs = ["cn", self._watermark_attribute]
+        group_attrs = ["cn", "memberUid", self._watermark_attribute]
+
+        user_entries, group_entries = await asyncio.gather(
+            self._asearch(user_filter, attr_list=user_attrs),
+            self._asearch(group_filter, attr_list=group_attrs),
+        )
+
+        return self._build_snapshot(user_entries, group_entries, complete=(since is None))
+
+    async def asearch_snapshot(self) -> Snapshot:
+        """Search for LDAP users, groups and group memberships concurrently, at once."""
+        return await self._asearch_snapshot(since=None)
+
+    async def asearch_changes(self, since: str) -> Snapshot:
+        """Search for LDAP users, groups and group memberships changed since a watermark."""
+        return await self._asearch_snapshot(since=since)
+
+    def search_snapshot(self) -> Snapshot:
+        """Search for LDAP users, groups and group memberships concurrently, at once."""
+        return asyncio.run(self.asearch_snapshot())
+
+    def search_changes(self, since: str) -> Snapshot:
+        """Search for LDAP users, groups and group memberships changed since a watermark."""
+        return asyncio.run(self.asearch_changes(since))
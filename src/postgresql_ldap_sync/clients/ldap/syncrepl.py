@@ -0,0 +1,178 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import logging
+from typing import Iterator
+
+import ldap
+from ldap.ldapobject import LDAPObject
+from ldap.syncrepl import SyncreplConsumer
+
+from ...models import Snapshot
+from .glauth import GLAuthClient
+
+logger = logging.getLogger()
+
+
+class _SyncreplConnection(LDAPObject, SyncreplConsumer):
+    """Class to consume the content sync (RFC 4533) messages of an LDAP connection."""
+
+    def __init__(self, uri: str):
+        """Initialize the connection, and its pending changes."""
+        super().__init__(uri)
+        self.cookie: str | None = None
+        self.refresh_done = False
+        self.deleted = False
+        self.entries: dict[str, tuple[str, dict]] = {}
+        self.messages = 0
+
+    def syncrepl_get_cookie(self) -> str | None:
+        """Get the content sync cookie."""
+        return self.cookie
+
+    def syncrepl_set_cookie(self, cookie: str) -> None:
+        """Set the content sync cookie."""
+        self.messages += 1
+        self.cookie = cookie
+
+    def syncrepl_entry(self, dn: str, attrs: dict, uuid: str) -> None:
+        """Store an added or modified entry, until taken."""
+        self.messages += 1
+        self.entries[uuid] = (dn, attrs)
+
+    def syncrepl_delete(self, uuids: list[str]) -> None:
+        """Flag the deletion of some entries."""
+        self.messages += 1
+        self.deleted = True
+
+    def syncrepl_present(
+        self,
+        uuids: list[str] | None,
+        refreshDeletes: bool = False,  # noqa: N803 (named by python-ldap)
+    ) -> None:
+        """Ignore the present entries, as every session starts from an empty cookie."""
+        self.messages += 1
+
+    def syncrepl_refreshdone(self) -> None:
+        """Flag the end of the refresh phase."""
+        self.messages += 1
+        self.refresh_done = True
+
+
+class SyncreplLDAPClient(GLAuthClient):
+    """Class to interact with an LDAP server, listening for changes through content sync.
+
+    Servers without RFC 4533 content sync support (e.g. GLAuth) fall back to polling.
+    """
+
+    _DRAIN_TIMEOUT = 0.05
+
+    def _connect_syncrepl(self) -> tuple[_SyncreplConnection, int]:
+        """Open a content sync connection, and start its refresh and persist search."""
+        user_filter = self._build_user_filter(["*"])
+        group_filter = self._build_group_filter(["*"])
+
+        connection = _SyncreplConnection(self._uri)
+
+        try:
+            connection.simple_bind_s(self._bind_username, self._bind_password)
+
+            message_id = connection.syncrepl_search(
+                self._base_dn,
+                ldap.SCOPE_SUBTREE,
+                mode="refreshAndPersist",
+                filterstr=f"(|{user_filter}{group_filter})",
+                attrlist=["cn", "memberUid", "objectClass"],
+            )
+
+            while not connection.refresh_done:
+                if not connection.syncrepl_poll(msgid=message_id, all=0):
+                    raise ldap.LDAPError("Content sync search ended during the refresh phase")
+        except ldap.LDAPError:
+            self._close_syncrepl(connection)
+            raise
+
+        return connection, message_id
+
+    @staticmethod
+    def _close_syncrepl(connection: _SyncreplConnection) -> None:
+        """Unbind a content sync connection, ignoring the errors of an already lost one."""
+        try:
+            connection.unbind_s()
+        except ldap.LDAPError:
+            pass
+
+    def _take_snapshot(self, connection: _SyncreplConnection, complete: bool) -> Snapshot:
+        """Build a snapshot out of the pending entries of a content sync connection."""
+        entries, connection.entries = list(connection.entries.values()), {}
+
+        user_entries = []
+        group_entries = []
+
+        for dn, attrs in entries:
+            if b"posixGroup" in attrs.get("objectClass", []):
+                group_entries.append((dn, attrs))
+            else:
+                user_entries.append((dn, attrs))
+
+        return self._build_snapshot(user_entries, group_entries, complete=complete)
+
+    def _drain_messages(self, connection: _SyncreplConnection, message_id: int) -> bool:
+        """Consume the messages already arrived, to reconcile them together.
+
+        The draining stops once a short poll times out, or consumes no message,
+        returning whether the content sync search is still active.
+        """
+        while True:
+            messages = connection.messages
+
+            try:
+                active = connection.syncrepl_poll(
+                    msgid=message_id,
+                    timeout=self._DRAIN_TIMEOUT,
+                    all=0,
+                )
+            except ldap.TIMEOUT:
+                return True
+
+            if not active or connection.messages == messages:
+                return active
+
+    def listen_changes(self, timeout: float = 30.0) -> Iterator[Snapshot]:
+        """Listen for LDAP changes, yielding a complete snapshot first, and then the changes.
+
+        Deletions yield a complete snapshot, as content sync only reports their entry UUIDs.
+        An empty snapshot is yielded every timeout seconds without changes.
+        """
+        try:
+            connection, message_id = self._connect_syncrepl()
+        except ldap.LDAPError as error:
+            logger.warning(f"Content sync not available ({error}), polling for changes")
+            yield from super().listen_changes(timeout)
+            return
+
+        try:
+            connection.deleted = False
+            yield self._take_snapshot(connection, complete=True)
+
+            active = True
+
+            while active:
+                try:
+                    active = connection.syncrepl_poll(msgid=message_id, timeout=timeout, all=0)
+                except ldap.TIMEOUT:
+                    active = True
+                else:
+                    active = self._drain_messages(connection, message_id)
+
+                if connection.deleted:
+                    connection.deleted = False
+                    connection.entries.clear()
+                    yield self.search_snapshot()
+                else:
+                    yield self._take_snapshot(connection, complete=False)
+        finally:
+            self._close_syncrepl(connection)
+
+        logger.warning("Content sync search ended, polling for changes")
+        yield from super().listen_changes(timeout)
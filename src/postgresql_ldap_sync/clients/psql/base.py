@@ -2,9 +2,10 @@
 # See LICENSE file for licensing details.
 
 from abc import ABC, abstractmethod
-from typing import Iterable
+from contextlib import nullcontext
+from typing import ContextManager, Iterable
 
-from ...models import GroupMembers
+from ...models import GroupMembers, ScopeIndex, Snapshot, SyncScope
 
 
 class BasePostgreClient(ABC):
@@ -20,6 +21,11 @@ class BasePostgreClient(ABC):
         """Delete a user in PostgreSQL."""
         raise NotImplementedError()
 
+    def delete_users(self, users: list[str]) -> None:
+        """Delete a list of users in PostgreSQL, one at a time unless batched by the client."""
+        for user in users:
+            self.delete_user(user)
+
     @abstractmethod
     def create_group(self, group: str) -> None:
         """Create a group in PostgreSQL."""
@@ -30,6 +36,11 @@ class BasePostgreClient(ABC):
         """Delete a group in PostgreSQL."""
         raise NotImplementedError()
 
+    def delete_groups(self, groups: list[str]) -> None:
+        """Delete a list of groups in PostgreSQL, one at a time unless batched by the client."""
+        for group in groups:
+            self.delete_group(group)
+
     @abstractmethod
     def grant_group_memberships(self, groups: list[str], users: list[str]) -> None:
         """Grant groups membership to a list of users."""
@@ -54,3 +65,45 @@ class BasePostgreClient(ABC):
     def search_group_memberships(self) -> Iterable[GroupMembers]:
         """Search for PostgreSQL group memberships."""
         raise NotImplementedError()
+
+    def search_snapshot(self) -> Snapshot:
+        """Search for PostgreSQL users, groups and group memberships at once."""
+        return Snapshot(
+            users=list(self.search_users()),
+            groups=list(self.search_groups()),
+            memberships=[
+                GroupMembers(m.group, list(m.users)) for m in self.search_group_memberships()
+            ],
+        )
+
+    def search_scoped_snapshot(self, scope: SyncScope, users: Iterable[str] = ()) -> Snapshot:
+        """Search for PostgreSQL groups within a scope, their memberships, and the given users.
+
+        Clients without scoped search support filter a complete snapshot instead.
+        """
+        snapshot = self.search_snapshot()
+        index = ScopeIndex.from_memberships(snapshot.memberships, scope)
+
+        return index.to_snapshot(
+            users=set(users) & set(snapshot.users),
+            groups=filter(scope.contains, snapshot.groups),
+        )
+
+    def search_checksum(self) -> str | None:
+        """Search for a checksum of the PostgreSQL roles catalog, if supported."""
+        return None
+
+    def record(self) -> ContextManager[list[tuple[str, list[str]]] | None]:
+        """Record the statements of the role changes, instead of applying them.
+
+        Clients without recording support yield None, as no change can be recorded.
+        """
+        return nullcontext(None)
+
+    def close(self) -> None:
+        """Close the connections to the PostgreSQL instance, if any."""
+        return None
+
+    def search_databases(self) -> list[str]:
+        """Search for the PostgreSQL databases where role objects can be stored."""
+        return []
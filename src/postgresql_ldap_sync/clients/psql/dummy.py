@@ -1,6 +1,9 @@
 # Copyright 2025 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+from contextlib import contextmanager
+from typing import Iterator
+
 from ...models import GroupMembers
 from .base import BasePostgreClient
 
@@ -22,6 +25,10 @@ class DummyPostgresClient(BasePostgreClient):
         """Delete a user in PostgreSQL."""
         return None
 
+    def delete_users(self, users: list[str]) -> None:
+        """Delete a list of users in PostgreSQL."""
+        return None
+
     def create_group(self, group: str) -> None:
         """Create a group in PostgreSQL."""
         return None
@@ -30,6 +37,10 @@ class DummyPostgresClient(BasePostgreClient):
         """Delete a group in PostgreSQL."""
         return None
 
+    def delete_groups(self, groups: list[str]) -> None:
+        """Delete a list of groups in PostgreSQL."""
+        return None
+
     def grant_group_memberships(self, groups: list[str], users: list[str]) -> None:
         """Grant groups membership to a list of users."""
         return None
@@ -38,6 +49,11 @@ class DummyPostgresClient(BasePostgreClient):
         """Revoke groups membership from a list of users."""
         return None
 
+    @contextmanager
+    def record(self) -> Iterator[list[tuple[str, list[str]]]]:
+        """Record the statements of the role changes, instead of applying them."""
+        yield []
+
     def search_users(self) -> list[str]:
         """Search for PostgreSQL users."""
         return self._users
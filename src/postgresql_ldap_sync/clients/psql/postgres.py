@@ -3,21 +3,43 @@
 
 import itertools
 import logging
-from typing import Iterator
+import operator
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterable, Iterator, TypeVar
 
 import psycopg2
-from psycopg2.errors import DatabaseError, ProgrammingError
+from psycopg2.errors import (
+    DatabaseError,
+    InterfaceError,
+    InvalidSqlStatementName,
+    OperationalError,
+    ProgrammingError,
+)
 from psycopg2.extras import RealDictCursor, RealDictRow
-from psycopg2.sql import SQL, Composable, Identifier, Literal
+from psycopg2.sql import SQL, Composable, Composed, Identifier, Literal
 
-from ...models import GroupMembers
+from ...metrics import BaseMetrics, NoopMetrics
+from ...models import GroupMembers, Snapshot, SyncScope
+from ...throttler import DefaultThrottler
 from .base import BasePostgreClient
 
 logger = logging.getLogger()
 
+ErrorHandler = Callable[[ProgrammingError], None]
+T = TypeVar("T")
+
 
 class DefaultPostgresExecutor:
-    """Default PostgreSQL query executor."""
+    """Default PostgreSQL query executor.
+
+    Lost connections (e.g. after a failover) get re-opened, retrying the interrupted
+    read queries once when in auto-commit mode, as no previous statement can be lost with them.
+    Write queries are not retried, as they may have been applied before the connection got lost.
+    """
 
     def __init__(
         self,
@@ -27,45 +49,456 @@ class DefaultPostgresExecutor:
         username: str,
         password: str,
         auto_commit: bool = True,
+        prepare_statements: bool = True,
+        metrics: BaseMetrics | None = None,
     ):
-        """Initialize the psycopg2 internal client."""
-        self._connection = psycopg2.connect(
-            host=host,
-            port=port,
-            user=username,
-            password=password,
-            dbname=database,
-        )
-        self._connection.set_session(
-            autocommit=auto_commit,
+        """Initialize the psycopg2 internal client.
+
+        Repeated catalog queries run as server-side prepared statements, unless disabled
+        (e.g. behind a transaction pooler, not keeping them across transactions).
+        """
+        self._connect_kwargs = {
+            "host": host,
+            "port": port,
+            "user": username,
+            "password": password,
+            "dbname": database,
+        }
+        self._auto_commit = auto_commit
+        self._prepare_statements = prepare_statements
+        self._metrics = metrics or NoopMetrics()
+        self._prepared: set[str] = set()
+        self._cursor_ids = itertools.count()
+        self._connection = self._connect()
+
+        self._pipeline: list[tuple[Composable, ErrorHandler | None]] | None = None
+        self._pipeline_size = 0
+        self._pipeline_errors: list[tuple[str, DatabaseError]] = []
+
+    def _connect(self) -> psycopg2.extensions.connection:
+        """Open a new connection to the PostgreSQL server."""
+        connection = psycopg2.connect(**self._connect_kwargs)
+        connection.set_session(
+            autocommit=self._auto_commit,
         )
+        self._metrics.increment("psql_connections_total")
+        self._prepared = set()
+        return connection
 
-    def close(self) -> None:
-        """Close the psycopg2 cursor and connection."""
-        self._connection.close()
+    def _rollback(self) -> None:
+        """Roll back the current transaction, unless the connection was lost."""
+        if not self._connection.closed:
+            self._connection.rollback()
+
+    def _run_reconnecting(self, func: Callable[[], T], retry: bool = False) -> T:
+        """Run a connection operation, re-opening the connection if it was lost.
+
+        Retriable operations (i.e. reads) are retried once when in auto-commit mode,
+        and outside a pipeline.
+        """
+        try:
+            return func()
+        except (InterfaceError, OperationalError):
+            if not self._connection.closed:
+                raise
+
+            logger.warning("PostgreSQL connection lost, reconnecting")
+            self.reconnect()
+
+            if not retry or not self._auto_commit or self._pipeline is not None:
+                raise
+
+            return func()
+
+    def _execute_savepoint(
+        self,
+        cursor: psycopg2.extensions.cursor,
+        query: Composable,
+        on_error: ErrorHandler | None,
+    ) -> None:
+        """Execute a deferred SQL query within its own savepoint."""
+        try:
+            cursor.execute(
+                SQL("; ").join([
+                    SQL("SAVEPOINT pipeline_query"),
+                    query,
+                    SQL("RELEASE SAVEPOINT pipeline_query"),
+                ])
+            )
+        except DatabaseError as error:
+            logger.error(error)
+            cursor.execute(SQL("ROLLBACK TO SAVEPOINT pipeline_query"))
+            cursor.execute(SQL("RELEASE SAVEPOINT pipeline_query"))
+            self._pipeline_errors.append((query.as_string(cursor), error))
+
+            if on_error and isinstance(error, ProgrammingError):
+                on_error(error)
+
+    @classmethod
+    def _query_kinds(cls, query: Composable) -> list[str]:
+        """Classify the statements of a query by their leading keyword (e.g. CREATE, GRANT)."""
+        if isinstance(query, Composed):
+            parts = [p for p in query.seq if not (isinstance(p, SQL) and p.string == "; ")]
+            if len(parts) < len(query.seq):
+                return [kind for part in parts for kind in cls._query_kinds(part)]
+
+        while isinstance(query, Composed) and query.seq:
+            query = query.seq[0]
+
+        if isinstance(query, SQL) and query.string.strip():
+            return [query.string.split(maxsplit=1)[0].upper()]
+        else:
+            return ["OTHER"]
+
+    def _execute_query(self, query: Composable, on_error: ErrorHandler | None) -> None:
+        """Execute a SQL query, deferring it when within a pipeline."""
+        if self._pipeline is not None:
+            self._pipeline.append((query, on_error))
+            if len(self._pipeline) >= self._pipeline_size:
+                self._flush_pipeline()
+            return
 
-    def execute_query(self, query: Composable) -> None:
-        """Execute a SQL query and return the results."""
         with self._connection.cursor(cursor_factory=RealDictCursor) as cursor:
             try:
                 cursor.execute(query)
             except DatabaseError as error:
                 logger.error(error)
+                self._rollback()
+                if on_error and isinstance(error, ProgrammingError):
+                    on_error(error)
+                else:
+                    raise
+
+    def _flush_pipeline(self) -> None:
+        """Send the deferred SQL queries as a multi-statement batch."""
+        queries, self._pipeline = self._pipeline, []
+        if not queries:
+            return
+
+        if self._metrics.enabled:
+            for query, _ in queries:
+                for kind in self._query_kinds(query):
+                    self._metrics.increment("sql_statements_total", kind=kind)
+
+        batch = SQL("; ").join([
+            SQL("SAVEPOINT pipeline_batch"),
+            *(query for query, _ in queries),
+            SQL("RELEASE SAVEPOINT pipeline_batch"),
+        ])
+
+        with (
+            self._metrics.timer("sql_query_seconds", kind="BATCH"),
+            self._connection.cursor() as cursor,
+        ):
+            try:
+                cursor.execute(batch)
+                return
+            except DatabaseError:
+                cursor.execute(SQL("ROLLBACK TO SAVEPOINT pipeline_batch"))
+                cursor.execute(SQL("RELEASE SAVEPOINT pipeline_batch"))
+
+            # Replay the batch one query at a time, to isolate the failing ones
+            for query, on_error in queries:
+                self._execute_savepoint(cursor, query, on_error)
+
+    @contextmanager
+    def pipeline(self, batch_size: int = 100) -> Iterator[list[tuple[str, DatabaseError]]]:
+        """Defer the executed queries, sending them in batches within a single transaction.
+
+        Each failed query is rolled back to its own savepoint, so it does not abort the rest.
+        The yielded list gets populated with the failed queries, and their errors.
+        """
+        if self._pipeline is not None:
+            yield self._pipeline_errors
+            return
+
+        if self._auto_commit:
+            self._connection.autocommit = False
+
+        self._pipeline = []
+        self._pipeline_size = batch_size
+        self._pipeline_errors = []
+
+        try:
+            yield self._pipeline_errors
+            while self._pipeline:
+                self._flush_pipeline()
+        except BaseException:
+            self._rollback()
+            raise
+        else:
+            if self._auto_commit:
+                self._connection.commit()
+        finally:
+            self._pipeline = None
+            if self._auto_commit and not self._connection.closed:
+                self._connection.autocommit = True
+
+    def check(self) -> bool:
+        """Check whether the connection is alive with a round trip, re-opening it otherwise.
+
+        Outside auto-commit mode, the transaction opened by the check gets rolled back.
+        """
+        try:
+            with self._connection.cursor() as cursor:
+                cursor.execute(SQL("SELECT 1"))
+            if not self._auto_commit:
                 self._connection.rollback()
-                raise
+        except (InterfaceError, OperationalError):
+            logger.warning("PostgreSQL connection found dead, reconnecting")
+            self.reconnect()
+            return False
+        else:
+            return True
 
-    def fetch_results(self, query: Composable) -> list[RealDictRow]:
+    def rollback(self) -> None:
+        """Roll back the current transaction, discarding its uncommitted queries."""
+        self._rollback()
+
+    def reconnect(self) -> None:
+        """Close the current connection, and open a new one."""
+        self._metrics.increment("psql_reconnections_total")
+        self.close()
+        self._connection = self._connect()
+
+    def close(self) -> None:
+        """Close the psycopg2 cursor and connection."""
+        self._connection.close()
+
+    def render_query(self, query: Composable) -> str:
+        """Render a SQL query as a string, without executing it."""
+        return query.as_string(self._connection)
+
+    def execute_query(self, query: Composable, on_error: ErrorHandler | None = None) -> None:
+        """Execute a SQL query, deferring it when within a pipeline.
+
+        Programming errors are passed to the error handler, if provided, instead of raised.
+        """
+        execute_func = lambda: self._execute_query(query, on_error)
+
+        # Pipelined queries get recorded when flushed, as appending them takes no time
+        if not self._metrics.enabled or self._pipeline is not None:
+            self._run_reconnecting(execute_func)
+            return
+
+        kinds = self._query_kinds(query)
+        for kind in kinds:
+            self._metrics.increment("sql_statements_total", kind=kind)
+
+        with self._metrics.timer("sql_query_seconds", kind=kinds[0]):
+            self._run_reconnecting(execute_func)
+
+    def _fetch_results(self, query: Composable) -> list[RealDictRow]:
         """Execute a SQL query and return the results."""
         with self._connection.cursor(cursor_factory=RealDictCursor) as cursor:
             try:
                 cursor.execute(query)
             except DatabaseError as error:
                 logger.error(error)
-                self._connection.rollback()
+                self._rollback()
                 raise
             else:
                 return cursor.fetchall()
 
+    def _prepare_statement(self, name: str, query: Composable) -> None:
+        """Prepare a SQL query as a named server-side statement."""
+        with self._connection.cursor() as cursor:
+            try:
+                cursor.execute(
+                    SQL("PREPARE {name} AS {query}").format(name=Identifier(name), query=query)
+                )
+            except DatabaseError as error:
+                logger.error(error)
+                self._rollback()
+                raise
+
+        self._prepared.add(name)
+
+    def _fetch_prepared(self, name: str, query: Composable) -> list[RealDictRow]:
+        """Execute a prepared statement and return the results, preparing it if necessary."""
+        if name not in self._prepared:
+            self._prepare_statement(name, query)
+
+        execute_query = SQL("EXECUTE {name}").format(name=Identifier(name))
+
+        try:
+            return self._fetch_results(execute_query)
+        except InvalidSqlStatementName:
+            # The statement got deallocated behind our back (e.g. by a connection pooler)
+            self._prepared.discard(name)
+            self._prepare_statement(name, query)
+            return self._fetch_results(execute_query)
+
+    def fetch_results(self, query: Composable) -> list[RealDictRow]:
+        """Execute a SQL query and return the results."""
+        if self._pipeline:
+            self._flush_pipeline()
+
+        return self._run_reconnecting(lambda: self._fetch_results(query), retry=True)
+
+    def fetch_prepared(self, name: str, query: Composable) -> list[RealDictRow]:
+        """Execute a repeated SQL query as a prepared statement, and return the results.
+
+        The statement gets prepared upon its first execution on each connection.
+        """
+        if not self._prepare_statements:
+            return self.fetch_results(query)
+
+        if self._pipeline:
+            self._flush_pipeline()
+
+        return self._run_reconnecting(lambda: self._fetch_prepared(name, query), retry=True)
+
+    def _open_cursor(self, query: Composable, itersize: int) -> psycopg2.extensions.cursor:
+        """Declare a server-side cursor for a SQL query, fetching rows in iteration size batches.
+
+        In auto-commit mode, the cursor is declared WITH HOLD, as no transaction holds it.
+        """
+        cursor = self._connection.cursor(
+            name=f"stream_results_{next(self._cursor_ids)}",
+            withhold=self._connection.autocommit,
+        )
+        cursor.itersize = itersize
+
+        try:
+            cursor.execute(query)
+        except BaseException:
+            cursor.close()
+            raise
+
+        return cursor
+
+    def stream_results(self, query: Composable, itersize: int = 10_000) -> Iterator[tuple]:
+        """Execute a SQL query through a server-side cursor, yielding the rows as plain tuples.
+
+        Rows are fetched in batches of the iteration size, instead of all of them at once.
+        Opening the cursor is retried like any other read, as long as no row was yielded.
+        """
+        if self._pipeline:
+            self._flush_pipeline()
+
+        open_func = lambda: self._open_cursor(query, itersize)
+
+        try:
+            with self._run_reconnecting(open_func, retry=True) as cursor:
+                yield from cursor
+        except (DatabaseError, InterfaceError) as error:
+            logger.error(error)
+            self._rollback()
+            if self._connection.closed:
+                self.reconnect()
+            raise
+
+
+class DefaultPostgresPool:
+    """Default PostgreSQL pool of executors, keyed by database.
+
+    Executors are opened lazily, borrowed exclusively, and kept open across sync cycles.
+    Those idle for longer than the health check interval get checked before being lent,
+    and those idle for longer than the idle timeout (or above the maximum size) get closed.
+
+    Outside auto-commit mode, the uncommitted queries of returned executors get rolled back,
+    so that no transaction (nor its locks) is held while idle.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: str,
+        username: str,
+        password: str,
+        auto_commit: bool = True,
+        max_size: int = 16,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 30.0,
+        prepare_statements: bool = True,
+        metrics: BaseMetrics | None = None,
+    ):
+        """Initialize the pool, connecting to each database lazily."""
+        if max_size < 1:
+            raise ValueError("The pool maximum size must be a positive number")
+
+        self._host = host
+        self._port = port
+        self._username = username
+        self._password = password
+        self._auto_commit = auto_commit
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._health_check_interval = health_check_interval
+        self._prepare_statements = prepare_statements
+        self._metrics = metrics
+
+        # Idle executors, from the least to the most recently used
+        self._idle: OrderedDict[str, tuple[DefaultPostgresExecutor, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _checkout(self, database: str) -> DefaultPostgresExecutor:
+        """Take the idle executor of a database from the pool, or open a new one."""
+        with self._lock:
+            executor, last_used = self._idle.pop(database, (None, 0.0))
+
+        if executor and time.monotonic() - last_used > self._health_check_interval:
+            executor.check()
+        if executor:
+            return executor
+
+        return DefaultPostgresExecutor(
+            host=self._host,
+            port=self._port,
+            database=database,
+            username=self._username,
+            password=self._password,
+            auto_commit=self._auto_commit,
+            prepare_statements=self._prepare_statements,
+            metrics=self._metrics,
+        )
+
+    def _checkin(self, database: str, executor: DefaultPostgresExecutor) -> None:
+        """Return an executor to the pool, closing the expired or exceeding idle ones."""
+        if not self._auto_commit:
+            try:
+                executor.rollback()
+            except (InterfaceError, OperationalError):
+                executor.close()
+                return
+
+        now = time.monotonic()
+        expired = []
+
+        with self._lock:
+            if database in self._idle:
+                expired.append(executor)
+            else:
+                self._idle[database] = (executor, now)
+
+            for idle_database, (idle_executor, last_used) in list(self._idle.items()):
+                if now - last_used > self._idle_timeout or len(self._idle) > self._max_size:
+                    expired.append(idle_executor)
+                    del self._idle[idle_database]
+
+        for expired_executor in expired:
+            expired_executor.close()
+
+    @contextmanager
+    def executor(self, database: str) -> Iterator[DefaultPostgresExecutor]:
+        """Borrow the executor connected to a database, opening it if necessary."""
+        executor = self._checkout(database)
+
+        try:
+            yield executor
+        finally:
+            self._checkin(database, executor)
+
+    def close(self) -> None:
+        """Close all the idle executors within the pool."""
+        with self._lock:
+            executors = [executor for executor, _ in self._idle.values()]
+            self._idle.clear()
+
+        for executor in executors:
+            executor.close()
+
 
 class DefaultPostgresClient(BasePostgreClient):
     """Class to interact with an underlying PostgreSQL instance."""
@@ -95,14 +528,36 @@ class DefaultPostgresClient(BasePostgreClient):
         username: str,
         password: str,
         auto_commit: bool = True,
+        database_workers: int = 4,
+        throttler: DefaultThrottler | None = None,
+        metrics: BaseMetrics | None = None,
+        pool_max_size: int = 16,
+        pool_idle_timeout: float = 300.0,
+        prepare_statements: bool = True,
+        stream_itersize: int = 10_000,
     ):
-        """Initialize the psycopg2 internal client."""
+        """Initialize the psycopg2 internal client.
+
+        The connections to other databases (e.g. to reassign deleted roles objects)
+        are pooled, and kept open across sync cycles until idle for the pool timeout.
+
+        Catalog searches stream their rows through server-side cursors,
+        fetching them in batches of the iteration size.
+        """
+        if database_workers < 1:
+            raise ValueError("The number of database workers must be a positive number")
+
         self._host = host
         self._port = port
         self._database = database
         self._username = username
         self._password = password
         self._auto_commit = auto_commit
+        self._database_workers = database_workers
+        self._throttler = throttler
+        self._stream_itersize = stream_itersize
+        self._checksum_allowed: bool | None = None
+        self._recording: list[tuple[str, list[str]]] | None = None
 
         self._executor = DefaultPostgresExecutor(
             host=host,
@@ -111,8 +566,73 @@ class DefaultPostgresClient(BasePostgreClient):
             username=username,
             password=password,
             auto_commit=auto_commit,
+            prepare_statements=prepare_statements,
+            metrics=metrics,
+        )
+        self._pool = DefaultPostgresPool(
+            host=host,
+            port=port,
+            username=username,
+            password=password,
+            auto_commit=auto_commit,
+            max_size=pool_max_size,
+            idle_timeout=pool_idle_timeout,
+            prepare_statements=prepare_statements,
+            metrics=metrics,
+        )
+
+    def _execute_queries(
+        self,
+        queries: list[Composable],
+        on_error: ErrorHandler | None = None,
+        database: str | None = None,
+    ) -> None:
+        """Execute a list of queries in a single round trip, or record them if recording."""
+        if self._recording is not None:
+            statements = [self._executor.render_query(query) for query in queries]
+            self._recording.append((database or self._database, statements))
+            return
+
+        if database:
+            with self._pool.executor(database) as executor:
+                self._execute_throttled(executor, queries, on_error)
+        else:
+            self._execute_throttled(self._executor, queries, on_error)
+
+    def _execute_throttled(
+        self,
+        executor: DefaultPostgresExecutor,
+        queries: list[Composable],
+        on_error: ErrorHandler | None,
+    ) -> None:
+        """Execute a list of queries in a single round trip, paced by the throttler if any."""
+        if not self._throttler:
+            executor.execute_query(SQL("; ").join(queries), on_error)
+            return
+
+        self._throttler.throttle()
+        start_time = time.monotonic()
+        executor.execute_query(SQL("; ").join(queries), on_error)
+        self._throttler.observe(
+            time.monotonic() - start_time,
+            lambda: self._search_lock_waits(executor),
+        )
+
+    def _search_lock_waits(self, executor: DefaultPostgresExecutor) -> int:
+        """Search for the number of PostgreSQL sessions currently waiting on locks.
+
+        The search runs on the executor that applied the queries, as executors
+        are not thread-safe, and the session activity view spans all databases.
+        """
+        query = SQL(
+            "SELECT count(*) AS waits "
+            "FROM pg_catalog.pg_stat_activity "
+            "WHERE wait_event_type = 'Lock'"
         )
 
+        rows = executor.fetch_prepared("search_lock_waits", query)
+        return rows[0]["waits"]
+
     def _create_role(self, role: str, inherit: bool, login: bool) -> None:
         """Create a role in PostgreSQL."""
         quoted_role = Identifier(role)
@@ -124,51 +644,128 @@ class DefaultPostgresClient(BasePostgreClient):
         query = SQL(f"CREATE ROLE {{role}} WITH {quoted_options}")
         query = query.format(role=quoted_role)
 
-        try:
-            self._executor.execute_query(query)
-        except ProgrammingError:
-            logger.error(f"Could not create role {quoted_role}")
+        on_error = lambda _: logger.error(f"Could not create role {quoted_role}")
+        self._execute_queries([query], on_error)
 
-    def _delete_role(self, role: str) -> None:
-        """Delete a role in PostgreSQL."""
-        quoted_delete_role = Identifier(role)
+    def _reassign_queries(self, roles: list[str]) -> list[Composable]:
+        """Build the queries to reassign (or drop) the objects owned by a list of roles."""
+        quoted_delete_roles = SQL(",").join(Identifier(role) for role in roles)
         quoted_system_role = Identifier(self._username)
 
-        reassign_query_1 = SQL("REASSIGN OWNED BY {delete_role} TO {system_role}").format(
-            delete_role=quoted_delete_role,
+        reassign_query_1 = SQL("REASSIGN OWNED BY {delete_roles} TO {system_role}").format(
+            delete_roles=quoted_delete_roles,
             system_role=quoted_system_role,
         )
-        reassign_query_2 = SQL("DROP OWNED BY {delete_role}").format(
-            delete_role=quoted_delete_role,
+        reassign_query_2 = SQL("DROP OWNED BY {delete_roles}").format(
+            delete_roles=quoted_delete_roles,
         )
-        role_drop_query = SQL("DROP ROLE {delete_role}").format(
-            delete_role=quoted_delete_role,
+
+        return [reassign_query_1, reassign_query_2]
+
+    def _reassign_objects(
+        self,
+        executor: DefaultPostgresExecutor,
+        database: str,
+        roles: list[str],
+    ) -> list[str]:
+        """Reassign the objects of a list of roles within a database, splitting upon failure.
+
+        Returns the roles whose objects could not be reassigned.
+        """
+        failed_roles = []
+
+        def on_error(_: ProgrammingError) -> None:
+            if len(roles) == 1:
+                logger.error(f"Could not reassign objects of role {roles[0]} within {database}")
+                failed_roles.extend(roles)
+                return
+
+            middle = len(roles) // 2
+            failed_roles.extend(self._reassign_objects(executor, database, roles[:middle]))
+            failed_roles.extend(self._reassign_objects(executor, database, roles[middle:]))
+
+        self._execute_throttled(executor, self._reassign_queries(roles), on_error)
+        return failed_roles
+
+    def _reassign_database(self, database: str, roles: list[str]) -> list[str]:
+        """Reassign the objects of a list of roles within a database, or record the queries.
+
+        Returns the roles whose objects could not be reassigned.
+        """
+        if self._recording is not None:
+            self._execute_queries(self._reassign_queries(roles), database=database)
+            return []
+
+        with self._pool.executor(database) as executor:
+            return self._reassign_objects(executor, database, roles)
+
+    def _drop_roles(self, roles: list[str]) -> None:
+        """Drop a list of roles in PostgreSQL, splitting the batch upon failure."""
+        quoted_delete_roles = SQL(",").join(Identifier(role) for role in roles)
+        role_drop_query = SQL("DROP ROLE {delete_roles}").format(
+            delete_roles=quoted_delete_roles,
         )
 
-        for database in self._list_databases(ignored=[self._database]):
-            executor = DefaultPostgresExecutor(
-                host=self._host,
-                port=self._port,
-                database=database,
-                username=self._username,
-                password=self._password,
-                auto_commit=self._auto_commit,
-            )
-            try:
-                executor.execute_query(reassign_query_1)
-                executor.execute_query(reassign_query_2)
-            finally:
-                executor.close()
+        def on_error(_: ProgrammingError) -> None:
+            if len(roles) == 1:
+                logger.error(f"Could not delete role {quoted_delete_roles}")
+                return
 
-        try:
-            self._executor.execute_query(reassign_query_1)
-            self._executor.execute_query(reassign_query_2)
-            self._executor.execute_query(role_drop_query)
-        except ProgrammingError:
-            logger.error(f"Could not delete role {quoted_delete_role}")
+            middle = len(roles) // 2
+            self._drop_roles(roles[:middle])
+            self._drop_roles(roles[middle:])
+
+        self._execute_queries([*self._reassign_queries(roles), role_drop_query], on_error)
+
+    def _delete_roles(self, roles: list[str]) -> None:
+        """Delete a list of roles in PostgreSQL, reassigning their objects once per database.
+
+        Roles whose objects could not be reassigned in some database are not dropped.
+        """
+        reassign_func = lambda db: self._reassign_database(db, roles)
+        reassign_errors = {}
+        failed_roles = set()
+
+        with ThreadPoolExecutor(max_workers=self._database_workers) as thread_pool:
+            futures = {
+                thread_pool.submit(reassign_func, database): database
+                for database in self._list_databases(ignored=[self._database])
+            }
+            for future in as_completed(futures):
+                database = futures[future]
+                if error := future.exception():
+                    logger.error(
+                        f"Could not reassign objects within database {database}",
+                        exc_info=error,
+                    )
+                    reassign_errors[database] = error
+                else:
+                    failed_roles.update(future.result())
+
+        # Roles still owning objects in some database cannot be dropped.
+        # Every error got logged above, the first one is raised.
+        if reassign_errors:
+            raise next(iter(reassign_errors.values()))
+
+        drop_roles = [role for role in roles if role not in failed_roles]
+        if drop_roles:
+            self._drop_roles(drop_roles)
+
+    @staticmethod
+    def _split_role_memberships(
+        groups: list[str],
+        users: list[str],
+    ) -> list[tuple[list[str], list[str]]]:
+        """Split a range of role memberships in two halves."""
+        if len(groups) > 1:
+            middle = len(groups) // 2
+            return [(groups[:middle], users), (groups[middle:], users)]
+        else:
+            middle = len(users) // 2
+            return [(groups, users[:middle]), (groups, users[middle:])]
 
     def _grant_role_memberships(self, groups: list[str], users: list[str]) -> None:
-        """Grant role membership to a list of roles."""
+        """Grant role membership to a list of roles, splitting the batch upon failure."""
         quoted_groups = SQL(",").join(Identifier(group) for group in groups)
         quoted_users = SQL(",").join(Identifier(user) for user in users)
 
@@ -178,13 +775,18 @@ class DefaultPostgresClient(BasePostgreClient):
             users=quoted_users,
         )
 
-        try:
-            self._executor.execute_query(query)
-        except ProgrammingError:
-            logger.error(f"Could not grant memberships to groups {quoted_groups}")
+        def on_error(_: ProgrammingError) -> None:
+            if len(groups) == 1 and len(users) == 1:
+                logger.error(f"Could not grant memberships to groups {quoted_groups}")
+                return
+
+            for groups_half, users_half in self._split_role_memberships(groups, users):
+                self._grant_role_memberships(groups_half, users_half)
+
+        self._execute_queries([query], on_error)
 
     def _revoke_role_memberships(self, groups: list[str], users: list[str]) -> None:
-        """Revoke role membership from a list of roles."""
+        """Revoke role membership from a list of roles, splitting the batch upon failure."""
         quoted_groups = SQL(",").join(Identifier(group) for group in groups)
         quoted_users = SQL(",").join(Identifier(user) for user in users)
 
@@ -193,10 +795,16 @@ class DefaultPostgresClient(BasePostgreClient):
             groups=quoted_groups,
             users=quoted_users,
         )
-        try:
-            self._executor.execute_query(query)
-        except ProgrammingError:
-            logger.error(f"Could not revoke memberships from groups {quoted_groups}")
+
+        def on_error(_: ProgrammingError) -> None:
+            if len(groups) == 1 and len(users) == 1:
+                logger.error(f"Could not revoke memberships from groups {quoted_groups}")
+                return
+
+            for groups_half, users_half in self._split_role_memberships(groups, users):
+                self._revoke_role_memberships(groups_half, users_half)
+
+        self._execute_queries([query], on_error)
 
     def _list_databases(self, ignored: list[str]) -> Iterator[str]:
         """List all databases within the instance."""
@@ -221,8 +829,30 @@ class DefaultPostgresClient(BasePostgreClient):
             yield row["datname"]
 
     def close(self) -> None:
-        """Close the psycopg2 cursor and connection."""
+        """Close the psycopg2 cursors and connections."""
         self._executor.close()
+        self._pool.close()
+
+    @contextmanager
+    def record(self) -> Iterator[list[tuple[str, list[str]]]]:
+        """Record the statements of the role changes, instead of applying them.
+
+        The yielded list gets populated with the round trips to be made,
+        as pairs of database name and the statements sent within it.
+        """
+        self._recording = []
+        try:
+            yield self._recording
+        finally:
+            self._recording = None
+
+    def search_databases(self) -> list[str]:
+        """Search for the PostgreSQL databases where role objects can be stored."""
+        return list(self._list_databases(ignored=[]))
+
+    def pipeline(self, batch_size: int = 100) -> ContextManager[list[tuple[str, DatabaseError]]]:
+        """Defer the PostgreSQL statements, applying them within a single transaction."""
+        return self._executor.pipeline(batch_size)
 
     def create_user(self, user: str, inherit: bool = True) -> None:
         """Create a user in PostgreSQL."""
@@ -230,7 +860,14 @@ class DefaultPostgresClient(BasePostgreClient):
 
     def delete_user(self, user: str) -> None:
         """Delete a user in PostgreSQL."""
-        self._delete_role(user)
+        self._delete_roles([user])
+
+    def delete_users(self, users: list[str]) -> None:
+        """Delete a list of users in PostgreSQL."""
+        if not users:
+            return
+
+        self._delete_roles(users)
 
     def create_group(self, group: str, inherit: bool = False) -> None:
         """Create a group in PostgreSQL."""
@@ -238,7 +875,14 @@ class DefaultPostgresClient(BasePostgreClient):
 
     def delete_group(self, group: str) -> None:
         """Delete a group in PostgreSQL."""
-        self._delete_role(group)
+        self._delete_roles([group])
+
+    def delete_groups(self, groups: list[str]) -> None:
+        """Delete a list of groups in PostgreSQL."""
+        if not groups:
+            return
+
+        self._delete_roles(groups)
 
     def grant_group_memberships(self, groups: list[str], users: list[str]) -> None:
         """Grant groups membership to a list of users."""
@@ -273,10 +917,9 @@ class DefaultPostgresClient(BasePostgreClient):
         )
 
         query = query.format(group_filter=group_filter.format(group=group_regex))
-        rows = self._executor.fetch_results(query)
+        rows = self._executor.stream_results(query, self._stream_itersize)
 
-        for row in rows:
-            user = row["usename"]
+        for (user,) in rows:
             if user not in self._SYSTEM_ROLES:
                 yield user
 
@@ -299,10 +942,9 @@ class DefaultPostgresClient(BasePostgreClient):
         )
 
         query = query.format(user_filter=user_filter.format(user=user_regex))
-        rows = self._executor.fetch_results(query)
+        rows = self._executor.stream_results(query, self._stream_itersize)
 
-        for row in rows:
-            group = row["groname"]
+        for (group,) in rows:
             if group not in self._SYSTEM_ROLES:
                 yield group
 
@@ -315,11 +957,149 @@ class DefaultPostgresClient(BasePostgreClient):
             "JOIN pg_catalog.pg_group ON (pg_auth_members.roleid=pg_group.grosysid) "
             "ORDER BY 1, 2"
         )
-        rows = self._executor.fetch_results(query)
+        rows = self._executor.stream_results(query, self._stream_itersize)
 
-        group_func = lambda row: row["groname"]
-        user_func = lambda row: row["usename"]
+        group_func = operator.itemgetter(0)
+        user_func = operator.itemgetter(1)
 
         for group, grouped_rows in itertools.groupby(rows, group_func):
             if group not in self._SYSTEM_ROLES:
                 yield GroupMembers(group=group, users=map(user_func, grouped_rows))
+
+    def search_snapshot(self) -> Snapshot:
+        """Search for PostgreSQL users, groups and group memberships at once.
+
+        Roles and memberships are read in a single catalog scan, and joined in memory.
+        """
+        query = SQL(
+            "SELECT oid, rolname, rolcanlogin, NULL::oid AS member "
+            "FROM pg_catalog.pg_roles "
+            "UNION ALL "
+            "SELECT roleid, NULL, NULL, member "
+            "FROM pg_catalog.pg_auth_members"
+        )
+        rows = self._executor.stream_results(query, self._stream_itersize)
+
+        roles = {}
+        edges = []
+
+        for role_oid, role_name, role_login, member_oid in rows:
+            if member_oid is None:
+                roles[role_oid] = (role_name, role_login)
+            else:
+                edges.append((role_oid, member_oid))
+
+        users = []
+        groups = []
+        group_users = defaultdict(list)
+
+        for role_name, role_login in roles.values():
+            if role_name in self._SYSTEM_ROLES:
+                continue
+            if role_login:
+                users.append(role_name)
+            else:
+                groups.append(role_name)
+
+        for group_oid, member_oid in edges:
+            group_name, group_login = roles[group_oid]
+            member_name, member_login = roles[member_oid]
+            if member_login and not group_login and group_name not in self._SYSTEM_ROLES:
+                group_users[group_name].append(member_name)
+
+        return Snapshot(
+            users=users,
+            groups=groups,
+            memberships=[GroupMembers(group, users) for group, users in group_users.items()],
+        )
+
+    @staticmethod
+    def _build_like_pattern(pattern: str | None) -> str | None:
+        """Build a LIKE pattern out of a wildcard one, escaping the LIKE special characters."""
+        if not pattern:
+            return None
+
+        escape = lambda v: v.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return "%".join(map(escape, pattern.split("*")))
+
+    def search_scoped_snapshot(self, scope: SyncScope, users: Iterable[str] = ()) -> Snapshot:
+        """Search for PostgreSQL groups within a scope, their memberships, and the given users.
+
+        Only the scoped groups, their members and the given users get read from the catalog.
+        """
+        query = SQL(
+            "WITH scoped_groups AS ("
+            "SELECT oid, rolname FROM pg_catalog.pg_roles "
+            "WHERE NOT rolcanlogin AND (rolname = ANY({groups}) OR rolname LIKE {pattern})"
+            ") "
+            "SELECT scoped_groups.rolname AS group_name, pg_roles.rolname AS user_name "
+            "FROM scoped_groups "
+            "LEFT JOIN pg_catalog.pg_auth_members ON (pg_auth_members.roleid=scoped_groups.oid) "
+            "LEFT JOIN pg_catalog.pg_roles ON "
+            "(pg_auth_members.member=pg_roles.oid AND pg_roles.rolcanlogin) "
+            "UNION ALL "
+            "SELECT NULL, rolname "
+            "FROM pg_catalog.pg_roles "
+            "WHERE rolcanlogin AND rolname = ANY({users})"
+        )
+
+        query = query.format(
+            groups=Literal(list(scope.groups)),
+            pattern=Literal(self._build_like_pattern(scope.pattern)),
+            users=Literal(list(users)),
+        )
+        rows = self._executor.stream_results(query, self._stream_itersize)
+
+        scoped_users = set()
+        group_users = {}
+
+        for group_name, user_name in rows:
+            if group_name in self._SYSTEM_ROLES:
+                continue
+            if user_name and user_name not in self._SYSTEM_ROLES:
+                scoped_users.add(user_name)
+            else:
+                user_name = None
+
+            if group_name and user_name:
+                group_users.setdefault(group_name, []).append(user_name)
+            elif group_name:
+                group_users.setdefault(group_name, [])
+
+        return Snapshot(
+            users=list(scoped_users),
+            groups=list(group_users),
+            memberships=[GroupMembers(g, users) for g, users in group_users.items() if users],
+            complete=False,
+        )
+
+    def search_checksum(self) -> str | None:
+        """Search for a checksum of the PostgreSQL roles catalog, if allowed.
+
+        The checksum covers the row versions of the roles and memberships catalogs,
+        so it changes whenever a role or a membership is created, altered or removed.
+        """
+        if self._checksum_allowed is None:
+            rows = self._executor.fetch_results(
+                SQL("SELECT has_table_privilege('pg_catalog.pg_authid', 'SELECT') AS allowed")
+            )
+            self._checksum_allowed = rows[0]["allowed"]
+
+        if not self._checksum_allowed:
+            return None
+
+        query = SQL(
+            "SELECT md5("
+            "(SELECT string_agg(oid::text || ':' || xmin::text, ',' ORDER BY oid) "
+            "FROM pg_catalog.pg_authid) "
+            "|| '|' || "
+            "(SELECT coalesce(string_agg("
+            "roleid::text || ':' || member::text || ':' || xmin::text, ',' "
+            "ORDER BY roleid, member, xmin::text"
+            "), '') "
+            "FROM pg_catalog.pg_auth_members)"
+            ") AS checksum"
+        )
+        rows = self._executor.fetch_prepared("search_checksum", query)
+
+        return rows[0]["checksum"]
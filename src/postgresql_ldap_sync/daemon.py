@@ -0,0 +1,145 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import logging
+import random
+import signal
+import threading
+import time
+
+from .syncher import MEMBERSHIP_ACTIONS, ROLE_ACTIONS, Synchronizer
+
+logger = logging.getLogger()
+
+
+class SyncDaemon:
+    """Class to run synchronization cycles periodically, until stopped.
+
+    The synchronizer (and so, its LDAP and PostgreSQL connections) is reused between cycles.
+    The interval grows while idle and with the duration of the last cycle, and gets jittered
+    so that replicas do not sync in lockstep.
+    """
+
+    def __init__(
+        self,
+        synchronizer: Synchronizer,
+        user_actions: list[ROLE_ACTIONS],
+        group_actions: list[ROLE_ACTIONS],
+        member_actions: list[MEMBERSHIP_ACTIONS],
+        interval: float = 30.0,
+        max_interval: float = 300.0,
+        idle_backoff: float = 1.5,
+        duration_factor: float = 4.0,
+        jitter: float = 0.1,
+        incremental: bool = False,
+        listen: bool = False,
+    ):
+        """Initialize the daemon with the synchronizer, actions and scheduling parameters.
+
+        The interval after a cycle is at least the duration factor times its duration,
+        multiplied by the idle backoff for each consecutive cycle without changes.
+
+        In listen mode, the changes get synced as the LDAP client notifies them instead,
+        using the interval as the notifications timeout.
+        """
+        if interval <= 0 or max_interval < interval:
+            raise ValueError("The intervals must be positive, and the maximum above the base")
+        if not 0 <= jitter < 1:
+            raise ValueError("The jitter must be within [0, 1)")
+
+        self._synchronizer = synchronizer
+        self._user_actions = user_actions
+        self._group_actions = group_actions
+        self._member_actions = member_actions
+        self._interval = interval
+        self._max_interval = max_interval
+        self._idle_backoff = idle_backoff
+        self._duration_factor = duration_factor
+        self._jitter = jitter
+        self._incremental = incremental
+        self._listen = listen
+
+        self._idle_cycles = 0
+        self._stop_event = threading.Event()
+
+    def _jittered(self, interval: float) -> float:
+        """Randomize an interval by the jitter ratio."""
+        return interval * random.uniform(1 - self._jitter, 1 + self._jitter)
+
+    def _next_interval(self, duration: float, changes: int) -> float:
+        """Compute the interval until the next cycle, given the last one."""
+        if changes:
+            self._idle_cycles = 0
+        else:
+            self._idle_cycles += 1
+
+        interval = self._interval * self._idle_backoff**self._idle_cycles
+        interval = max(interval, duration * self._duration_factor)
+
+        return min(interval, self._max_interval)
+
+    def _run_cycle(self) -> tuple[float, int]:
+        """Run a single synchronization cycle, returning its duration and number of changes."""
+        start_time = time.monotonic()
+
+        try:
+            changes = self._synchronizer.sync_all(
+                self._user_actions,
+                self._group_actions,
+                self._member_actions,
+                incremental=self._incremental,
+            )
+        except Exception:
+            logger.exception("Synchronization cycle failed")
+            changes = 0
+
+        return time.monotonic() - start_time, changes or 0
+
+    def _run_listener(self) -> None:
+        """Sync the LDAP changes as they get notified, until stopped."""
+        while not self._stop_event.is_set():
+            try:
+                for changes in self._synchronizer.listen(
+                    self._user_actions,
+                    self._group_actions,
+                    self._member_actions,
+                    timeout=self._interval,
+                ):
+                    if changes:
+                        logger.info(
+                            f"Synchronization of notified changes applied {changes} changes"
+                        )
+                    if self._stop_event.is_set():
+                        return
+            except Exception:
+                logger.exception("Change listener failed, restarting it")
+                self._stop_event.wait(self._jittered(self._interval))
+
+    def install_signal_handlers(self) -> None:
+        """Stop the daemon gracefully upon SIGINT / SIGTERM, once the current cycle finishes."""
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signal_number, lambda *_: self.stop())
+
+    def stop(self) -> None:
+        """Request the daemon to stop, once the current cycle finishes."""
+        logger.info("Stopping the synchronization daemon")
+        self._stop_event.set()
+
+    def run(self) -> None:
+        """Run synchronization cycles until stopped, starting after a jittered delay."""
+        self._stop_event.wait(random.uniform(0, self._jitter * self._interval))
+
+        if self._listen:
+            self._run_listener()
+            return
+
+        while not self._stop_event.is_set():
+            duration, changes = self._run_cycle()
+            interval = self._jittered(self._next_interval(duration, changes))
+
+            logger.info(
+                f"Synchronization cycle applied {changes} changes in {duration:.2f}s, "
+                f"next one in {interval:.2f}s"
+            )
+
+            self._stop_event.wait(interval)
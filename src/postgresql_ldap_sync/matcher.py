@@ -1,70 +1,382 @@
 # Copyright 2025 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import itertools
+import sys
+from abc import ABC, abstractmethod
 from typing import (
     Iterable,
     Iterator,
+    TypeVar,
 )
 
+from .metrics import BaseMetrics, NoopMetrics
 from .models.group_matches import GroupMatch, GroupMembershipMatch
 from .models.group_members import GroupMembers
 from .models.user_matches import UserMatch
+from .sorting import external_sort
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-class DefaultMatcher:
+T = TypeVar("T")
+
+
+class BaseMatcher(ABC):
+    """Base class to match LDAP and PostgreSQL entities."""
+
+    def __init__(self, keep_matches: bool = True, metrics: BaseMetrics | None = None):
+        """Initialize the matcher, optionally skipping the matches to be kept."""
+        self._keep_matches = keep_matches
+        self._metrics = metrics or NoopMetrics()
+
+    def _record_matches(self, entity: str, ldap_only: int, psql_only: int, both: int) -> None:
+        """Record the number of matches of an entity type, per action."""
+        if entity == "memberships":
+            actions = {"GRANT": ldap_only, "REVOKE": psql_only, "KEEP": both}
+        else:
+            actions = {"CREATE": ldap_only, "DELETE": psql_only, "KEEP": both}
+
+        for action, count in actions.items():
+            self._metrics.increment("matches_total", count, entity=entity, action=action)
+
+    def _record_sets(self, entity: str, ldap_names: set[str], psql_names: set[str]) -> None:
+        """Record the number of matches of an entity type, given both sets of names."""
+        both = len(ldap_names & psql_names)
+        self._record_matches(entity, len(ldap_names) - both, len(psql_names) - both, both)
+
+    @abstractmethod
+    def match_users(
+        self,
+        ldap_users: Iterable[str],
+        psql_users: Iterable[str],
+    ) -> Iterator[UserMatch]:
+        """Generate match objects for the users."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def match_groups(
+        self,
+        ldap_groups: Iterable[str],
+        psql_groups: Iterable[str],
+    ) -> Iterator[GroupMatch]:
+        """Generate match objects for the groups."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def match_group_memberships(
+        self,
+        ldap_memberships: Iterable[GroupMembers],
+        psql_memberships: Iterable[GroupMembers],
+    ) -> Iterator[GroupMembershipMatch]:
+        """Generate match objects for the group memberships."""
+        raise NotImplementedError()
+
+
+class DefaultMatcher(BaseMatcher):
     """Class to match LDAP and PostgreSQL entities."""
 
-    @staticmethod
+    def _select_names(self, ldap_names: set[str], psql_names: set[str]) -> set[str]:
+        """Select the names to generate match objects for."""
+        if self._keep_matches:
+            return ldap_names | psql_names
+        else:
+            return ldap_names ^ psql_names
+
     def match_users(
+        self,
         ldap_users: Iterable[str],
         psql_users: Iterable[str],
     ) -> Iterator[UserMatch]:
         """Generate match objects for the users."""
-        ldap_users = set(ldap_users)
-        psql_users = set(psql_users)
+        ldap_users = set(map(sys.intern, ldap_users))
+        psql_users = set(map(sys.intern, psql_users))
 
-        for user in ldap_users | psql_users:
+        if self._metrics.enabled:
+            self._record_sets("users", ldap_users, psql_users)
+
+        for user in self._select_names(ldap_users, psql_users):
             yield UserMatch(
                 name=user,
                 exists_in_ldap=(user in ldap_users),
                 exists_in_psql=(user in psql_users),
             )
 
-    @staticmethod
     def match_groups(
+        self,
         ldap_groups: Iterable[str],
         psql_groups: Iterable[str],
     ) -> Iterator[GroupMatch]:
         """Generate match objects for the groups."""
-        ldap_groups = set(ldap_groups)
-        psql_groups = set(psql_groups)
+        ldap_groups = set(map(sys.intern, ldap_groups))
+        psql_groups = set(map(sys.intern, psql_groups))
 
-        for group in ldap_groups | psql_groups:
+        if self._metrics.enabled:
+            self._record_sets("groups", ldap_groups, psql_groups)
+
+        for group in self._select_names(ldap_groups, psql_groups):
             yield GroupMatch(
                 name=group,
                 exists_in_ldap=(group in ldap_groups),
                 exists_in_psql=(group in psql_groups),
             )
 
-    @staticmethod
     def match_group_memberships(
+        self,
         ldap_memberships: Iterable[GroupMembers],
         psql_memberships: Iterable[GroupMembers],
     ) -> Iterator[GroupMembershipMatch]:
         """Generate match objects for the group memberships."""
-        ldap_memberships = {m.group: set(m.users) for m in ldap_memberships}
-        psql_memberships = {m.group: set(m.users) for m in psql_memberships}
+        ldap_memberships = {
+            sys.intern(m.group): set(map(sys.intern, m.users)) for m in ldap_memberships
+        }
+        psql_memberships = {
+            sys.intern(m.group): set(map(sys.intern, m.users)) for m in psql_memberships
+        }
 
         groups = ldap_memberships.keys() | psql_memberships.keys()
+        counts = [0, 0, 0]
 
         for group in groups:
             ldap_users = ldap_memberships.get(group, set())
             psql_users = psql_memberships.get(group, set())
 
-            for user in ldap_users | psql_users:
+            if self._metrics.enabled:
+                both = len(ldap_users & psql_users)
+                counts[0] += len(ldap_users) - both
+                counts[1] += len(psql_users) - both
+                counts[2] += both
+
+            for user in self._select_names(ldap_users, psql_users):
                 yield GroupMembershipMatch(
                     user_name=user,
                     group_name=group,
                     exists_in_ldap=(user in ldap_users),
                     exists_in_psql=(user in psql_users),
                 )
+
+        if self._metrics.enabled:
+            self._record_matches("memberships", *counts)
+
+
+class SortedMatcher(BaseMatcher):
+    """Class to match sorted LDAP and PostgreSQL entities, in a single streaming pass.
+
+    Both sides get externally sorted by code point before matching them, as neither
+    the LDAP nor the PostgreSQL snapshots are sorted, unless flagged as pre-sorted
+    (e.g. coming from the ORDER BY search methods), in which case only their order is checked.
+    """
+
+    def __init__(
+        self,
+        keep_matches: bool = True,
+        sort_chunk_size: int = 100_000,
+        presorted: bool = False,
+        metrics: BaseMetrics | None = None,
+    ):
+        """Initialize the matcher, sorting the entities in chunks unless pre-sorted."""
+        if sort_chunk_size < 1:
+            raise ValueError("The sort chunk size must be a positive number")
+
+        super().__init__(keep_matches, metrics)
+        self._sort_chunk_size = sort_chunk_size
+        self._presorted = presorted
+
+    def _sorted(self, items: Iterable[T]) -> Iterator[T]:
+        """Yield unique items, sorting them unless pre-sorted, otherwise checking their order."""
+        if not self._presorted:
+            items = external_sort(items, self._sort_chunk_size)
+
+        previous = None
+
+        for item in items:
+            if previous is not None and item <= previous:
+                if item == previous:
+                    continue
+                raise ValueError(f"Entities are not sorted: {item} found after {previous}")
+
+            previous = item
+            yield item
+
+    def _merge(
+        self,
+        entity: str,
+        ldap_items: Iterable[T],
+        psql_items: Iterable[T],
+    ) -> Iterator[tuple[T, bool, bool]]:
+        """Merge two sorted streams, yielding each item with its existence on each side."""
+        ldap_items = self._sorted(ldap_items)
+        psql_items = self._sorted(psql_items)
+
+        ldap_item = next(ldap_items, None)
+        psql_item = next(psql_items, None)
+        counts = [0, 0, 0]
+
+        while ldap_item is not None or psql_item is not None:
+            if psql_item is None or (ldap_item is not None and ldap_item < psql_item):
+                counts[0] += 1
+                yield ldap_item, True, False
+                ldap_item = next(ldap_items, None)
+            elif ldap_item is None or psql_item < ldap_item:
+                counts[1] += 1
+                yield psql_item, False, True
+                psql_item = next(psql_items, None)
+            else:
+                counts[2] += 1
+                if self._keep_matches:
+                    yield ldap_item, True, True
+                ldap_item = next(ldap_items, None)
+                psql_item = next(psql_items, None)
+
+        if self._metrics.enabled:
+            self._record_matches(entity, *counts)
+
+    @staticmethod
+    def _flatten(memberships: Iterable[GroupMembers]) -> Iterator[tuple[str, str]]:
+        """Flatten the group memberships into (group, user) pairs, sorted within each group."""
+        for membership in memberships:
+            for user in sorted(membership.users):
+                yield membership.group, user
+
+    def match_users(
+        self,
+        ldap_users: Iterable[str],
+        psql_users: Iterable[str],
+    ) -> Iterator[UserMatch]:
+        """Generate match objects for the users."""
+        matches = self._merge("users", ldap_users, psql_users)
+
+        for user, exists_in_ldap, exists_in_psql in matches:
+            yield UserMatch(
+                name=user,
+                exists_in_ldap=exists_in_ldap,
+                exists_in_psql=exists_in_psql,
+            )
+
+    def match_groups(
+        self,
+        ldap_groups: Iterable[str],
+        psql_groups: Iterable[str],
+    ) -> Iterator[GroupMatch]:
+        """Generate match objects for the groups."""
+        matches = self._merge("groups", ldap_groups, psql_groups)
+
+        for group, exists_in_ldap, exists_in_psql in matches:
+            yield GroupMatch(
+                name=group,
+                exists_in_ldap=exists_in_ldap,
+                exists_in_psql=exists_in_psql,
+            )
+
+    def match_group_memberships(
+        self,
+        ldap_memberships: Iterable[GroupMembers],
+        psql_memberships: Iterable[GroupMembers],
+    ) -> Iterator[GroupMembershipMatch]:
+        """Generate match objects for the group memberships."""
+        matches = self._merge(
+            "memberships",
+            self._flatten(ldap_memberships),
+            self._flatten(psql_memberships),
+        )
+
+        for (group, user), exists_in_ldap, exists_in_psql in matches:
+            yield GroupMembershipMatch(
+                user_name=user,
+                group_name=group,
+                exists_in_ldap=exists_in_ldap,
+                exists_in_psql=exists_in_psql,
+            )
+
+
+class VectorMatcher(DefaultMatcher):
+    """Class to match LDAP and PostgreSQL entities, using NumPy to match memberships.
+
+    Memberships get encoded as packed (group ID, user ID) integer keys,
+    so that they can be diffed with sorted-array operations.
+    """
+
+    _USER_ID_BITS = 32
+    _USER_ID_MASK = (1 << _USER_ID_BITS) - 1
+
+    def __init__(self, keep_matches: bool = True, metrics: BaseMetrics | None = None):
+        """Initialize the matcher, checking NumPy availability."""
+        if numpy is None:
+            raise ImportError("The vector matcher requires NumPy to be installed")
+
+        super().__init__(keep_matches, metrics)
+
+    def _encode_memberships(
+        self,
+        memberships: list[tuple[str, list[str]]],
+        group_ids: dict[str, int],
+        user_ids: dict[str, int],
+    ) -> "numpy.ndarray":
+        """Encode the memberships into a sorted array of unique packed keys."""
+        users = list(itertools.chain.from_iterable(users for _, users in memberships))
+        user_keys = numpy.array(list(map(user_ids.__getitem__, users)), dtype=numpy.int64)
+
+        group_keys = numpy.repeat(
+            numpy.array([group_ids[group] for group, _ in memberships], dtype=numpy.int64),
+            [len(users) for _, users in memberships],
+        )
+
+        return numpy.unique((group_keys << self._USER_ID_BITS) | user_keys)
+
+    def _decode_memberships(
+        self,
+        keys: "numpy.ndarray",
+        group_names: list[str],
+        user_names: list[str],
+        exists_in_ldap: bool,
+        exists_in_psql: bool,
+    ) -> Iterator[GroupMembershipMatch]:
+        """Decode the packed keys into match objects."""
+        group_indexes = (keys >> self._USER_ID_BITS).tolist()
+        user_indexes = (keys & self._USER_ID_MASK).tolist()
+
+        for group_index, user_index in zip(group_indexes, user_indexes):
+            yield GroupMembershipMatch(
+                user_name=user_names[user_index],
+                group_name=group_names[group_index],
+                exists_in_ldap=exists_in_ldap,
+                exists_in_psql=exists_in_psql,
+            )
+
+    def match_group_memberships(
+        self,
+        ldap_memberships: Iterable[GroupMembers],
+        psql_memberships: Iterable[GroupMembers],
+    ) -> Iterator[GroupMembershipMatch]:
+        """Generate match objects for the group memberships."""
+        ldap_memberships = [(m.group, list(m.users)) for m in ldap_memberships]
+        psql_memberships = [(m.group, list(m.users)) for m in psql_memberships]
+        memberships = ldap_memberships + psql_memberships
+
+        group_names = list(map(sys.intern, dict.fromkeys(group for group, _ in memberships)))
+        user_names = list(map(sys.intern, set().union(*(users for _, users in memberships))))
+
+        if len(user_names) > self._USER_ID_MASK:
+            raise ValueError(f"Too many users to encode: {len(user_names)}")
+
+        group_ids = dict(zip(group_names, itertools.count()))
+        user_ids = dict(zip(user_names, itertools.count()))
+
+        ldap_keys = self._encode_memberships(ldap_memberships, group_ids, user_ids)
+        psql_keys = self._encode_memberships(psql_memberships, group_ids, user_ids)
+
+        grant_keys = numpy.setdiff1d(ldap_keys, psql_keys, assume_unique=True)
+        revoke_keys = numpy.setdiff1d(psql_keys, ldap_keys, assume_unique=True)
+
+        if self._metrics.enabled:
+            both = len(ldap_keys) - len(grant_keys)
+            self._record_matches("memberships", len(grant_keys), len(revoke_keys), both)
+
+        yield from self._decode_memberships(grant_keys, group_names, user_names, True, False)
+        yield from self._decode_memberships(revoke_keys, group_names, user_names, False, True)
+
+        if self._keep_matches:
+            keep_keys = numpy.intersect1d(ldap_keys, psql_keys, assume_unique=True)
+            yield from self._decode_memberships(keep_keys, group_names, user_names, True, True)
@@ -0,0 +1,111 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Iterator
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class BaseMetrics(ABC):
+    """Base class to record the metrics of the synchronization components."""
+
+    enabled = True
+
+    @abstractmethod
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Increment a counter metric."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Observe a value of a summary metric (e.g. a latency in seconds)."""
+        raise NotImplementedError()
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Observe the elapsed time of a block, in seconds."""
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - start_time, **labels)
+
+
+class NoopMetrics(BaseMetrics):
+    """Class to discard all metrics, used by default."""
+
+    enabled = False
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Increment a counter metric."""
+        return None
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Observe a value of a summary metric (e.g. a latency in seconds)."""
+        return None
+
+    def timer(self, name: str, **labels: str) -> ContextManager[None]:
+        """Observe the elapsed time of a block, in seconds."""
+        return nullcontext()
+
+
+class PrometheusMetrics(BaseMetrics):
+    """Class to record metrics in memory, and export them in the Prometheus text format."""
+
+    def __init__(self, namespace: str = "postgresql_ldap_sync"):
+        """Initialize the in-memory metrics, prefixing their names with a namespace."""
+        self._namespace = namespace
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[Labels, float]] = defaultdict(dict)
+        self._summaries: dict[str, dict[Labels, tuple[float, int]]] = defaultdict(dict)
+
+    @staticmethod
+    def _format_labels(labels: Labels) -> str:
+        """Format the labels of a metric sample, escaping their values."""
+        if not labels:
+            return ""
+
+        escape = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels) + "}"
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Increment a counter metric."""
+        key = tuple(sorted(labels.items()))
+
+        with self._lock:
+            samples = self._counters[name]
+            samples[key] = samples.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Observe a value of a summary metric (e.g. a latency in seconds)."""
+        key = tuple(sorted(labels.items()))
+
+        with self._lock:
+            samples = self._summaries[name]
+            total, count = samples.get(key, (0.0, 0))
+            samples[key] = (total + value, count + 1)
+
+    def export(self) -> str:
+        """Export the recorded metrics in the Prometheus text exposition format."""
+        lines = []
+
+        with self._lock:
+            for name, samples in sorted(self._counters.items()):
+                full_name = f"{self._namespace}_{name}"
+                lines.append(f"# TYPE {full_name} counter")
+                for labels, value in sorted(samples.items()):
+                    lines.append(f"{full_name}{self._format_labels(labels)} {value}")
+
+            for name, samples in sorted(self._summaries.items()):
+                full_name = f"{self._namespace}_{name}"
+                lines.append(f"# TYPE {full_name} summary")
+                for labels, (total, count) in sorted(samples.items()):
+                    lines.append(f"{full_name}_sum{self._format_labels(labels)} {total}")
+                    lines.append(f"{full_name}_count{self._format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
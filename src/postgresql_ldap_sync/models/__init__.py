@@ -3,4 +3,9 @@
 
 from .group_matches import GroupMatch, GroupMembershipMatch
 from .group_members import GroupMembers
+from .membership_batches import MembershipBatch
+from .scope_indexes import ScopeIndex
+from .snapshots import Snapshot, SyncState
+from .sync_plans import PlanCost, SyncPlan
+from .sync_scopes import SyncScope
 from .user_matches import UserMatch
@@ -4,7 +4,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupMatch:
     """Class to store the LDAP - PostgreSQL group match information."""
 
@@ -28,7 +28,7 @@ class GroupMatch:
         return self.exists_in_ldap and self.exists_in_psql
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupMembershipMatch:
     """Class to store the LDAP - PostgreSQL group membership match information."""
 
@@ -0,0 +1,17 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class MembershipBatch:
+    """Class to store group memberships to be granted / revoked together."""
+
+    groups: tuple[str, ...]
+    users: tuple[str, ...]
+
+    @property
+    def size(self) -> int:
+        """Number of group memberships contained in the batch."""
+        return len(self.groups) * len(self.users)
@@ -0,0 +1,47 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from .group_members import GroupMembers
+from .snapshots import Snapshot
+from .sync_scopes import SyncScope
+
+
+@dataclass
+class ScopeIndex:
+    """Class to index the group memberships within a scope, in both directions."""
+
+    group_users: dict[str, set[str]] = field(default_factory=dict)
+    user_groups: dict[str, set[str]] = field(default_factory=lambda: defaultdict(set))
+
+    @classmethod
+    def from_memberships(
+        cls,
+        memberships: Iterable[GroupMembers],
+        scope: SyncScope | None = None,
+    ) -> "ScopeIndex":
+        """Build the index out of the group memberships, optionally filtering them by scope."""
+        index = cls()
+
+        for membership in memberships:
+            if scope and not scope.contains(membership.group):
+                continue
+
+            users = set(membership.users)
+            index.group_users.setdefault(membership.group, set()).update(users)
+            for user in users:
+                index.user_groups[user].add(membership.group)
+
+        return index
+
+    def to_snapshot(self, users: Iterable[str] = (), groups: Iterable[str] = ()) -> Snapshot:
+        """Build a partial snapshot out of the index, with some extra users and groups in scope."""
+        return Snapshot(
+            users=list(self.user_groups.keys() | set(users)),
+            groups=list(self.group_users.keys() | set(groups)),
+            memberships=[GroupMembers(g, list(users)) for g, users in self.group_users.items()],
+            complete=False,
+        )
@@ -0,0 +1,30 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from dataclasses import dataclass
+
+from .group_members import GroupMembers
+
+
+@dataclass
+class Snapshot:
+    """Class to store the users, groups and group memberships of a system together.
+
+    Partial snapshots only contain the entities changed since a previous watermark.
+    """
+
+    users: list[str]
+    groups: list[str]
+    memberships: list[GroupMembers]
+    watermark: str | None = None
+    complete: bool = True
+
+
+@dataclass
+class SyncState:
+    """Class to store the last synced LDAP - PostgreSQL snapshots together."""
+
+    ldap_snapshot: Snapshot
+    psql_snapshot: Snapshot
+    psql_checksum: str | None
+    actions: list[str]
@@ -0,0 +1,51 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from dataclasses import dataclass
+
+from .membership_batches import MembershipBatch
+
+
+@dataclass(frozen=True)
+class PlanCost:
+    """Class to store the estimated cost of applying a sync plan."""
+
+    round_trips: int
+    connections: int
+    statements: int
+
+
+@dataclass(frozen=True)
+class SyncPlan:
+    """Class to store the changes of a synchronization, to be applied later on.
+
+    Plans generated ahead of time also contain the SQL statements to be applied,
+    the databases affected by the role deletions, and the estimated cost of applying them.
+    """
+
+    create_users: tuple[str, ...]
+    create_groups: tuple[str, ...]
+    grant_batches: tuple[MembershipBatch, ...]
+    revoke_batches: tuple[MembershipBatch, ...]
+    delete_users: tuple[str, ...]
+    delete_groups: tuple[str, ...]
+    statements: tuple[str, ...] = ()
+    databases: tuple[str, ...] = ()
+    cost: PlanCost | None = None
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """Number of changes per action."""
+        return {
+            "create_users": len(self.create_users),
+            "create_groups": len(self.create_groups),
+            "grant_memberships": sum(batch.size for batch in self.grant_batches),
+            "revoke_memberships": sum(batch.size for batch in self.revoke_batches),
+            "delete_users": len(self.delete_users),
+            "delete_groups": len(self.delete_groups),
+        }
+
+    @property
+    def changes(self) -> int:
+        """Total number of changes."""
+        return sum(self.counts.values())
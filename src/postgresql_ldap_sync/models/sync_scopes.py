@@ -0,0 +1,42 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import re
+from dataclasses import dataclass
+from functools import cached_property
+
+
+@dataclass(frozen=True)
+class SyncScope:
+    """Class to store the groups a sync is restricted to, by name or by wildcard pattern.
+
+    Patterns only support the '*' wildcard, as both LDAP filters and PostgreSQL LIKE do.
+    """
+
+    groups: tuple[str, ...] = ()
+    pattern: str | None = None
+
+    def __post_init__(self):
+        """Check the scope is not empty."""
+        if not self.groups and not self.pattern:
+            raise ValueError("The scope must contain some groups, or a pattern")
+
+    @cached_property
+    def _group_set(self) -> frozenset[str]:
+        """Set of the groups in scope by name."""
+        return frozenset(self.groups)
+
+    @cached_property
+    def _pattern_regex(self) -> re.Pattern | None:
+        """Regular expression of the groups in scope by pattern."""
+        if not self.pattern:
+            return None
+
+        return re.compile(".*".join(map(re.escape, self.pattern.split("*"))))
+
+    def contains(self, group: str) -> bool:
+        """Check whether a group is within the scope."""
+        if group in self._group_set:
+            return True
+
+        return bool(self._pattern_regex and self._pattern_regex.fullmatch(group))
@@ -4,7 +4,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class UserMatch:
     """Class to store the LDAP - PostgreSQL user match information."""
 
@@ -0,0 +1,245 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import logging
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.util import Finalize
+from typing import Callable, Literal
+
+from .batcher import DefaultBatcher
+from .clients import BaseLDAPClient, BasePostgreClient
+from .matcher import BaseMatcher
+from .models import GroupMembers, GroupMembershipMatch, Snapshot
+from .syncher import (
+    MEMBERSHIP_ACTIONS,
+    ROLE_ACTIONS,
+    filter_membership_matches,
+    filter_role_matches,
+)
+
+logger = logging.getLogger()
+
+PostgresFactory = Callable[[], BasePostgreClient]
+
+SHARD_PHASES = Literal[
+    "CREATE",
+    "GRANT",
+    "REVOKE",
+]
+
+# Per worker process PostgreSQL client, created by the pool initializer
+_worker_client: BasePostgreClient | None = None
+
+
+@dataclass
+class ShardChanges:
+    """Class to store the changes to apply for a shard."""
+
+    create_users: list[str] = field(default_factory=list)
+    create_groups: list[str] = field(default_factory=list)
+    grant_matches: list[GroupMembershipMatch] = field(default_factory=list)
+    revoke_matches: list[GroupMembershipMatch] = field(default_factory=list)
+    delete_users: list[str] = field(default_factory=list)
+    delete_groups: list[str] = field(default_factory=list)
+
+    @property
+    def changes(self) -> int:
+        """Total number of changes."""
+        return (
+            len(self.create_users)
+            + len(self.create_groups)
+            + len(self.grant_matches)
+            + len(self.revoke_matches)
+            + len(self.delete_users)
+            + len(self.delete_groups)
+        )
+
+
+def shard_index(name: str, shards: int) -> int:
+    """Compute the shard of a role name, stable across processes."""
+    return zlib.crc32(name.encode()) % shards
+
+
+def _partition_snapshot(snapshot: Snapshot, shards: int) -> list[Snapshot]:
+    """Partition a snapshot by the role names (memberships by their group name)."""
+    partitions = [Snapshot(users=[], groups=[], memberships=[]) for _ in range(shards)]
+
+    for user in snapshot.users:
+        partitions[shard_index(user, shards)].users.append(user)
+    for group in snapshot.groups:
+        partitions[shard_index(group, shards)].groups.append(group)
+    for membership in snapshot.memberships:
+        partitions[shard_index(membership.group, shards)].memberships.append(
+            GroupMembers(group=membership.group, users=list(membership.users))
+        )
+
+    return partitions
+
+
+def _init_worker(psql_factory: PostgresFactory) -> None:
+    """Open the PostgreSQL client of a worker process, closing it when the process exits."""
+    global _worker_client
+    _worker_client = psql_factory()
+    Finalize(None, _worker_client.close, exitpriority=0)
+
+
+def _match_shard(
+    matcher: BaseMatcher,
+    ldap_snapshot: Snapshot,
+    psql_snapshot: Snapshot,
+    user_actions: list[ROLE_ACTIONS],
+    group_actions: list[ROLE_ACTIONS],
+    member_actions: list[MEMBERSHIP_ACTIONS],
+) -> ShardChanges:
+    """Match the entities of a shard, filtering them into the changes to apply."""
+    user_matches = matcher.match_users(ldap_snapshot.users, psql_snapshot.users)
+    group_matches = matcher.match_groups(ldap_snapshot.groups, psql_snapshot.groups)
+    member_matches = matcher.match_group_memberships(
+        ldap_snapshot.memberships,
+        psql_snapshot.memberships,
+    )
+
+    create_users, delete_users = filter_role_matches(user_matches, user_actions)
+    create_groups, delete_groups = filter_role_matches(group_matches, group_actions)
+    grant_matches, revoke_matches = filter_membership_matches(
+        member_matches,
+        member_actions,
+    )
+
+    return ShardChanges(
+        create_users=create_users,
+        create_groups=create_groups,
+        grant_matches=grant_matches,
+        revoke_matches=revoke_matches,
+        delete_users=delete_users,
+        delete_groups=delete_groups,
+    )
+
+
+def _apply_shard(phase: SHARD_PHASES, changes: ShardChanges, batcher: DefaultBatcher) -> None:
+    """Apply a phase of the changes of a shard, using the worker PostgreSQL client."""
+    if phase == "CREATE":
+        for user in changes.create_users:
+            _worker_client.create_user(user)
+        for group in changes.create_groups:
+            _worker_client.create_group(group)
+    elif phase == "GRANT":
+        for batch in batcher.batch_group_memberships(changes.grant_matches):
+            _worker_client.grant_group_memberships(list(batch.groups), list(batch.users))
+    elif phase == "REVOKE":
+        for batch in batcher.batch_group_memberships(changes.revoke_matches):
+            _worker_client.revoke_group_memberships(list(batch.groups), list(batch.users))
+
+
+class ShardedSynchronizer:
+    """Class to sync LDAP and PostgreSQL entities, sharded across worker processes.
+
+    Roles are partitioned by a stable hash of their name, and memberships by the one
+    of their group. Each shard is matched and applied in a worker process, holding its
+    own PostgreSQL client, while this coordinator orders the phases across shards.
+    """
+
+    def __init__(
+        self,
+        ldap_client: BaseLDAPClient,
+        psql_factory: PostgresFactory,
+        entity_matcher: BaseMatcher,
+        entity_batcher: DefaultBatcher | None = None,
+        shards: int | None = None,
+    ):
+        """Initializes the sharded LDAP - PostgreSQL synchronization class.
+
+        The PostgreSQL client factory, as well as the matcher and batcher, must be picklable
+        (e.g. a functools.partial of a client class), as they are sent to the worker processes.
+        """
+        shards = shards or os.cpu_count() or 1
+        if shards < 1:
+            raise ValueError("The number of shards must be positive")
+
+        self._ldap_client = ldap_client
+        self._psql_factory = psql_factory
+        self._matcher = entity_matcher
+        self._batcher = entity_batcher or DefaultBatcher()
+        self._shards = shards
+
+    def _run_phase(
+        self,
+        executor: ProcessPoolExecutor,
+        phase: SHARD_PHASES,
+        changes: list[ShardChanges],
+    ) -> None:
+        """Apply a phase across all shards, waiting for all of them to finish."""
+        logger.info(f"Applying {phase} phase across {self._shards} shards")
+
+        futures = [executor.submit(_apply_shard, phase, shard, self._batcher) for shard in changes]
+        for future in futures:
+            future.result()
+
+    def sync_all(
+        self,
+        user_actions: list[ROLE_ACTIONS],
+        group_actions: list[ROLE_ACTIONS],
+        member_actions: list[MEMBERSHIP_ACTIONS],
+    ) -> int:
+        """Sync LDAP users, groups and memberships to PostgreSQL, across shards.
+
+        Every phase completes on all shards before the next one starts: role creations,
+        membership grants, membership revokes and, finally, role deletions. Deletions are
+        applied by the coordinator, as they reassign objects across all databases.
+
+        Returns the number of changes applied.
+        """
+        psql_client = self._psql_factory()
+
+        try:
+            return self._sync_all(psql_client, user_actions, group_actions, member_actions)
+        finally:
+            psql_client.close()
+
+    def _sync_all(
+        self,
+        psql_client: BasePostgreClient,
+        user_actions: list[ROLE_ACTIONS],
+        group_actions: list[ROLE_ACTIONS],
+        member_actions: list[MEMBERSHIP_ACTIONS],
+    ) -> int:
+        """Sync LDAP users, groups and memberships to PostgreSQL, using a coordinator client."""
+        ldap_partitions = _partition_snapshot(self._ldap_client.search_snapshot(), self._shards)
+        psql_partitions = _partition_snapshot(psql_client.search_snapshot(), self._shards)
+
+        with ProcessPoolExecutor(
+            max_workers=self._shards,
+            initializer=_init_worker,
+            initargs=(self._psql_factory,),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _match_shard,
+                    self._matcher,
+                    ldap_partition,
+                    psql_partition,
+                    user_actions,
+                    group_actions,
+                    member_actions,
+                )
+                for ldap_partition, psql_partition in zip(ldap_partitions, psql_partitions)
+            ]
+
+            changes = [future.result() for future in futures]
+
+            self._run_phase(executor, "CREATE", changes)
+            self._run_phase(executor, "GRANT", changes)
+            self._run_phase(executor, "REVOKE", changes)
+
+        delete_users = [user for shard in changes for user in shard.delete_users]
+        delete_groups = [group for shard in changes for group in shard.delete_groups]
+
+        if delete_users:
+            psql_client.delete_users(delete_users)
+        if delete_groups:
+            psql_client.delete_groups(delete_groups)
+
+        return sum(shard.changes for shard in changes)
@@ -0,0 +1,53 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import heapq
+import itertools
+import pickle
+import tempfile
+from typing import (
+    IO,
+    Iterable,
+    Iterator,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+def _read_run(file: IO[bytes]) -> Iterator:
+    """Read back the items of a sorted run, from the beginning of its file."""
+    file.seek(0)
+    while True:
+        try:
+            yield pickle.load(file)
+        except EOFError:
+            return
+
+
+def external_sort(items: Iterable[T], chunk_size: int = 100_000) -> Iterator[T]:
+    """Sort a stream of items, spilling sorted runs of the given size to disk.
+
+    At most one chunk of items is kept in memory while sorting,
+    and one item per run while merging the runs back together.
+    """
+    items = iter(items)
+    runs = []
+
+    try:
+        while chunk := list(itertools.islice(items, chunk_size)):
+            chunk.sort()
+            if not runs and len(chunk) < chunk_size:
+                yield from chunk
+                return
+
+            run = tempfile.TemporaryFile()
+            for item in chunk:
+                pickle.dump(item, run)
+
+            runs.append(run)
+
+        yield from heapq.merge(*(_read_run(run) for run in runs))
+    finally:
+        for run in runs:
+            run.close()
@@ -0,0 +1,112 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from .models import GroupMembers, Snapshot, SyncState
+
+logger = logging.getLogger()
+
+
+class SnapshotStore:
+    """Class to persist the last synced LDAP - PostgreSQL state on disk."""
+
+    _FORMAT_VERSION = 1
+
+    def __init__(self, directory: str, ldap_base_dn: str, psql_dsn: str):
+        """Initialize the store, keyed by the LDAP base DN and the PostgreSQL DSN."""
+        key = hashlib.sha256(f"{ldap_base_dn}\n{psql_dsn}".encode()).hexdigest()
+
+        self._directory = directory
+        self._path = os.path.join(directory, f"{key}.json.gz")
+
+    @staticmethod
+    def _encode_snapshot(snapshot: Snapshot) -> dict:
+        """Encode a snapshot as a dictionary of sorted arrays."""
+        return {
+            "users": sorted(snapshot.users),
+            "groups": sorted(snapshot.groups),
+            "memberships": sorted([m.group, sorted(m.users)] for m in snapshot.memberships),
+            "watermark": snapshot.watermark,
+        }
+
+    @staticmethod
+    def _decode_snapshot(data: dict) -> Snapshot:
+        """Decode a snapshot from a dictionary of sorted arrays."""
+        return Snapshot(
+            users=data["users"],
+            groups=data["groups"],
+            memberships=[GroupMembers(group, users) for group, users in data["memberships"]],
+            watermark=data["watermark"],
+        )
+
+    @classmethod
+    def snapshots_equal(cls, snapshot_1: Snapshot, snapshot_2: Snapshot) -> bool:
+        """Check whether two snapshots contain the same entities."""
+        data_1 = cls._encode_snapshot(snapshot_1)
+        data_2 = cls._encode_snapshot(snapshot_2)
+
+        data_1.pop("watermark")
+        data_2.pop("watermark")
+
+        return data_1 == data_2
+
+    def load(self) -> SyncState | None:
+        """Load the last synced state, if any."""
+        try:
+            with gzip.open(self._path, "rt") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (EOFError, OSError, ValueError):
+            logger.warning(f"Could not load the snapshot store {self._path}")
+            return None
+
+        if data.get("version") != self._FORMAT_VERSION:
+            return None
+
+        return SyncState(
+            ldap_snapshot=self._decode_snapshot(data["ldap"]),
+            psql_snapshot=self._decode_snapshot(data["psql"]),
+            psql_checksum=data["psql_checksum"],
+            actions=data["actions"],
+        )
+
+    def save(self, state: SyncState) -> None:
+        """Save the last synced state, replacing the previous one atomically."""
+        data = {
+            "version": self._FORMAT_VERSION,
+            "ldap": self._encode_snapshot(state.ldap_snapshot),
+            "psql": self._encode_snapshot(state.psql_snapshot),
+            "psql_checksum": state.psql_checksum,
+            "actions": sorted(state.actions),
+        }
+
+        os.makedirs(self._directory, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self._directory)
+
+        try:
+            with os.fdopen(file_descriptor, "wb") as raw_file:
+                with gzip.open(raw_file, "wt") as file:
+                    json.dump(data, file, separators=(",", ":"))
+
+                # The data must be on disk before the rename, for it to survive crashes
+                raw_file.flush()
+                os.fsync(raw_file.fileno())
+
+            os.replace(temp_path, self._path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def clear(self) -> None:
+        """Remove the last synced state, if any."""
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
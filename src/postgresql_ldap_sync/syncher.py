@@ -1,10 +1,29 @@
 # Copyright 2025 Canonical Ltd.
 # See LICENSE file for licensing details.
 
-from typing import Literal
+import logging
+import time
+from dataclasses import replace
+from typing import Callable, Iterable, Iterator, Literal
 
+from .batcher import DefaultBatcher
 from .clients import BaseLDAPClient, BasePostgreClient
-from .matcher import DefaultMatcher
+from .matcher import BaseMatcher
+from .metrics import BaseMetrics, NoopMetrics
+from .models import (
+    GroupMatch,
+    GroupMembershipMatch,
+    PlanCost,
+    Snapshot,
+    SyncPlan,
+    SyncScope,
+    SyncState,
+    UserMatch,
+)
+from .store import SnapshotStore
+from .throttler import DefaultThrottler
+
+logger = logging.getLogger()
 
 ROLE_ACTIONS = Literal[
     "CREATE",
@@ -19,6 +38,44 @@ MEMBERSHIP_ACTIONS = Literal[
 ]
 
 
+def filter_role_matches(
+    matches: Iterable[UserMatch | GroupMatch],
+    actions: list[ROLE_ACTIONS],
+) -> tuple[list[str], list[str]]:
+    """Filter the role matches by the provided actions, into creations and deletions."""
+    create_names = []
+    delete_names = []
+
+    for match in matches:
+        if match.should_create and "CREATE" in actions:
+            create_names.append(match.name)
+        elif match.should_delete and "DELETE" in actions:
+            delete_names.append(match.name)
+        elif match.should_keep and "KEEP" in actions:
+            pass
+
+    return create_names, delete_names
+
+
+def filter_membership_matches(
+    matches: Iterable[GroupMembershipMatch],
+    actions: list[MEMBERSHIP_ACTIONS],
+) -> tuple[list[GroupMembershipMatch], list[GroupMembershipMatch]]:
+    """Filter the membership matches by the provided actions, into grants and revokes."""
+    grant_matches = []
+    revoke_matches = []
+
+    for match in matches:
+        if match.should_grant and "GRANT" in actions:
+            grant_matches.append(match)
+        elif match.should_revoke and "REVOKE" in actions:
+            revoke_matches.append(match)
+        elif match.should_keep and "KEEP" in actions:
+            pass
+
+    return grant_matches, revoke_matches
+
+
 class Synchronizer:
     """Class to sync LDAP and PostgreSQL entities."""
 
@@ -26,12 +83,75 @@ class Synchronizer:
         self,
         ldap_client: BaseLDAPClient,
         psql_client: BasePostgreClient,
-        entity_matcher: DefaultMatcher,
+        entity_matcher: BaseMatcher,
+        entity_batcher: DefaultBatcher | None = None,
+        full_sync_interval: int = 10,
+        snapshot_store: SnapshotStore | None = None,
+        apply_throttler: DefaultThrottler | None = None,
+        metrics: BaseMetrics | None = None,
     ):
         """Initializes the LDAP - PostgreSQL synchronization class."""
         self._ldap_client = ldap_client
         self._psql_client = psql_client
         self._matcher = entity_matcher
+        self._batcher = entity_batcher or DefaultBatcher()
+        self._store = snapshot_store
+        self._throttler = apply_throttler
+        self._metrics = metrics or NoopMetrics()
+
+        self._full_sync_interval = full_sync_interval
+        self._incremental_cycles = 0
+        self._watermark = None
+
+    @staticmethod
+    def _restrict_snapshot(snapshot: Snapshot, scope: Snapshot) -> Snapshot:
+        """Restrict a snapshot to the entities present in a partial one."""
+        users = set(scope.users)
+        groups = set(scope.groups)
+
+        return Snapshot(
+            users=[user for user in snapshot.users if user in users],
+            groups=[group for group in snapshot.groups if group in groups],
+            memberships=[m for m in snapshot.memberships if m.group in groups],
+            watermark=snapshot.watermark,
+            complete=False,
+        )
+
+    def _fetch_ldap_snapshot(self, incremental: bool) -> Snapshot:
+        """Fetch an LDAP snapshot, only with the changed entities when possible."""
+        full_sync = (
+            not incremental
+            or not self._watermark
+            or self._incremental_cycles >= self._full_sync_interval
+        )
+
+        if full_sync:
+            snapshot = self._ldap_client.search_snapshot()
+        else:
+            snapshot = self._ldap_client.search_changes(self._watermark)
+
+        if snapshot.complete:
+            self._incremental_cycles = 0
+        else:
+            self._incremental_cycles += 1
+
+        self._watermark = snapshot.watermark or self._watermark
+        return snapshot
+
+    def _fetch_psql_snapshot(self) -> Snapshot:
+        """Fetch a PostgreSQL snapshot."""
+        with self._metrics.timer("sync_phase_seconds", phase="fetch_psql"):
+            return self._psql_client.search_snapshot()
+
+    def _grant_group_memberships(self, matches: list[GroupMembershipMatch]) -> None:
+        """Grant the matched group memberships in batches."""
+        for batch in self._batcher.batch_group_memberships(matches):
+            self._psql_client.grant_group_memberships(list(batch.groups), list(batch.users))
+
+    def _revoke_group_memberships(self, matches: list[GroupMembershipMatch]) -> None:
+        """Revoke the matched group memberships in batches."""
+        for batch in self._batcher.batch_group_memberships(matches):
+            self._psql_client.revoke_group_memberships(list(batch.groups), list(batch.users))
 
     def sync_users(self, actions: list[ROLE_ACTIONS]) -> None:
         """Sync LDAP users to PostgreSQL filtering by the provided actions."""
@@ -40,13 +160,12 @@ class Synchronizer:
             self._psql_client.search_users(),
         )
 
-        for match in matches:
-            if match.should_create and "CREATE" in actions:
-                self._psql_client.create_user(match.name)
-            elif match.should_delete and "DELETE" in actions:
-                self._psql_client.delete_user(match.name)
-            elif match.should_keep and "KEEP" in actions:
-                pass
+        create_users, delete_users = filter_role_matches(matches, actions)
+
+        for user in create_users:
+            self._psql_client.create_user(user)
+        if delete_users:
+            self._psql_client.delete_users(delete_users)
 
     def sync_groups(self, actions: list[ROLE_ACTIONS]) -> None:
         """Sync LDAP groups to PostgreSQL filtering by the provided actions."""
@@ -55,13 +174,12 @@ class Synchronizer:
             self._psql_client.search_groups(),
         )
 
-        for match in matches:
-            if match.should_create and "CREATE" in actions:
-                self._psql_client.create_group(match.name)
-            elif match.should_delete and "DELETE" in actions:
-                self._psql_client.delete_group(match.name)
-            elif match.should_keep and "KEEP" in actions:
-                pass
+        create_groups, delete_groups = filter_role_matches(matches, actions)
+
+        for group in create_groups:
+            self._psql_client.create_group(group)
+        if delete_groups:
+            self._psql_client.delete_groups(delete_groups)
 
     def sync_group_memberships(self, actions: list[MEMBERSHIP_ACTIONS]) -> None:
         """Sync LDAP memberships to PostgreSQL filtering by the provided actions."""
@@ -70,10 +188,308 @@ class Synchronizer:
             self._psql_client.search_group_memberships(),
         )
 
-        for match in matches:
-            if match.should_grant and "GRANT" in actions:
-                self._psql_client.grant_group_memberships([match.group_name], [match.user_name])
-            elif match.should_revoke and "REVOKE" in actions:
-                self._psql_client.revoke_group_memberships([match.group_name], [match.user_name])
-            elif match.should_keep and "KEEP" in actions:
-                pass
+        grant_matches, revoke_matches = filter_membership_matches(matches, actions)
+
+        self._grant_group_memberships(grant_matches)
+        self._revoke_group_memberships(revoke_matches)
+
+    def _build_plan(
+        self,
+        ldap_snapshot: Snapshot,
+        psql_snapshot: Snapshot,
+        user_actions: list[ROLE_ACTIONS],
+        group_actions: list[ROLE_ACTIONS],
+        member_actions: list[MEMBERSHIP_ACTIONS],
+    ) -> SyncPlan:
+        """Build the plan to sync a pair of LDAP - PostgreSQL snapshots."""
+        user_matches = self._matcher.match_users(ldap_snapshot.users, psql_snapshot.users)
+        group_matches = self._matcher.match_groups(ldap_snapshot.groups, psql_snapshot.groups)
+        member_matches = self._matcher.match_group_memberships(
+            ldap_snapshot.memberships,
+            psql_snapshot.memberships,
+        )
+
+        create_users, delete_users = filter_role_matches(user_matches, user_actions)
+        create_groups, delete_groups = filter_role_matches(group_matches, group_actions)
+        grant_matches, revoke_matches = filter_membership_matches(
+            member_matches,
+            member_actions,
+        )
+
+        return SyncPlan(
+            create_users=tuple(create_users),
+            create_groups=tuple(create_groups),
+            grant_batches=tuple(self._batcher.batch_group_memberships(grant_matches)),
+            revoke_batches=tuple(self._batcher.batch_group_memberships(revoke_matches)),
+            delete_users=tuple(delete_users),
+            delete_groups=tuple(delete_groups),
+        )
+
+    def _plan_steps(self, plan: SyncPlan) -> list[tuple[Callable, tuple, int]]:
+        """List the client calls to apply a plan in dependency order, with their sizes."""
+        client = self._psql_client
+        steps = []
+
+        steps += [(client.create_user, (user,), 1) for user in plan.create_users]
+        steps += [(client.create_group, (group,), 1) for group in plan.create_groups]
+        steps += [
+            (client.grant_group_memberships, (list(batch.groups), list(batch.users)), batch.size)
+            for batch in plan.grant_batches
+        ]
+        steps += [
+            (client.revoke_group_memberships, (list(batch.groups), list(batch.users)), batch.size)
+            for batch in plan.revoke_batches
+        ]
+
+        if plan.delete_users:
+            steps.append((client.delete_users, (list(plan.delete_users),), len(plan.delete_users)))
+        if plan.delete_groups:
+            steps.append((
+                client.delete_groups,
+                (list(plan.delete_groups),),
+                len(plan.delete_groups),
+            ))
+
+        return steps
+
+    def _apply_plan(self, plan: SyncPlan) -> None:
+        """Apply the changes of a plan in dependency order, paced by the throttler if any."""
+        total_changes = plan.changes
+        report_step = max(1, total_changes // 10)
+        applied_changes = 0
+
+        for func, args, size in self._plan_steps(plan):
+            if self._throttler:
+                self._throttler.throttle()
+
+            start_time = time.monotonic()
+            func(*args)
+
+            if self._throttler:
+                self._throttler.observe(time.monotonic() - start_time)
+
+            previous_changes, applied_changes = applied_changes, applied_changes + size
+            if applied_changes // report_step > previous_changes // report_step:
+                logger.info(f"Applied {applied_changes} / {total_changes} changes")
+
+    def _sync_snapshots(
+        self,
+        ldap_snapshot: Snapshot,
+        psql_snapshot: Snapshot,
+        user_actions: list[ROLE_ACTIONS],
+        group_actions: list[ROLE_ACTIONS],
+        member_actions: list[MEMBERSHIP_ACTIONS],
+    ) -> int:
+        """Sync a pair of LDAP - PostgreSQL snapshots, returning the number of changes."""
+        with self._metrics.timer("sync_phase_seconds", phase="match"):
+            plan = self._build_plan(
+                ldap_snapshot,
+                psql_snapshot,
+                user_actions,
+                group_actions,
+                member_actions,
+            )
+
+        with self._metrics.timer("sync_phase_seconds", phase="apply"):
+            self._apply_plan(plan)
+
+        return plan.changes
+
+    def _sync_stored_snapshots(
+        self,
+        ldap_snapshot: Snapshot,
+        **actions: list[ROLE_ACTIONS | MEMBERSHIP_ACTIONS],
+    ) -> int:
+        """Sync a complete LDAP snapshot, reusing the stored PostgreSQL state when unchanged.
+
+        The state only gets stored once a cycle finds no changes to apply, as the applied ones
+        may have failed without raising (e.g. logged role errors), and must then be retried.
+        """
+        action_names = sorted(
+            f"{kind}:{name}" for kind, names in actions.items() for name in names
+        )
+
+        state = self._store.load()
+        checksum = self._psql_client.search_checksum()
+
+        if state and checksum and state.psql_checksum == checksum:
+            ldap_unchanged = SnapshotStore.snapshots_equal(state.ldap_snapshot, ldap_snapshot)
+            if ldap_unchanged and state.actions == action_names:
+                return 0
+
+            psql_snapshot = state.psql_snapshot
+        else:
+            psql_snapshot = self._fetch_psql_snapshot()
+
+        changes = self._sync_snapshots(ldap_snapshot, psql_snapshot, **actions)
+        if changes:
+            self._store.clear()
+            return changes
+
+        self._store.save(
+            SyncState(
+                ldap_snapshot=ldap_snapshot,
+                psql_snapshot=psql_snapshot,
+                psql_checksum=checksum,
+                actions=action_names,
+            )
+        )
+
+        return changes
+
+    def sync_all(
+        self,
+        user_actions: list[ROLE_ACTIONS],
+        group_actions: list[ROLE_ACTIONS],
+        member_actions: list[MEMBERSHIP_ACTIONS],
+        incremental: bool = False,
+    ) -> int:
+        """Sync LDAP users, groups and memberships to PostgreSQL, fetching each side once.
+
+        The changes are applied in dependency order: role creations, membership grants,
+        membership revokes and, finally, role deletions.
+
+        In incremental mode, only the LDAP entities changed since the last cycle are fetched,
+        and deletions are deferred until the periodic full reconciliation.
+
+        With a snapshot store, the PostgreSQL catalog scan is skipped when its checksum
+        has not changed since the last converged cycle, and the whole cycle when LDAP
+        has not either.
+
+        Returns the number of changes applied.
+        """
+        with self._metrics.timer("sync_cycle_seconds"):
+            with self._metrics.timer("sync_phase_seconds", phase="fetch_ldap"):
+                ldap_snapshot = self._fetch_ldap_snapshot(incremental)
+
+            return self.sync_snapshot(ldap_snapshot, user_actions, group_actions, member_actions)
+
+    def sync_snapshot(
+        self,
+        ldap_snapshot: Snapshot,
+        user_actions: list[ROLE_ACTIONS],
+        group_actions: list[ROLE_ACTIONS],
+        member_actions: list[MEMBERSHIP_ACTIONS],
+    ) -> int:
+        """Sync an already fetched LDAP snapshot to PostgreSQL.
+
+        Partial snapshots only reconcile the entities they contain, deferring deletions.
+
+        Returns the number of changes applied.
+        """
+        actions = {
+            "user_actions": user_actions,
+            "group_actions": group_actions,
+            "member_actions": member_actions,
+        }
+
+        if ldap_snapshot.complete and self._store:
+            return self._sync_stored_snapshots(ldap_snapshot, **actions)
+
+        if not ldap_snapshot.complete:
+            if not (ldap_snapshot.users or ldap_snapshot.groups or ldap_snapshot.memberships):
+                return 0
+
+        psql_snapshot = self._fetch_psql_snapshot()
+        if not ldap_snapshot.complete:
+            psql_snapshot = self._restrict_snapshot(psql_snapshot, ldap_snapshot)
+
+        return self._sync_snapshots(ldap_snapshot, psql_snapshot, **actions)
+
+    def sync_scoped(
+        self,
+        scope: SyncScope,
+        user_actions: list[ROLE_ACTIONS],
+        group_actions: list[ROLE_ACTIONS],
+        member_actions: list[MEMBERSHIP_ACTIONS],
+    ) -> int:
+        """Sync the LDAP groups within a scope, their memberships and users, to PostgreSQL.
+
+        Only the scoped entities get fetched and matched on both sides. Role deletions are
+        deferred until a complete reconciliation, as the users may belong to other groups.
+
+        Returns the number of changes applied.
+        """
+        with self._metrics.timer("sync_cycle_seconds"):
+            with self._metrics.timer("sync_phase_seconds", phase="fetch_ldap"):
+                ldap_snapshot = self._ldap_client.search_scoped_snapshot(scope)
+            with self._metrics.timer("sync_phase_seconds", phase="fetch_psql"):
+                psql_snapshot = self._psql_client.search_scoped_snapshot(
+                    scope,
+                    users=ldap_snapshot.users,
+                )
+
+            return self._sync_snapshots(
+                ldap_snapshot,
+                self._restrict_snapshot(psql_snapshot, ldap_snapshot),
+                user_actions=user_actions,
+                group_actions=group_actions,
+                member_actions=member_actions,
+            )
+
+    def listen(
+        self,
+        user_actions: list[ROLE_ACTIONS],
+        group_actions: list[ROLE_ACTIONS],
+        member_actions: list[MEMBERSHIP_ACTIONS],
+        timeout: float = 30.0,
+    ) -> Iterator[int]:
+        """Sync LDAP changes as they get notified, yielding the number of changes applied.
+
+        A complete reconciliation runs first. LDAP clients without change notifications
+        support poll for changes instead, every timeout seconds.
+        """
+        for ldap_snapshot in self._ldap_client.listen_changes(timeout):
+            with self._metrics.timer("sync_cycle_seconds"):
+                changes = self.sync_snapshot(
+                    ldap_snapshot,
+                    user_actions,
+                    group_actions,
+                    member_actions,
+                )
+
+            yield changes
+
+    def plan(
+        self,
+        user_actions: list[ROLE_ACTIONS],
+        group_actions: list[ROLE_ACTIONS],
+        member_actions: list[MEMBERSHIP_ACTIONS],
+    ) -> SyncPlan:
+        """Plan the sync of LDAP users, groups and memberships, without applying any change.
+
+        The plan contains the SQL statements to be applied, the databases affected
+        by the role deletions, and the estimated cost of applying it with `execute`.
+        Those are left empty for PostgreSQL clients without recording support.
+        """
+        plan = self._build_plan(
+            self._ldap_client.search_snapshot(),
+            self._psql_client.search_snapshot(),
+            user_actions,
+            group_actions,
+            member_actions,
+        )
+
+        with self._psql_client.record() as round_trips:
+            if round_trips is None:
+                return plan
+
+            for func, args, _ in self._plan_steps(plan):
+                func(*args)
+
+        databases = []
+        if plan.delete_users or plan.delete_groups:
+            databases = self._psql_client.search_databases()
+
+        statements = [statement for _, queries in round_trips for statement in queries]
+        cost = PlanCost(
+            round_trips=len(round_trips),
+            connections=len({database for database, _ in round_trips}),
+            statements=len(statements),
+        )
+
+        return replace(plan, statements=tuple(statements), databases=tuple(databases), cost=cost)
+
+    def execute(self, plan: SyncPlan) -> None:
+        """Apply a previously generated sync plan."""
+        self._apply_plan(plan)
@@ -0,0 +1,83 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import logging
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger()
+
+
+class DefaultThrottler:
+    """Class to pace applied operations, backing off when the server is under load.
+
+    The rate gets multiplied by the backoff factor whenever the observed latency,
+    or the periodically sampled number of sessions waiting on locks, go above their
+    thresholds, and recovers by the recovery factor otherwise, up to the maximum rate.
+    Each lock waits sample only backs off once, on the observation that took it.
+    """
+
+    def __init__(
+        self,
+        max_rate: float = 100.0,
+        min_rate: float = 1.0,
+        max_latency: float = 0.5,
+        max_lock_waits: int = 5,
+        lock_check_interval: int = 50,
+        backoff_factor: float = 0.5,
+        recovery_factor: float = 1.1,
+    ):
+        """Initialize the throttler with the operations per second budget."""
+        if min_rate <= 0 or max_rate < min_rate:
+            raise ValueError("The rates must be positive, and the maximum above the minimum")
+        if not 0 < backoff_factor < 1 or recovery_factor < 1:
+            raise ValueError("The backoff factor must be within (0, 1), and recovery above 1")
+
+        self._max_rate = max_rate
+        self._min_rate = min_rate
+        self._max_latency = max_latency
+        self._max_lock_waits = max_lock_waits
+        self._lock_check_interval = lock_check_interval
+        self._backoff_factor = backoff_factor
+        self._recovery_factor = recovery_factor
+
+        self._lock = threading.Lock()
+        self._rate = max_rate
+        self._next_time = 0.0
+        self._observations = 0
+
+    @property
+    def rate(self) -> float:
+        """Current number of operations per second allowed."""
+        return self._rate
+
+    def throttle(self) -> None:
+        """Wait until the next operation is allowed by the current rate."""
+        with self._lock:
+            now = time.monotonic()
+            slot_time = max(now, self._next_time)
+            self._next_time = slot_time + 1 / self._rate
+
+        if slot_time > now:
+            time.sleep(slot_time - now)
+
+    def observe(self, latency: float, lock_waits_func: Callable[[], int] | None = None) -> None:
+        """Adapt the rate to the latency of an operation, and the periodic lock waits."""
+        with self._lock:
+            self._observations += 1
+            check_locks = self._observations % self._lock_check_interval == 0
+
+        lock_waits = 0
+        if lock_waits_func and check_locks:
+            lock_waits = lock_waits_func()
+
+        with self._lock:
+            if latency > self._max_latency or lock_waits > self._max_lock_waits:
+                rate = max(self._min_rate, self._rate * self._backoff_factor)
+                if rate < self._rate:
+                    logger.info(f"Backing off to {rate:.1f} operations per second")
+            else:
+                rate = min(self._max_rate, self._rate * self._recovery_factor)
+
+            self._rate = rate
@@ -0,0 +1,88 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+
+from postgresql_ldap_sync.clients import AsyncGLAuthClient
+from postgresql_ldap_sync.models import GroupMembers
+
+
+@pytest.mark.unit
+class TestAsyncGLAuthClientConcurrency:
+    """Class to group all the AsyncGLAuthClient concurrency tests."""
+
+    def test_asearch_many_bounded(self):
+        """Test the bounding of concurrent searches by the number of pooled connections."""
+        client = AsyncGLAuthClient(
+            "localhost",
+            "3893",
+            "dc=glauth,dc=com",
+            "user",
+            "pass",
+            connections=2,
+            filter_concurrency=4,
+        )
+        running = []
+        max_running = 0
+
+        async def asearch(filter_str: str, _) -> list[tuple[str, dict]]:
+            nonlocal max_running
+            running.append(filter_str)
+            max_running = max(max_running, len(running))
+            await asyncio.sleep(0.01)
+            running.remove(filter_str)
+            return [(filter_str, {})]
+
+        with patch.object(client, "_asearch", side_effect=asearch):
+            entries = asyncio.run(client._asearch_many(["a", "b", "c", "d", "e"], ["cn"]))
+
+        assert len(entries) == 5
+        assert max_running == 2
+
+
+@pytest.mark.integration
+class TestAsyncGLAuthClient:
+    """Class to group all the AsyncGLAuthClient tests."""
+
+    @pytest.fixture(scope="class")
+    def client(self):
+        """Client object to be used throughout the tests."""
+        return AsyncGLAuthClient(
+            host="0.0.0.0",
+            port="3893",
+            base_dn="dc=glauth,dc=com",
+            bind_username=os.environ["GLAUTH_USERNAME"],
+            bind_password=os.environ["GLAUTH_PASSWORD"],
+        )
+
+    def test_asearch_users_scoped(self, client: AsyncGLAuthClient):
+        """Test the asearch_users functionality from some groups."""
+        users = asyncio.run(client.asearch_users(from_groups=["danger"]))
+
+        assert "danger" in users
+        assert "hackers" not in users
+        assert "johndoe" not in users
+        assert "serviceuser" not in users
+
+    def test_asearch_groups_scoped(self, client: AsyncGLAuthClient):
+        """Test the asearch_groups functionality from some users."""
+        groups = asyncio.run(client.asearch_groups(from_users=["serviceuser"]))
+
+        assert "danger" not in groups
+        assert "superheros" not in groups
+        assert "svcaccts" in groups
+
+    def test_asearch_all(self, client: AsyncGLAuthClient):
+        """Test the asearch_all functionality."""
+        users, groups, memberships = asyncio.run(client.asearch_all())
+
+        assert set(users) == set(client.search_users())
+        assert set(groups) == set(client.search_groups())
+
+        assert GroupMembers("danger", ["danger"]) in memberships
+        assert GroupMembers("superheros", ["hackers", "johndoe"]) in memberships
+        assert GroupMembers("svcaccts", ["serviceuser"]) in memberships
@@ -2,11 +2,44 @@
 # See LICENSE file for licensing details.
 
 import os
+from unittest.mock import patch
 
 import pytest
 
 from postgresql_ldap_sync.clients import GLAuthClient
-from postgresql_ldap_sync.models import GroupMembers
+from postgresql_ldap_sync.models import GroupMembers, SyncScope
+
+
+@pytest.mark.unit
+class TestGLAuthClientFilters:
+    """Class to group all the GLAuthClient filter building tests."""
+
+    def test_search_scoped_snapshot_escaping(self):
+        """Test the escaping of scoped group names, keeping the pattern wildcards."""
+        client = GLAuthClient("localhost", "3893", "dc=glauth,dc=com", "user", "pass")
+        scope = SyncScope(groups=("admins*", "ops)(cn=*"), pattern="dev(*")
+
+        with patch.object(client, "_search_many", return_value=[]) as search_many:
+            client.search_scoped_snapshot(scope)
+
+        filter_strs = search_many.call_args.args[0]
+
+        assert r"(cn=admins\2a)(cn=ops\29\28cn=\2a)" in filter_strs[0]
+        assert r"(cn=dev\28*)" in filter_strs[1]
+
+    def test_search_scoped_snapshot_empty_group(self):
+        """Test the search_scoped_snapshot functionality, with member-less allowlisted groups."""
+        client = GLAuthClient("localhost", "3893", "dc=glauth,dc=com", "user", "pass")
+        entries = [
+            ("cn=admins", {"cn": [b"admins"], "memberUid": [b"alice"]}),
+            ("cn=empty", {"cn": [b"empty"]}),
+        ]
+
+        with patch.object(client, "_search_many", return_value=entries):
+            snapshot = client.search_scoped_snapshot(SyncScope(groups=("admins", "empty")))
+
+        assert set(snapshot.groups) == {"admins", "empty"}
+        assert snapshot.users == ["alice"]
 
 
 @pytest.mark.integration
@@ -44,6 +77,42 @@ class TestGLAuthClient:
         assert "johndoe" in users
         assert "serviceuser" in users
 
+    def test_search_users_paged(self):
+        """Test the search_users functionality across several pages of results."""
+        client = GLAuthClient(
+            host="0.0.0.0",
+            port="3893",
+            base_dn="dc=glauth,dc=com",
+            bind_username=os.environ["GLAUTH_USERNAME"],
+            bind_password=os.environ["GLAUTH_PASSWORD"],
+            page_size=1,
+        )
+
+        users = client.search_users()
+        users = list(users)
+
+        assert len(users) == len(set(users))
+        assert {"danger", "hackers", "johndoe", "serviceuser"} <= set(users)
+
+    def test_search_users_chunked(self):
+        """Test the search_users functionality from groups split across several filters."""
+        client = GLAuthClient(
+            host="0.0.0.0",
+            port="3893",
+            base_dn="dc=glauth,dc=com",
+            bind_username=os.environ["GLAUTH_USERNAME"],
+            bind_password=os.environ["GLAUTH_PASSWORD"],
+            page_size=1,
+            filter_chunk_size=1,
+            filter_concurrency=2,
+        )
+
+        users = client.search_users(from_groups=["danger", "superheros", "svcaccts"])
+        users = list(users)
+
+        assert len(users) == len(set(users))
+        assert {"danger", "hackers", "johndoe", "serviceuser"} <= set(users)
+
     def test_search_groups_scoped(self, client: GLAuthClient):
         """Test the search_groups functionality from some users."""
         groups = client.search_groups(from_users=["serviceuser"])
@@ -70,3 +139,29 @@ class TestGLAuthClient:
         assert GroupMembers("danger", ["danger"]) in memberships
         assert GroupMembers("superheros", ["hackers", "johndoe"]) in memberships
         assert GroupMembers("svcaccts", ["serviceuser"]) in memberships
+
+    def test_search_snapshot(self, client: GLAuthClient):
+        """Test the search_snapshot functionality."""
+        snapshot = client.search_snapshot()
+
+        assert set(snapshot.users) == set(client.search_users())
+        assert set(snapshot.groups) == set(client.search_groups())
+        assert GroupMembers("superheros", ["hackers", "johndoe"]) in snapshot.memberships
+
+    def test_search_scoped_snapshot(self, client: GLAuthClient):
+        """Test the search_scoped_snapshot functionality, by group names and pattern."""
+        snapshot = client.search_scoped_snapshot(SyncScope(groups=("svcaccts",), pattern="super*"))
+        memberships = [GroupMembers(m.group, sorted(m.users)) for m in snapshot.memberships]
+
+        assert snapshot.complete is False
+        assert set(snapshot.groups) == {"superheros", "svcaccts"}
+        assert set(snapshot.users) == {"hackers", "johndoe", "serviceuser"}
+        assert GroupMembers("superheros", ["hackers", "johndoe"]) in memberships
+
+    def test_search_changes(self, client: GLAuthClient):
+        """Test the search_changes functionality with a future watermark."""
+        snapshot = client.search_changes(since="99991231235959Z")
+
+        assert snapshot.complete is False
+        assert snapshot.users == []
+        assert snapshot.memberships == []
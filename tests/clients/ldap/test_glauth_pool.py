@@ -0,0 +1,113 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from unittest.mock import Mock, patch
+
+import ldap
+import pytest
+
+from postgresql_ldap_sync.clients import GLAuthClient
+from postgresql_ldap_sync.clients.ldap.glauth import DefaultLDAPPool
+
+
+@pytest.mark.unit
+class TestDefaultLDAPPool:
+    """Class to group all the DefaultLDAPPool tests."""
+
+    def test_lazy_bind(self):
+        """Test the binding of connections upon their first checkout, reusing them after."""
+        with patch("ldap.initialize") as initialize:
+            pool = DefaultLDAPPool("ldap://localhost:3893", "user", "pass")
+            initialize.assert_not_called()
+
+            with pool.connection() as first_client:
+                pass
+            with pool.connection() as second_client:
+                pass
+
+        initialize.assert_called_once()
+        first_client.simple_bind_s.assert_called_once_with("user", "pass")
+        assert first_client is second_client
+
+    def test_liveness_check(self):
+        """Test the replacement of idle connections failing their liveness check."""
+        with patch("ldap.initialize", side_effect=[Mock(), Mock()]):
+            pool = DefaultLDAPPool("ldap://localhost:3893", "user", "pass", liveness_interval=0)
+
+            with pool.connection() as first_client:
+                first_client.whoami_s.side_effect = ldap.SERVER_DOWN()
+            with pool.connection() as second_client:
+                pass
+
+        first_client.unbind_s.assert_called_once()
+        assert first_client is not second_client
+
+    def test_server_down(self):
+        """Test the discarding of connections failing with SERVER_DOWN."""
+        with patch("ldap.initialize", side_effect=[Mock(), Mock()]):
+            pool = DefaultLDAPPool("ldap://localhost:3893", "user", "pass")
+
+            with pytest.raises(ldap.SERVER_DOWN):
+                with pool.connection() as first_client:
+                    raise ldap.SERVER_DOWN()
+            with pool.connection() as second_client:
+                pass
+
+        assert first_client is not second_client
+
+    def test_checkout_timeout(self):
+        """Test the failure to borrow a connection when all of them are in use."""
+        with patch("ldap.initialize"):
+            pool = DefaultLDAPPool("ldap://localhost:3893", "user", "pass", checkout_timeout=0)
+
+            with pool.connection():
+                with pytest.raises(TimeoutError):
+                    with pool.connection():
+                        pass
+
+    def test_search_rebind(self):
+        """Test the retry of searches interrupted by SERVER_DOWN, skipping yielded entries."""
+        first_page = ([], [("cn=alice", {"cn": [b"alice"]})], None, [])
+        dead_client = Mock()
+        dead_client.result3.side_effect = [first_page, ldap.SERVER_DOWN()]
+
+        live_client = Mock()
+        live_client.result3.side_effect = [
+            ([], [("cn=alice", {"cn": [b"alice"]}), ("cn=bob", {"cn": [b"bob"]})], None, []),
+        ]
+
+        with (
+            patch("ldap.initialize", side_effect=[dead_client, live_client]),
+            patch.object(GLAuthClient, "_parse_page_cookie", side_effect=[b"cookie", None]),
+        ):
+            client = GLAuthClient("localhost", "3893", "dc=glauth,dc=com", "user", "pass")
+            users = list(client.search_users())
+
+        assert users == ["alice", "bob"]
+        dead_client.unbind_s.assert_called_once()
+
+    def test_search_many_rebind(self):
+        """Test the retry of pipelined searches interrupted by SERVER_DOWN, skipping seen DNs."""
+        dead_client = Mock()
+        dead_client.result3.side_effect = [
+            ([], [("cn=alice", {"cn": [b"alice"]})], None, []),
+            ldap.SERVER_DOWN(),
+        ]
+
+        live_client = Mock()
+        live_client.result3.side_effect = [
+            ([], [("cn=alice", {"cn": [b"alice"]})], None, []),
+            ([], [("cn=alice", {"cn": [b"alice"]}), ("cn=bob", {"cn": [b"bob"]})], None, []),
+        ]
+
+        with (
+            patch("ldap.initialize", side_effect=[dead_client, live_client]),
+            patch.object(GLAuthClient, "_parse_page_cookie", return_value=None),
+        ):
+            client = GLAuthClient(
+                "localhost", "3893", "dc=glauth,dc=com", "user", "pass", filter_chunk_size=1
+            )
+            users = list(client.search_users(from_groups=["admins", "devs"]))
+
+        assert users == ["alice", "bob"]
+        dead_client.unbind_s.assert_called_once()
@@ -0,0 +1,106 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from postgresql_ldap_sync.clients import GLAuthClient, SyncreplLDAPClient
+from postgresql_ldap_sync.models import GroupMembers, Snapshot
+
+
+@pytest.mark.unit
+class TestSyncreplConsumer:
+    """Class to group all the SyncreplLDAPClient content sync consumer tests."""
+
+    @pytest.fixture
+    def connection(self):
+        """Content sync connection mock, with no pending entries."""
+        connection = MagicMock()
+        connection.entries = {}
+        connection.deleted = False
+        connection.messages = 0
+        return connection
+
+    def test_listen_changes_drain(self, connection: MagicMock):
+        """Test the end of the draining, once a poll consumes no message."""
+
+        def syncrepl_poll(**_) -> bool:
+            if connection.syncrepl_poll.call_count == 1:
+                connection.entries["uuid-1"] = ("cn=alice", {"cn": [b"alice"]})
+                connection.messages += 1
+            return True
+
+        connection.syncrepl_poll.side_effect = syncrepl_poll
+        client = SyncreplLDAPClient("localhost", "3893", "dc=glauth,dc=com", "user", "pass")
+
+        with patch.object(client, "_connect_syncrepl", return_value=(connection, 1)):
+            snapshots = client.listen_changes(timeout=30)
+
+            assert next(snapshots).complete
+            assert next(snapshots).users == ["alice"]
+            assert next(snapshots).users == []
+
+        assert connection.syncrepl_poll.call_count == 4
+
+    def test_listen_changes_close(self, connection: MagicMock):
+        """Test the unbinding of the connection, once the content sync search ends."""
+        connection.syncrepl_poll.return_value = False
+        client = SyncreplLDAPClient("localhost", "3893", "dc=glauth,dc=com", "user", "pass")
+
+        with (
+            patch.object(client, "_connect_syncrepl", return_value=(connection, 1)),
+            patch("time.sleep"),
+            patch.object(GLAuthClient, "search_snapshot", return_value=Snapshot([], [], [])),
+        ):
+            snapshots = client.listen_changes(timeout=30)
+
+            next(snapshots)
+            next(snapshots)
+            connection.unbind_s.assert_not_called()
+            next(snapshots)
+            connection.unbind_s.assert_called_once()
+
+    def test_listen_changes_empty_group(self, connection: MagicMock):
+        """Test the parsing of groups without members, e.g. after removing the last one."""
+        connection.syncrepl_poll.return_value = False
+        connection.entries["uuid-1"] = (
+            "cn=admins",
+            {"cn": [b"admins"], "objectClass": [b"posixGroup"]},
+        )
+        client = SyncreplLDAPClient("localhost", "3893", "dc=glauth,dc=com", "user", "pass")
+
+        with patch.object(client, "_connect_syncrepl", return_value=(connection, 1)):
+            snapshot = next(client.listen_changes(timeout=30))
+
+        assert snapshot.groups == ["admins"]
+        assert snapshot.memberships == [GroupMembers("admins", [])]
+
+
+@pytest.mark.integration
+class TestSyncreplLDAPClient:
+    """Class to group all the SyncreplLDAPClient tests."""
+
+    @pytest.fixture(scope="class")
+    def client(self):
+        """Client object to be used throughout the tests."""
+        return SyncreplLDAPClient(
+            host="0.0.0.0",
+            port="3893",
+            base_dn="dc=glauth,dc=com",
+            bind_username=os.environ["GLAUTH_USERNAME"],
+            bind_password=os.environ["GLAUTH_PASSWORD"],
+        )
+
+    def test_listen_changes_polling(self, client: SyncreplLDAPClient):
+        """Test the fallback to polling, as GLAuth does not support content sync."""
+        with patch("time.sleep") as sleep:
+            snapshots = client.listen_changes(timeout=5)
+
+            snapshot = next(snapshots)
+            assert snapshot.complete
+            assert "johndoe" in snapshot.users
+
+            next(snapshots)
+            sleep.assert_called_once_with(5)
@@ -7,7 +7,7 @@ import pytest
 from psycopg2.sql import SQL, Literal
 
 from postgresql_ldap_sync.clients import DefaultPostgresClient
-from postgresql_ldap_sync.models import GroupMembers
+from postgresql_ldap_sync.models import GroupMembers, SyncScope
 
 
 @pytest.mark.integration
@@ -93,6 +93,26 @@ class TestDefaultPostgresClient:
         users = list(users)
         assert user_name not in users
 
+    def test_delete_users_with_ownership(self, client: DefaultPostgresClient, client_user: str):
+        """Test the delete_users functionality when the users do own a resource."""
+        user_names = ["user_deleted_in_bulk_1", "user_deleted_in_bulk_2"]
+
+        for user_name in user_names:
+            client.create_user(user_name)
+            table_name = f"{user_name}_table"
+            client._executor.execute_query(SQL(f"CREATE TABLE {table_name} (id SERIAL)"))
+            client._executor.execute_query(SQL(f"ALTER TABLE {table_name} OWNER TO {user_name}"))
+
+        client.delete_users(user_names)
+
+        for user_name in user_names:
+            owner = self._fetch_table_owner(client, f"{user_name}_table")
+            assert owner == client_user
+
+        users = client.search_users()
+        users = list(users)
+        assert not set(user_names) & set(users)
+
     def test_create_group(self, client: DefaultPostgresClient):
         """Test the create_user functionality."""
         client.create_group("group_rw")
@@ -169,6 +189,53 @@ class TestDefaultPostgresClient:
         """Test the revoke_group_membership functionality with empty lists."""
         client.revoke_group_memberships([], [])
 
+    def test_pipeline(self, client: DefaultPostgresClient):
+        """Test the deferral of statements within a pipeline, isolating the failing ones."""
+        user_name = "user_pipeline"
+        group_name = "group_pipeline"
+
+        with client.pipeline(batch_size=2) as errors:
+            client.create_user(user_name)
+            client.create_group(group_name)
+            client.grant_group_memberships([group_name, "group_missing"], [user_name])
+
+        assert len(errors) == 2
+
+        users = client.search_users(from_group=group_name)
+        users = list(users)
+        assert user_name in users
+
+        client.delete_user(user_name)
+        client.delete_group(group_name)
+
+    def test_record(self, client: DefaultPostgresClient):
+        """Test the recording of statements, without applying them."""
+        user_name = "user_record"
+
+        with client.record() as round_trips:
+            client.create_user(user_name)
+            client.delete_user("user_1")
+
+        databases = {database for database, _ in round_trips}
+        statements = [statement for _, queries in round_trips for statement in queries]
+
+        assert databases == set(client.search_databases())
+        assert statements[0] == f'CREATE ROLE "{user_name}" WITH INHERIT LOGIN'
+        assert statements[-1] == 'DROP ROLE "user_1"'
+        assert user_name not in client.search_users()
+        assert "user_1" in client.search_users()
+
+    def test_stream_results(self, client: DefaultPostgresClient):
+        """Test the streaming of rows through a server-side cursor, in small batches."""
+        query = SQL(
+            "SELECT rolname FROM pg_catalog.pg_roles "
+            "WHERE rolname IN ('user_1', 'user_2') "
+            "ORDER BY 1"
+        )
+        rows = client._executor.stream_results(query, itersize=1)
+
+        assert list(rows) == [("user_1",), ("user_2",)]
+
     def test_search_users_scoped(self, client: DefaultPostgresClient):
         """Test the search_users functionality from a group."""
         users = client.search_users(from_group="group_1")
@@ -217,3 +284,40 @@ class TestDefaultPostgresClient:
         assert GroupMembers("group_1", ["user_1", "user_2"]) in memberships
         assert GroupMembers("group_2", ["user_2", "user_3"]) in memberships
         assert GroupMembers("group_3", ["group_1"]) not in memberships
+
+    def test_search_snapshot(self, client: DefaultPostgresClient):
+        """Test the search_snapshot functionality."""
+        snapshot = client.search_snapshot()
+        memberships = [GroupMembers(m.group, sorted(m.users)) for m in snapshot.memberships]
+
+        assert set(snapshot.users) == set(client.search_users())
+        assert set(snapshot.groups) == set(client.search_groups())
+
+        assert GroupMembers("group_1", ["user_1", "user_2"]) in memberships
+        assert GroupMembers("group_2", ["user_2", "user_3"]) in memberships
+        assert GroupMembers("group_3", ["group_1"]) not in memberships
+
+    def test_search_scoped_snapshot(self, client: DefaultPostgresClient):
+        """Test the search_scoped_snapshot functionality."""
+        scope = SyncScope(groups=("group_1",), pattern="group_*")
+        snapshot = client.search_scoped_snapshot(scope, users=["user_3", "missing"])
+        memberships = [GroupMembers(m.group, sorted(m.users)) for m in snapshot.memberships]
+
+        assert {"group_1", "group_2"} <= set(snapshot.groups)
+        assert {"user_1", "user_2", "user_3"} == set(snapshot.users)
+        assert snapshot.complete is False
+
+        assert GroupMembers("group_1", ["user_1", "user_2"]) in memberships
+        assert GroupMembers("group_2", ["user_2", "user_3"]) in memberships
+
+    def test_search_checksum(self, client: DefaultPostgresClient):
+        """Test the search_checksum functionality."""
+        checksum_1 = client.search_checksum()
+        checksum_2 = client.search_checksum()
+        assert checksum_1 == checksum_2
+
+        client.create_user("user_checksum")
+        checksum_3 = client.search_checksum()
+        assert checksum_1 != checksum_3
+
+        client.delete_user("user_checksum")
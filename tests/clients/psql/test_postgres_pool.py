@@ -0,0 +1,360 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from contextlib import nullcontext
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+import pytest
+from psycopg2.sql import SQL
+
+from postgresql_ldap_sync.clients.psql.postgres import (
+    DefaultPostgresClient,
+    DefaultPostgresExecutor,
+    DefaultPostgresPool,
+)
+from postgresql_ldap_sync.throttler import DefaultThrottler
+
+
+def _build_connection() -> MagicMock:
+    """Build a mock psycopg2 connection, alive until told otherwise."""
+    connection = MagicMock()
+    connection.closed = 0
+    return connection
+
+
+def _build_cursor(connection: MagicMock) -> MagicMock:
+    """Get the cursor mock of a mock psycopg2 connection."""
+    return connection.cursor.return_value.__enter__.return_value
+
+
+def _lose_connection(connection: MagicMock) -> None:
+    """Make the cursor of a mock psycopg2 connection fail, as if the server went away."""
+
+    def execute(*_):
+        connection.closed = 2
+        raise psycopg2.OperationalError("server closed the connection unexpectedly")
+
+    _build_cursor(connection).execute.side_effect = execute
+
+
+@pytest.mark.unit
+class TestDefaultPostgresExecutor:
+    """Class to group all the DefaultPostgresExecutor tests."""
+
+    def test_reconnect(self):
+        """Test the retry of read queries on a new connection, after the previous one got lost."""
+        lost_connection = _build_connection()
+        live_connection = _build_connection()
+        _lose_connection(lost_connection)
+
+        with patch("psycopg2.connect", side_effect=[lost_connection, live_connection]):
+            executor = DefaultPostgresExecutor("localhost", "5432", "db", "user", "pass")
+            executor.fetch_results(SQL("SELECT rolname FROM pg_roles"))
+
+        _build_cursor(live_connection).execute.assert_called_once()
+        lost_connection.close.assert_called_once()
+
+    def test_reconnect_write(self):
+        """Test the raising of write queries, after reconnecting, as they may have been applied."""
+        lost_connection = _build_connection()
+        live_connection = _build_connection()
+        _lose_connection(lost_connection)
+
+        with patch("psycopg2.connect", side_effect=[lost_connection, live_connection]):
+            executor = DefaultPostgresExecutor("localhost", "5432", "db", "user", "pass")
+
+            with pytest.raises(psycopg2.OperationalError):
+                executor.execute_query(SQL("CREATE ROLE alice"))
+
+        _build_cursor(live_connection).execute.assert_not_called()
+        assert executor._connection is live_connection
+
+    def test_reconnect_transaction(self):
+        """Test the raising of queries interrupted within a transaction, after reconnecting."""
+        lost_connection = _build_connection()
+        live_connection = _build_connection()
+        _lose_connection(lost_connection)
+
+        with patch("psycopg2.connect", side_effect=[lost_connection, live_connection]):
+            executor = DefaultPostgresExecutor(
+                "localhost", "5432", "db", "user", "pass", auto_commit=False
+            )
+
+            with pytest.raises(psycopg2.OperationalError):
+                executor.execute_query(SQL("CREATE ROLE alice"))
+
+        _build_cursor(live_connection).execute.assert_not_called()
+        assert executor._connection is live_connection
+
+    def test_fetch_prepared(self):
+        """Test the preparation of statements once per connection."""
+        connection = _build_connection()
+
+        with patch("psycopg2.connect", return_value=connection):
+            executor = DefaultPostgresExecutor("localhost", "5432", "db", "user", "pass")
+            executor.fetch_prepared("search_roles", SQL("SELECT rolname FROM pg_roles"))
+            executor.fetch_prepared("search_roles", SQL("SELECT rolname FROM pg_roles"))
+
+            assert _build_cursor(connection).execute.call_count == 3
+
+            executor.reconnect()
+            executor.fetch_prepared("search_roles", SQL("SELECT rolname FROM pg_roles"))
+
+            assert _build_cursor(connection).execute.call_count == 5
+
+    def test_fetch_prepared_disabled(self):
+        """Test the plain execution of statements, when preparing them is disabled."""
+        connection = _build_connection()
+
+        with patch("psycopg2.connect", return_value=connection):
+            executor = DefaultPostgresExecutor(
+                "localhost", "5432", "db", "user", "pass", prepare_statements=False
+            )
+            executor.fetch_prepared("search_roles", SQL("SELECT rolname FROM pg_roles"))
+            executor.fetch_prepared("search_roles", SQL("SELECT rolname FROM pg_roles"))
+
+        assert _build_cursor(connection).execute.call_count == 2
+
+    def test_pipeline(self):
+        """Test the batching of queries within a single transaction, when pipelined."""
+        connection = _build_connection()
+        connection.autocommit = True
+        cursor = _build_cursor(connection)
+
+        with patch("psycopg2.connect", return_value=connection):
+            executor = DefaultPostgresExecutor("localhost", "5432", "db", "user", "pass")
+
+            with executor.pipeline(batch_size=2) as errors:
+                executor.execute_query(SQL("CREATE ROLE alice"))
+                cursor.execute.assert_not_called()
+                assert connection.autocommit is False
+
+                executor.execute_query(SQL("CREATE ROLE brianna"))
+                executor.execute_query(SQL("CREATE ROLE charlie"))
+                assert cursor.execute.call_count == 1
+
+        assert cursor.execute.call_count == 2
+        assert errors == []
+        assert connection.autocommit is True
+        connection.commit.assert_called_once()
+
+    def test_pipeline_errors(self):
+        """Test the isolation of failed queries to their own savepoint, when pipelined."""
+        connection = _build_connection()
+        connection.autocommit = True
+        cursor = _build_cursor(connection)
+        cursor.execute.side_effect = [
+            psycopg2.ProgrammingError("role already exists"),
+            None,
+            None,
+            None,
+            psycopg2.ProgrammingError("role already exists"),
+            None,
+            None,
+        ]
+
+        with patch("psycopg2.connect", return_value=connection):
+            executor = DefaultPostgresExecutor("localhost", "5432", "db", "user", "pass")
+
+            with executor.pipeline() as errors:
+                executor.execute_query(SQL("CREATE ROLE alice"))
+                executor.execute_query(SQL("CREATE ROLE brianna"))
+
+        assert cursor.execute.call_count == 7
+        assert [query for query, _ in errors] == ["CREATE ROLE brianna"]
+        connection.commit.assert_called_once()
+
+    def test_stream_results(self):
+        """Test the streaming of rows as tuples, through a server-side cursor."""
+        connection = _build_connection()
+        connection.autocommit = True
+        cursor = connection.cursor.return_value
+        cursor.__enter__.return_value = cursor
+        cursor.__iter__.return_value = iter([("alice",), ("brianna",)])
+
+        with patch("psycopg2.connect", return_value=connection):
+            executor = DefaultPostgresExecutor("localhost", "5432", "db", "user", "pass")
+            rows = executor.stream_results(SQL("SELECT rolname FROM pg_roles"), itersize=100)
+
+            connection.cursor.assert_not_called()
+            assert list(rows) == [("alice",), ("brianna",)]
+
+        assert cursor.itersize == 100
+        assert connection.cursor.call_args.kwargs["withhold"] is True
+        assert connection.cursor.call_args.kwargs["name"].startswith("stream_results_")
+
+    def test_stream_results_reconnect(self):
+        """Test the retry of opening a server-side cursor, after the connection got lost."""
+        lost_connection = _build_connection()
+        lost_connection.cursor.return_value.execute.side_effect = psycopg2.OperationalError()
+        lost_connection.closed = 2
+
+        live_connection = _build_connection()
+        live_cursor = live_connection.cursor.return_value
+        live_cursor.__enter__.return_value = live_cursor
+        live_cursor.__iter__.return_value = iter([("alice",)])
+
+        with patch("psycopg2.connect", side_effect=[lost_connection, live_connection]):
+            executor = DefaultPostgresExecutor("localhost", "5432", "db", "user", "pass")
+            rows = list(executor.stream_results(SQL("SELECT rolname FROM pg_roles")))
+
+        assert rows == [("alice",)]
+        lost_connection.cursor.return_value.close.assert_called_once()
+        live_cursor.execute.assert_called_once()
+
+
+@pytest.mark.unit
+class TestDefaultPostgresPool:
+    """Class to group all the DefaultPostgresPool tests."""
+
+    def test_reuse(self):
+        """Test the reuse of executors across borrows, connecting to each database lazily."""
+        with patch("psycopg2.connect", side_effect=lambda **_: _build_connection()) as connect:
+            pool = DefaultPostgresPool("localhost", "5432", "user", "pass")
+            connect.assert_not_called()
+
+            with pool.executor("db_1") as first_executor:
+                pass
+            with pool.executor("db_1") as second_executor:
+                pass
+            with pool.executor("db_2"):
+                pass
+
+        assert first_executor is second_executor
+        assert connect.call_count == 2
+
+    def test_health_check(self):
+        """Test the replacement of idle connections failing their health check."""
+        lost_connection = _build_connection()
+        live_connection = _build_connection()
+
+        with patch("psycopg2.connect", side_effect=[lost_connection, live_connection]):
+            pool = DefaultPostgresPool(
+                "localhost", "5432", "user", "pass", health_check_interval=0
+            )
+
+            with pool.executor("db_1"):
+                pass
+
+            _lose_connection(lost_connection)
+
+            with pool.executor("db_1") as executor:
+                assert executor._connection is live_connection
+
+    def test_transaction_rollback(self):
+        """Test the rolling back of executors transactions, when outside auto-commit mode."""
+        with patch("psycopg2.connect", side_effect=lambda **_: _build_connection()):
+            pool = DefaultPostgresPool(
+                "localhost", "5432", "user", "pass", auto_commit=False, health_check_interval=0
+            )
+
+            with pool.executor("db_1") as executor:
+                executor.execute_query(SQL("REASSIGN OWNED BY alice TO admin"))
+
+            executor._connection.rollback.assert_called_once()
+
+            with pool.executor("db_1"):
+                _build_cursor(executor._connection).execute.assert_called_with(SQL("SELECT 1"))
+                assert executor._connection.rollback.call_count == 2
+
+    def test_max_size(self):
+        """Test the closing of the least recently used executors, above the maximum size."""
+        with patch("psycopg2.connect", side_effect=lambda **_: _build_connection()):
+            pool = DefaultPostgresPool("localhost", "5432", "user", "pass", max_size=1)
+
+            with pool.executor("db_1") as first_executor:
+                pass
+            with pool.executor("db_2") as second_executor:
+                pass
+
+        first_executor._connection.close.assert_called_once()
+        second_executor._connection.close.assert_not_called()
+
+    def test_idle_timeout(self):
+        """Test the closing of executors idle for longer than the timeout."""
+        with patch("psycopg2.connect", side_effect=lambda **_: _build_connection()):
+            pool = DefaultPostgresPool("localhost", "5432", "user", "pass", idle_timeout=-1)
+
+            with pool.executor("db_1") as executor:
+                pass
+
+        executor._connection.close.assert_called_once()
+
+
+@pytest.mark.unit
+class TestRoleDeletions:
+    """Class to group the DefaultPostgresClient role deletion tests, across databases."""
+
+    @pytest.fixture
+    def client(self):
+        """Client object, with mocked executors, to be used throughout the tests."""
+        with patch("psycopg2.connect", side_effect=lambda **_: _build_connection()):
+            client = DefaultPostgresClient("localhost", "5432", "db", "user", "pass")
+
+        client._executor = MagicMock()
+        return client
+
+    def test_database_workers(self):
+        """Test the rejection of a non-positive number of database workers."""
+        with pytest.raises(ValueError):
+            DefaultPostgresClient("localhost", "5432", "db", "user", "pass", database_workers=0)
+
+    def test_reassign_failure(self, client: DefaultPostgresClient):
+        """Test the skipping of role drops, when reassigning objects fails in some database."""
+        executors = {"db_1": MagicMock(), "db_2": MagicMock(), "db_3": MagicMock()}
+        executors["db_2"].execute_query.side_effect = psycopg2.OperationalError("db_2")
+        executors["db_3"].execute_query.side_effect = psycopg2.OperationalError("db_3")
+
+        with (
+            patch.object(client, "_list_databases", return_value=iter(executors)),
+            patch.object(
+                client._pool, "executor", side_effect=lambda db: nullcontext(executors[db])
+            ),
+            patch("postgresql_ldap_sync.clients.psql.postgres.logger") as logger,
+        ):
+            with pytest.raises(psycopg2.OperationalError):
+                client.delete_users(["alice"])
+
+        executors["db_1"].execute_query.assert_called_once()
+        client._executor.execute_query.assert_not_called()
+        assert logger.error.call_count == 2
+        assert all(c.kwargs["exc_info"] for c in logger.error.call_args_list)
+
+    def test_reassign_bad_role(self, client: DefaultPostgresClient):
+        """Test the splitting of reassign batches, only skipping the roles that failed."""
+        executor = MagicMock()
+
+        def execute_query(query, on_error=None):
+            if "'bob'" in repr(query):
+                on_error(psycopg2.ProgrammingError("permission denied"))
+
+        executor.execute_query.side_effect = execute_query
+
+        with (
+            patch.object(client, "_list_databases", return_value=iter(["db_1", "db_2"])),
+            patch.object(client._pool, "executor", return_value=nullcontext(executor)),
+        ):
+            client.delete_users(["alice", "bob", "charlie"])
+
+        drop_query = repr(client._executor.execute_query.call_args.args[0])
+
+        assert "'alice'" in drop_query
+        assert "'charlie'" in drop_query
+        assert "'bob'" not in drop_query
+
+    def test_lock_waits_executor(self, client: DefaultPostgresClient):
+        """Test the search of lock waits on the executor that applied the throttled queries."""
+        executor = MagicMock()
+        executor.fetch_prepared.return_value = [{"waits": 0}]
+        client._executor.fetch_prepared.return_value = [{"waits": 0}]
+        client._throttler = DefaultThrottler(lock_check_interval=1)
+
+        with (
+            patch.object(client, "_list_databases", return_value=iter(["db_1"])),
+            patch.object(client._pool, "executor", return_value=nullcontext(executor)),
+        ):
+            client.delete_users(["alice"])
+
+        executor.fetch_prepared.assert_called_once()
+        client._executor.fetch_prepared.assert_called_once()
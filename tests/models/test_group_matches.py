@@ -89,3 +89,14 @@ class TestGroupMembershipMatch:
         assert match.should_grant is False
         assert match.should_revoke is False
         assert match.should_keep is True
+
+    def test_compact(self):
+        """Test the compact representation of a GroupMembershipMatch."""
+        match = GroupMembershipMatch(
+            user_name="sample-user",
+            group_name="sample-group",
+            exists_in_ldap=True,
+            exists_in_psql=True,
+        )
+
+        assert not hasattr(match, "__dict__")
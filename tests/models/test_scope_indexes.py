@@ -0,0 +1,49 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import pytest
+
+from postgresql_ldap_sync.models import GroupMembers, ScopeIndex, SyncScope
+
+
+@pytest.mark.unit
+class TestScopeIndex:
+    """Class to group all the ScopeIndex tests."""
+
+    @pytest.fixture(scope="class")
+    def memberships(self):
+        """Group memberships to be used throughout the tests."""
+        return [
+            GroupMembers(group="canonical", users=["alice", "brianna"]),
+            GroupMembers(group="sdaia", users=["brianna", "daniel"]),
+            GroupMembers(group="internal", users=["operator"]),
+        ]
+
+    def test_from_memberships(self, memberships: list[GroupMembers]):
+        """Test the indexing of memberships in both directions, filtered by scope."""
+        scope = SyncScope(groups=("canonical",), pattern="sd*")
+        index = ScopeIndex.from_memberships(memberships, scope)
+
+        assert index.group_users == {
+            "canonical": {"alice", "brianna"},
+            "sdaia": {"brianna", "daniel"},
+        }
+        assert index.user_groups == {
+            "alice": {"canonical"},
+            "brianna": {"canonical", "sdaia"},
+            "daniel": {"sdaia"},
+        }
+
+    def test_to_snapshot(self, memberships: list[GroupMembers]):
+        """Test the building of a partial snapshot out of the index."""
+        scope = SyncScope(groups=("canonical",))
+        index = ScopeIndex.from_memberships(memberships, scope)
+        snapshot = index.to_snapshot(users=["charlie"], groups=["empty"])
+
+        assert sorted(snapshot.users) == ["alice", "brianna", "charlie"]
+        assert sorted(snapshot.groups) == ["canonical", "empty"]
+        assert snapshot.complete is False
+
+        assert len(snapshot.memberships) == 1
+        assert snapshot.memberships[0].group == "canonical"
+        assert sorted(snapshot.memberships[0].users) == ["alice", "brianna"]
@@ -0,0 +1,33 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import pytest
+
+from postgresql_ldap_sync.models import SyncScope
+
+
+@pytest.mark.unit
+class TestSyncScope:
+    """Class to group all the SyncScope tests."""
+
+    def test_empty(self):
+        """Test the rejection of scopes without groups, nor a pattern."""
+        with pytest.raises(ValueError):
+            SyncScope()
+
+    def test_contains_groups(self):
+        """Test the contains method of a SyncScope, by group names."""
+        scope = SyncScope(groups=("canonical", "sdaia"))
+
+        assert scope.contains("canonical") is True
+        assert scope.contains("sdaia") is True
+        assert scope.contains("internal") is False
+
+    def test_contains_pattern(self):
+        """Test the contains method of a SyncScope, by wildcard pattern."""
+        scope = SyncScope(pattern="team_*.dev")
+
+        assert scope.contains("team_a.dev") is True
+        assert scope.contains("team_.dev") is True
+        assert scope.contains("teamXa.dev") is False
+        assert scope.contains("team_a.devs") is False
@@ -45,3 +45,13 @@ class TestUserMatch:
         assert match.should_create is False
         assert match.should_delete is False
         assert match.should_keep is True
+
+    def test_compact(self):
+        """Test the compact representation of a UserMatch."""
+        match = UserMatch(
+            name="sample-user",
+            exists_in_ldap=True,
+            exists_in_psql=True,
+        )
+
+        assert not hasattr(match, "__dict__")
@@ -0,0 +1,67 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import pytest
+
+from postgresql_ldap_sync.batcher import DefaultBatcher
+from postgresql_ldap_sync.models import GroupMembershipMatch, MembershipBatch
+
+
+def _grant_match(group: str, user: str) -> GroupMembershipMatch:
+    """Helper function to build a membership match to be granted."""
+    return GroupMembershipMatch(
+        user_name=user,
+        group_name=group,
+        exists_in_ldap=True,
+        exists_in_psql=False,
+    )
+
+
+@pytest.mark.unit
+class TestDefaultBatcher:
+    """Class to group all the DefaultBatcher tests."""
+
+    def test_invalid_batch_size(self):
+        """Test the rejection of non-positive batch sizes."""
+        with pytest.raises(ValueError):
+            DefaultBatcher(max_batch_size=0)
+
+    def test_batch_by_group(self):
+        """Test the batching of memberships of a single group."""
+        batcher = DefaultBatcher(max_batch_size=10)
+        matches = [_grant_match("canonical", user) for user in ["alice", "brianna", "charlie"]]
+
+        batches = list(batcher.batch_group_memberships(matches))
+
+        assert batches == [MembershipBatch(("canonical",), ("alice", "brianna", "charlie"))]
+
+    def test_batch_by_user_set(self):
+        """Test the batching of memberships of several groups sharing the same users."""
+        batcher = DefaultBatcher(max_batch_size=10)
+        matches = [
+            _grant_match("application", "alice"),
+            _grant_match("canonical", "alice"),
+            _grant_match("canonical", "brianna"),
+            _grant_match("sdaia", "alice"),
+        ]
+
+        batches = list(batcher.batch_group_memberships(matches))
+
+        assert len(batches) == 2
+        assert MembershipBatch(("application", "sdaia"), ("alice",)) in batches
+        assert MembershipBatch(("canonical",), ("alice", "brianna")) in batches
+
+    def test_batch_max_size(self):
+        """Test the splitting of batches exceeding the maximum size."""
+        batcher = DefaultBatcher(max_batch_size=4)
+        matches = [
+            _grant_match(group, user)
+            for group in ["application", "canonical"]
+            for user in ["alice", "brianna", "charlie"]
+        ]
+
+        batches = list(batcher.batch_group_memberships(matches))
+        batched = {(g, u) for batch in batches for g in batch.groups for u in batch.users}
+
+        assert all(batch.size <= 4 for batch in batches)
+        assert batched == {(m.group_name, m.user_name) for m in matches}
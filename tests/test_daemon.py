@@ -0,0 +1,78 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from unittest.mock import Mock
+
+import pytest
+
+from postgresql_ldap_sync.daemon import SyncDaemon
+
+
+def _build_daemon(synchronizer: Mock, **kwargs) -> SyncDaemon:
+    """Helper function to build a daemon around a mocked synchronizer."""
+    return SyncDaemon(
+        synchronizer=synchronizer,
+        user_actions=["CREATE"],
+        group_actions=["CREATE"],
+        member_actions=["GRANT"],
+        **kwargs,
+    )
+
+
+@pytest.mark.unit
+class TestSyncDaemon:
+    """Class to group all the SyncDaemon tests."""
+
+    def test_invalid_intervals(self):
+        """Test the rejection of invalid intervals."""
+        with pytest.raises(ValueError):
+            _build_daemon(Mock(), interval=10, max_interval=5)
+        with pytest.raises(ValueError):
+            _build_daemon(Mock(), jitter=1)
+
+    def test_next_interval(self):
+        """Test the adaptation of the interval to idle cycles and long durations."""
+        daemon = _build_daemon(Mock(), interval=10, max_interval=100, idle_backoff=2)
+
+        assert daemon._next_interval(duration=1, changes=5) == 10
+        assert daemon._next_interval(duration=1, changes=0) == 20
+        assert daemon._next_interval(duration=1, changes=0) == 40
+        assert daemon._next_interval(duration=1, changes=0) == 80
+        assert daemon._next_interval(duration=1, changes=0) == 100
+        assert daemon._next_interval(duration=5, changes=5) == 20
+
+    def test_run(self):
+        """Test the cycles run until stopped, surviving failed ones."""
+        synchronizer = Mock()
+        daemon = _build_daemon(synchronizer, interval=0.01, jitter=0)
+
+        def sync_all(*args, **kwargs) -> int:
+            if synchronizer.sync_all.call_count == 1:
+                raise RuntimeError("LDAP server down")
+            if synchronizer.sync_all.call_count == 3:
+                daemon.stop()
+            return 1
+
+        synchronizer.sync_all.side_effect = sync_all
+        daemon.run()
+
+        assert synchronizer.sync_all.call_count == 3
+
+    def test_run_listener(self):
+        """Test the sync of notified changes until stopped, restarting failed listeners."""
+        synchronizer = Mock()
+        daemon = _build_daemon(synchronizer, interval=0.01, jitter=0, listen=True)
+
+        def listen(*args, **kwargs):
+            if synchronizer.listen.call_count == 1:
+                raise RuntimeError("LDAP server down")
+
+            yield 5
+            daemon.stop()
+            yield 0
+
+        synchronizer.listen.side_effect = listen
+        daemon.run()
+
+        assert synchronizer.listen.call_count == 2
+        synchronizer.sync_all.assert_not_called()
@@ -3,7 +3,7 @@
 
 import pytest
 
-from postgresql_ldap_sync.matcher import DefaultMatcher
+from postgresql_ldap_sync.matcher import DefaultMatcher, SortedMatcher, VectorMatcher
 from postgresql_ldap_sync.models import GroupMembers
 
 
@@ -65,3 +65,156 @@ class TestDefaultMatcher:
         assert matches_dict["internal-operator"].should_revoke
         assert matches_dict["internal-replication"].should_revoke
         assert matches_dict["sdaia-daniel"].should_grant
+
+    def test_match_actionable_only(self):
+        """Test the skipping of matches to be kept, when only actionable ones are requested."""
+        matcher = DefaultMatcher(keep_matches=False)
+
+        user_matches = matcher.match_users(["alice", "brianna"], ["alice", "daniel"])
+        user_matches = {match.name: match for match in user_matches}
+
+        assert user_matches.keys() == {"brianna", "daniel"}
+        assert user_matches["brianna"].should_create
+        assert user_matches["daniel"].should_delete
+
+        member_matches = matcher.match_group_memberships(
+            [GroupMembers(group="application", users=["mattermost", "wordpress"])],
+            [GroupMembers(group="application", users=["mattermost", "discourse"])],
+        )
+        member_matches = {match.user_name: match for match in member_matches}
+
+        assert member_matches.keys() == {"discourse", "wordpress"}
+        assert member_matches["discourse"].should_revoke
+        assert member_matches["wordpress"].should_grant
+
+
+@pytest.mark.unit
+class TestSortedMatcher:
+    """Class to group all the SortedMatcher tests."""
+
+    @pytest.fixture(scope="class")
+    def matcher(self):
+        """Matcher object to be used throughout the tests."""
+        return SortedMatcher()
+
+    def test_match_users(self, matcher: SortedMatcher):
+        """Test the matching of sorted users between LDAP and PostgreSQL."""
+        ldap_users = ["alice", "brianna", "charlie"]
+        psql_users = ["alice", "daniel"]
+
+        matches = list(matcher.match_users(ldap_users, psql_users))
+        matches_dict = {match.name: match for match in matches}
+
+        assert [match.name for match in matches] == ["alice", "brianna", "charlie", "daniel"]
+        assert matches_dict["alice"].should_keep
+        assert matches_dict["brianna"].should_create
+        assert matches_dict["charlie"].should_create
+        assert matches_dict["daniel"].should_delete
+
+    def test_match_group_memberships(self, matcher: SortedMatcher):
+        """Test the matching of sorted memberships between LDAP and PostgreSQL."""
+        ldap_memberships = [
+            GroupMembers(group="application", users=["wordpress", "mattermost"]),
+            GroupMembers(group="sdaia", users=["daniel"]),
+        ]
+        psql_memberships = [
+            GroupMembers(group="application", users=["mattermost"]),
+            GroupMembers(group="internal", users=["operator"]),
+        ]
+
+        matches = matcher.match_group_memberships(ldap_memberships, psql_memberships)
+        matches_dict = {f"{match.group_name}-{match.user_name}": match for match in matches}
+
+        assert matches_dict["application-mattermost"].should_keep
+        assert matches_dict["application-wordpress"].should_grant
+        assert matches_dict["internal-operator"].should_revoke
+        assert matches_dict["sdaia-daniel"].should_grant
+
+    def test_match_unsorted(self):
+        """Test the rejection of unsorted entities, when flagged as pre-sorted."""
+        matcher = SortedMatcher(presorted=True)
+
+        with pytest.raises(ValueError):
+            list(matcher.match_users(["charlie", "alice"], ["alice"]))
+
+    def test_match_external_sort(self):
+        """Test the matching of unsorted entities, when sorting them externally."""
+        matcher = SortedMatcher(keep_matches=False, sort_chunk_size=2)
+
+        matches = matcher.match_groups(
+            ["sdaia", "canonical", "application", "canonical"],
+            ["internal", "application"],
+        )
+        matches_dict = {match.name: match for match in matches}
+
+        assert matches_dict.keys() == {"canonical", "internal", "sdaia"}
+        assert matches_dict["canonical"].should_create
+        assert matches_dict["internal"].should_delete
+
+
+@pytest.mark.unit
+class TestVectorMatcher:
+    """Class to group all the VectorMatcher tests."""
+
+    @pytest.fixture(scope="class")
+    def matcher(self):
+        """Matcher object to be used throughout the tests."""
+        pytest.importorskip("numpy")
+        return VectorMatcher()
+
+    def test_match_group_memberships(self, matcher: VectorMatcher):
+        """Test the matching of memberships between LDAP and PostgreSQL."""
+        ldap_memberships = [
+            GroupMembers(group="application", users=["mattermost", "wordpress"]),
+            GroupMembers(group="canonical", users=["alice", "brianna"]),
+        ]
+        psql_memberships = [
+            GroupMembers(group="application", users=["mattermost"]),
+            GroupMembers(group="internal", users=["operator", "replication"]),
+        ]
+
+        matches = list(matcher.match_group_memberships(ldap_memberships, psql_memberships))
+        matches_dict = {f"{match.group_name}-{match.user_name}": match for match in matches}
+
+        assert len(matches) == 6
+        assert matches_dict["application-mattermost"].should_keep
+        assert matches_dict["application-wordpress"].should_grant
+        assert matches_dict["canonical-alice"].should_grant
+        assert matches_dict["canonical-brianna"].should_grant
+        assert matches_dict["internal-operator"].should_revoke
+        assert matches_dict["internal-replication"].should_revoke
+
+    def test_match_empty_memberships(self, matcher: VectorMatcher):
+        """Test the matching of memberships when one of the sides has no membership edges."""
+        memberships = [GroupMembers(group="application", users=["mattermost"])]
+
+        grant_matches = list(matcher.match_group_memberships(memberships, []))
+        revoke_matches = list(matcher.match_group_memberships([], memberships))
+
+        assert len(grant_matches) == 1
+        assert grant_matches[0].should_grant
+        assert len(revoke_matches) == 1
+        assert revoke_matches[0].should_revoke
+
+    def test_match_empty_groups(self, matcher: VectorMatcher):
+        """Test the matching of memberships when the groups have no users."""
+        ldap_memberships = [GroupMembers(group="application", users=[])]
+        psql_memberships = [GroupMembers(group="internal", users=[])]
+
+        assert list(matcher.match_group_memberships(ldap_memberships, psql_memberships)) == []
+        assert list(matcher.match_group_memberships([], [])) == []
+
+    def test_match_actionable_only(self):
+        """Test the skipping of matches to be kept, when only actionable ones are requested."""
+        pytest.importorskip("numpy")
+        matcher = VectorMatcher(keep_matches=False)
+
+        member_matches = matcher.match_group_memberships(
+            [GroupMembers(group="application", users=["mattermost", "wordpress"])],
+            [GroupMembers(group="application", users=["mattermost", "discourse"])],
+        )
+        member_matches = {match.user_name: match for match in member_matches}
+
+        assert member_matches.keys() == {"discourse", "wordpress"}
+        assert member_matches["discourse"].should_revoke
+        assert member_matches["wordpress"].should_grant
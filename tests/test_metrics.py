@@ -0,0 +1,119 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from psycopg2.sql import SQL, Identifier
+
+from postgresql_ldap_sync.clients import DummyLDAPClient, DummyPostgresClient
+from postgresql_ldap_sync.clients.psql.postgres import DefaultPostgresExecutor
+from postgresql_ldap_sync.matcher import DefaultMatcher, SortedMatcher
+from postgresql_ldap_sync.metrics import NoopMetrics, PrometheusMetrics
+from postgresql_ldap_sync.models import GroupMembers
+from postgresql_ldap_sync.syncher import Synchronizer
+
+
+@pytest.mark.unit
+class TestPrometheusMetrics:
+    """Class to group all the PrometheusMetrics tests."""
+
+    def test_export(self):
+        """Test the export of counters and summaries in the Prometheus text format."""
+        metrics = PrometheusMetrics(namespace="test")
+        metrics.increment("sql_statements_total", kind="CREATE")
+        metrics.increment("sql_statements_total", 2, kind="CREATE")
+        metrics.observe("sql_query_seconds", 0.5, kind="GRANT")
+        metrics.observe("sql_query_seconds", 1.5, kind="GRANT")
+        metrics.increment("ldap_entries_total", 3, base='o="quoted"')
+
+        assert metrics.export().splitlines() == [
+            "# TYPE test_ldap_entries_total counter",
+            'test_ldap_entries_total{base="o=\\"quoted\\""} 3',
+            "# TYPE test_sql_statements_total counter",
+            'test_sql_statements_total{kind="CREATE"} 3',
+            "# TYPE test_sql_query_seconds summary",
+            'test_sql_query_seconds_sum{kind="GRANT"} 2.0',
+            'test_sql_query_seconds_count{kind="GRANT"} 2',
+        ]
+
+    def test_timer(self):
+        """Test the observation of the elapsed time of a block."""
+        metrics = PrometheusMetrics(namespace="test")
+
+        with metrics.timer("sync_cycle_seconds"):
+            pass
+
+        assert "test_sync_cycle_seconds_count 1" in metrics.export()
+
+    def test_noop(self):
+        """Test the discarding of all metrics by default."""
+        metrics = NoopMetrics()
+        metrics.increment("sql_statements_total", kind="CREATE")
+
+        with metrics.timer("sync_cycle_seconds"):
+            pass
+
+        assert not metrics.enabled
+
+    def test_query_kinds(self):
+        """Test the classification of SQL statements by kind."""
+        create_query = SQL("CREATE ROLE {role}").format(role=Identifier("alice"))
+        drop_query = SQL("; ").join([
+            SQL("REASSIGN OWNED BY {role} TO admin").format(role=Identifier("alice")),
+            SQL("DROP OWNED BY {role}").format(role=Identifier("alice")),
+            SQL("DROP ROLE {role}").format(role=Identifier("alice")),
+        ])
+
+        assert DefaultPostgresExecutor._query_kinds(create_query) == ["CREATE"]
+        assert DefaultPostgresExecutor._query_kinds(drop_query) == ["REASSIGN", "DROP", "DROP"]
+
+    def test_pipeline(self):
+        """Test the recording of the pipelined statements, once their batch gets flushed."""
+        metrics = PrometheusMetrics(namespace="test")
+        connection = MagicMock()
+        connection.closed = 0
+
+        with patch("psycopg2.connect", return_value=connection):
+            executor = DefaultPostgresExecutor(
+                "localhost", "5432", "db", "user", "pass", metrics=metrics
+            )
+
+            with executor.pipeline():
+                executor.execute_query(SQL("CREATE ROLE alice"))
+                executor.execute_query(SQL("GRANT canonical TO alice"))
+                assert "sql_query_seconds" not in metrics.export()
+
+        exported = metrics.export()
+
+        assert 'test_sql_statements_total{kind="CREATE"} 1' in exported
+        assert 'test_sql_statements_total{kind="GRANT"} 1' in exported
+        assert 'test_sql_query_seconds_count{kind="BATCH"} 1' in exported
+
+    @pytest.mark.parametrize("matcher_class", [DefaultMatcher, SortedMatcher])
+    def test_sync_all(self, matcher_class: type[DefaultMatcher | SortedMatcher]):
+        """Test the recording of the cycle metrics by the synchronizer and matcher."""
+        metrics = PrometheusMetrics(namespace="test")
+        synchronizer = Synchronizer(
+            ldap_client=DummyLDAPClient(
+                users=["alice", "brianna"],
+                groups=["canonical"],
+                memberships=[GroupMembers(group="canonical", users=["alice", "brianna"])],
+            ),
+            psql_client=DummyPostgresClient(
+                users=["alice", "daniel"],
+                groups=["canonical"],
+                memberships=[GroupMembers(group="canonical", users=["alice"])],
+            ),
+            entity_matcher=matcher_class(metrics=metrics),
+            metrics=metrics,
+        )
+
+        synchronizer.sync_all(["CREATE"], ["CREATE"], ["GRANT"])
+        exported = metrics.export()
+
+        assert 'test_matches_total{action="CREATE",entity="users"} 1' in exported
+        assert 'test_matches_total{action="DELETE",entity="users"} 1' in exported
+        assert 'test_matches_total{action="GRANT",entity="memberships"} 1' in exported
+        assert "test_sync_cycle_seconds_count 1" in exported
+        assert 'test_sync_phase_seconds_count{phase="apply"} 1' in exported
@@ -0,0 +1,126 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import functools
+import os
+
+import pytest
+
+from postgresql_ldap_sync.clients import DummyLDAPClient, DummyPostgresClient
+from postgresql_ldap_sync.matcher import DefaultMatcher
+from postgresql_ldap_sync.models import GroupMembers
+from postgresql_ldap_sync.sharding import ShardedSynchronizer, shard_index
+
+
+class RecordingPostgresClient(DummyPostgresClient):
+    """Class to record the operations applied by every worker process."""
+
+    def __init__(self, path: str, **kwargs):
+        """Save the path of the file to record operations to."""
+        super().__init__(**kwargs)
+        self._path = path
+
+    def _record(self, operation: str, *names: str) -> None:
+        """Append an operation to the record file."""
+        with open(self._path, "a") as file:
+            file.write(f"{operation} {','.join(names)}\n")
+
+    def create_user(self, user: str) -> None:
+        """Create a user in PostgreSQL."""
+        self._record("CREATE", user)
+
+    def create_group(self, group: str) -> None:
+        """Create a group in PostgreSQL."""
+        self._record("CREATE", group)
+
+    def delete_users(self, users: list[str]) -> None:
+        """Delete a list of users in PostgreSQL."""
+        self._record("DELETE", *users)
+
+    def delete_groups(self, groups: list[str]) -> None:
+        """Delete a list of groups in PostgreSQL."""
+        self._record("DELETE", *groups)
+
+    def grant_group_memberships(self, groups: list[str], users: list[str]) -> None:
+        """Grant groups membership to a list of users."""
+        self._record("GRANT", *groups, *users)
+
+    def revoke_group_memberships(self, groups: list[str], users: list[str]) -> None:
+        """Revoke groups membership from a list of users."""
+        self._record("REVOKE", *groups, *users)
+
+    def close(self) -> None:
+        """Close the connections to the PostgreSQL instance."""
+        self._record("CLOSE", str(os.getpid()))
+
+
+@pytest.mark.unit
+class TestShardedSynchronizer:
+    """Class to group all the ShardedSynchronizer tests."""
+
+    def test_shard_index(self):
+        """Test the stability and range of the role name shards."""
+        assert shard_index("alice", 4) == shard_index("alice", 4)
+        assert all(0 <= shard_index(f"user-{i}", 4) < 4 for i in range(100))
+
+    def test_invalid_shards(self):
+        """Test the rejection of an invalid number of shards."""
+        with pytest.raises(ValueError):
+            ShardedSynchronizer(
+                ldap_client=DummyLDAPClient([], [], []),
+                psql_factory=functools.partial(DummyPostgresClient, [], [], []),
+                entity_matcher=DefaultMatcher(),
+                shards=-1,
+            )
+
+    def test_sync_all(self, tmp_path):
+        """Test the ordering of the phases across shards."""
+        path = str(tmp_path / "operations.txt")
+        ldap_client = DummyLDAPClient(
+            users=["alice", "brianna", "charlie"],
+            groups=["application", "canonical", "sdaia"],
+            memberships=[
+                GroupMembers(group="application", users=["mattermost", "wordpress"]),
+                GroupMembers(group="canonical", users=["alice", "brianna", "charlie"]),
+                GroupMembers(group="sdaia", users=["daniel"]),
+            ],
+        )
+        psql_factory = functools.partial(
+            RecordingPostgresClient,
+            path,
+            users=["alice", "daniel"],
+            groups=["application", "internal"],
+            memberships=[
+                GroupMembers(group="application", users=["mattermost"]),
+                GroupMembers(group="internal", users=["operator", "replication"]),
+            ],
+        )
+
+        synchronizer = ShardedSynchronizer(
+            ldap_client=ldap_client,
+            psql_factory=psql_factory,
+            entity_matcher=DefaultMatcher(),
+            shards=2,
+        )
+        changes = synchronizer.sync_all(
+            user_actions=["CREATE", "DELETE"],
+            group_actions=["CREATE", "DELETE"],
+            member_actions=["GRANT", "REVOKE"],
+        )
+
+        with open(path) as file:
+            operations = [line.split() for line in file]
+
+        closed = {name for operation, name in operations if operation == "CLOSE"}
+        operations = [operation for operation in operations if operation[0] != "CLOSE"]
+
+        kinds = [operation for operation, _ in operations]
+        created = {name for operation, name in operations if operation == "CREATE"}
+        deleted = {name for operation, name in operations if operation == "DELETE"}
+
+        assert kinds == sorted(kinds, key=["CREATE", "GRANT", "REVOKE", "DELETE"].index)
+        assert created == {"brianna", "charlie", "canonical", "sdaia"}
+        assert deleted == {"daniel", "internal"}
+        assert changes == 13
+        assert str(os.getpid()) in closed
+        assert len(closed) > 1
@@ -0,0 +1,30 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import random
+
+import pytest
+
+from postgresql_ldap_sync.sorting import external_sort
+
+
+@pytest.mark.unit
+class TestExternalSort:
+    """Class to group all the external_sort tests."""
+
+    def test_sort_in_memory(self):
+        """Test the sorting of a stream fitting within a single chunk."""
+        items = ["charlie", "alice", "brianna"]
+
+        assert list(external_sort(items, chunk_size=10)) == sorted(items)
+
+    def test_sort_spilled(self):
+        """Test the sorting of a stream spilling several runs to disk."""
+        items = [(f"group_{i % 7}", f"user_{i}") for i in range(100)]
+        random.Random(0).shuffle(items)
+
+        assert list(external_sort(items, chunk_size=8)) == sorted(items)
+
+    def test_sort_empty(self):
+        """Test the sorting of an empty stream."""
+        assert list(external_sort([], chunk_size=8)) == []
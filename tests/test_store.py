@@ -0,0 +1,85 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import pytest
+
+from postgresql_ldap_sync.models import GroupMembers, Snapshot, SyncState
+from postgresql_ldap_sync.store import SnapshotStore
+
+
+@pytest.mark.unit
+class TestSnapshotStore:
+    """Class to group all the SnapshotStore tests."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Store object to be used throughout the tests."""
+        return SnapshotStore(
+            directory=str(tmp_path),
+            ldap_base_dn="dc=glauth,dc=com",
+            psql_dsn="host=localhost port=5432 dbname=postgres",
+        )
+
+    @pytest.fixture
+    def state(self):
+        """State object to be used throughout the tests."""
+        return SyncState(
+            ldap_snapshot=Snapshot(
+                users=["charlie", "alice"],
+                groups=["canonical"],
+                memberships=[GroupMembers(group="canonical", users=["charlie", "alice"])],
+                watermark="20250101000000Z",
+            ),
+            psql_snapshot=Snapshot(
+                users=["alice"],
+                groups=[],
+                memberships=[],
+            ),
+            psql_checksum="checksum",
+            actions=["user_actions:CREATE"],
+        )
+
+    def test_load_missing(self, store: SnapshotStore):
+        """Test the loading of a state that was never saved."""
+        assert store.load() is None
+
+    def test_save_load(self, store: SnapshotStore, state: SyncState):
+        """Test the saving and loading of a state."""
+        store.save(state)
+        loaded = store.load()
+
+        assert loaded.psql_checksum == state.psql_checksum
+        assert loaded.actions == state.actions
+        assert loaded.ldap_snapshot.users == ["alice", "charlie"]
+        assert loaded.ldap_snapshot.watermark == state.ldap_snapshot.watermark
+        assert SnapshotStore.snapshots_equal(loaded.ldap_snapshot, state.ldap_snapshot)
+        assert SnapshotStore.snapshots_equal(loaded.psql_snapshot, state.psql_snapshot)
+
+    def test_load_truncated(self, store: SnapshotStore, state: SyncState):
+        """Test the loading of a state whose file got truncated."""
+        store.save(state)
+
+        with open(store._path, "rb") as file:
+            data = file.read()
+        with open(store._path, "wb") as file:
+            file.write(data[: len(data) // 2])
+
+        assert store.load() is None
+
+    def test_clear(self, store: SnapshotStore, state: SyncState):
+        """Test the removal of a saved state."""
+        store.save(state)
+        store.clear()
+
+        assert store.load() is None
+
+    def test_snapshots_equal(self, state: SyncState):
+        """Test the comparison of snapshots, regardless of their ordering."""
+        snapshot = Snapshot(
+            users=["alice", "charlie"],
+            groups=["canonical"],
+            memberships=[GroupMembers(group="canonical", users=["alice", "charlie"])],
+        )
+
+        assert SnapshotStore.snapshots_equal(snapshot, state.ldap_snapshot)
+        assert not SnapshotStore.snapshots_equal(snapshot, state.psql_snapshot)
@@ -1,16 +1,39 @@
 # Copyright 2025 Canonical Ltd.
 # See LICENSE file for licensing details.
 
-from unittest.mock import patch
+from contextlib import nullcontext
+from dataclasses import FrozenInstanceError
+from unittest.mock import Mock, patch
 
 import pytest
 
 from postgresql_ldap_sync.clients import DummyLDAPClient, DummyPostgresClient
-from postgresql_ldap_sync.matcher import DefaultMatcher
-from postgresql_ldap_sync.models import GroupMembers
+from postgresql_ldap_sync.matcher import DefaultMatcher, SortedMatcher
+from postgresql_ldap_sync.models import GroupMembers, Snapshot, SyncScope
+from postgresql_ldap_sync.store import SnapshotStore
 from postgresql_ldap_sync.syncher import Synchronizer
 
 
+class IncrementalLDAPClient(DummyLDAPClient):
+    """Class to simplify the testing of incremental synchronizations."""
+
+    def search_snapshot(self) -> Snapshot:
+        """Search for LDAP users, groups and group memberships at once."""
+        snapshot = super().search_snapshot()
+        snapshot.watermark = "20250101000000Z"
+        return snapshot
+
+    def search_changes(self, since: str) -> Snapshot:
+        """Search for LDAP users, groups and group memberships changed since a watermark."""
+        return Snapshot(
+            users=["alice"],
+            groups=["canonical"],
+            memberships=[GroupMembers(group="canonical", users=["alice"])],
+            watermark=None,
+            complete=False,
+        )
+
+
 @pytest.mark.unit
 class TestSynchronizer:
     """Class to group all the Synchronizer tests."""
@@ -46,49 +69,49 @@ class TestSynchronizer:
         """Test the creation / deletion of LDAP users into PostgreSQL."""
         with (
             patch.object(synchronizer._psql_client, "create_user") as create_user,
-            patch.object(synchronizer._psql_client, "delete_user") as delete_user,
+            patch.object(synchronizer._psql_client, "delete_users") as delete_users,
         ):
             synchronizer.sync_users(actions=["CREATE"])
             create_user.assert_called()
-            delete_user.assert_not_called()
+            delete_users.assert_not_called()
 
             create_user.reset_mock()
-            delete_user.reset_mock()
+            delete_users.reset_mock()
 
             synchronizer.sync_users(actions=["DELETE"])
             create_user.assert_not_called()
-            delete_user.assert_called()
+            delete_users.assert_called()
 
             create_user.reset_mock()
-            delete_user.reset_mock()
+            delete_users.reset_mock()
 
             synchronizer.sync_users(actions=["CREATE", "DELETE"])
             create_user.assert_called()
-            delete_user.assert_called()
+            delete_users.assert_called()
 
     def test_sync_groups(self, synchronizer: Synchronizer):
         """Test the creation / deletion of LDAP groups into PostgreSQL."""
         with (
             patch.object(synchronizer._psql_client, "create_group") as create_group,
-            patch.object(synchronizer._psql_client, "delete_group") as delete_group,
+            patch.object(synchronizer._psql_client, "delete_groups") as delete_groups,
         ):
             synchronizer.sync_groups(actions=["CREATE"])
             create_group.assert_called()
-            delete_group.assert_not_called()
+            delete_groups.assert_not_called()
 
             create_group.reset_mock()
-            delete_group.reset_mock()
+            delete_groups.reset_mock()
 
             synchronizer.sync_groups(actions=["DELETE"])
             create_group.assert_not_called()
-            delete_group.assert_called()
+            delete_groups.assert_called()
 
             create_group.reset_mock()
-            delete_group.reset_mock()
+            delete_groups.reset_mock()
 
             synchronizer.sync_groups(actions=["CREATE", "DELETE"])
             create_group.assert_called()
-            delete_group.assert_called()
+            delete_groups.assert_called()
 
     def test_sync_group_memberships(self, synchronizer: Synchronizer):
         """Test the creation / deletion of LDAP memberships into PostgreSQL."""
@@ -113,3 +136,349 @@ class TestSynchronizer:
             synchronizer.sync_group_memberships(actions=["GRANT", "REVOKE"])
             grant_member.assert_called()
             revoke_member.assert_called()
+
+    def test_sync_group_memberships_batched(self, synchronizer: Synchronizer):
+        """Test the batching of LDAP memberships granted into PostgreSQL."""
+        with patch.object(synchronizer._psql_client, "grant_group_memberships") as grant_member:
+            synchronizer.sync_group_memberships(actions=["GRANT"])
+
+            assert grant_member.call_count == 3
+            grant_member.assert_any_call(["canonical"], ["alice", "brianna", "charlie"])
+
+    def test_sync_all(self, synchronizer: Synchronizer):
+        """Test the creation / deletion of LDAP entities into PostgreSQL, in dependency order."""
+        manager = Mock()
+        psql_client = synchronizer._psql_client
+
+        with (
+            patch.object(psql_client, "create_user", manager.create_user),
+            patch.object(psql_client, "create_group", manager.create_group),
+            patch.object(psql_client, "delete_users", manager.delete_users),
+            patch.object(psql_client, "delete_groups", manager.delete_groups),
+            patch.object(psql_client, "grant_group_memberships", manager.grant),
+            patch.object(psql_client, "revoke_group_memberships", manager.revoke),
+        ):
+            synchronizer.sync_all(
+                user_actions=["CREATE", "DELETE"],
+                group_actions=["CREATE", "DELETE"],
+                member_actions=["GRANT", "REVOKE"],
+            )
+
+        call_names = [name for name, _, _ in manager.mock_calls]
+        call_order = [name for i, name in enumerate(call_names) if name not in call_names[:i]]
+
+        assert call_order == [
+            "create_user",
+            "create_group",
+            "grant",
+            "revoke",
+            "delete_users",
+            "delete_groups",
+        ]
+
+        manager.delete_users.assert_called_once_with(["daniel"])
+        manager.delete_groups.assert_called_once_with(["internal"])
+
+    def test_sync_all_sorted(self, synchronizer: Synchronizer):
+        """Test the sync of unsorted snapshots with a sorted matcher, as with the default one."""
+        sorted_synchronizer = Synchronizer(
+            ldap_client=synchronizer._ldap_client,
+            psql_client=synchronizer._psql_client,
+            entity_matcher=SortedMatcher(),
+        )
+
+        actions = {
+            "user_actions": ["CREATE", "DELETE"],
+            "group_actions": ["CREATE", "DELETE"],
+            "member_actions": ["GRANT", "REVOKE"],
+        }
+
+        with (
+            patch.object(synchronizer._psql_client, "search_snapshot") as search_snapshot,
+            patch.object(synchronizer._psql_client, "create_user"),
+            patch.object(synchronizer._psql_client, "create_group"),
+            patch.object(synchronizer._psql_client, "delete_users") as delete_users,
+            patch.object(synchronizer._psql_client, "delete_groups"),
+            patch.object(synchronizer._psql_client, "grant_group_memberships"),
+            patch.object(synchronizer._psql_client, "revoke_group_memberships"),
+        ):
+            search_snapshot.return_value = Snapshot(
+                users=["daniel", "alice"],
+                groups=["internal", "application"],
+                memberships=[
+                    GroupMembers(group="internal", users=["replication", "operator"]),
+                    GroupMembers(group="application", users=["mattermost"]),
+                ],
+            )
+
+            changes = synchronizer.sync_all(**actions)
+            delete_users.reset_mock()
+            sorted_changes = sorted_synchronizer.sync_all(**actions)
+
+        assert sorted_changes == changes
+        delete_users.assert_called_once_with(["daniel"])
+
+    def test_sync_scoped(self, synchronizer: Synchronizer):
+        """Test the sync of the LDAP groups within a scope, deferring deletions."""
+        psql_client = synchronizer._psql_client
+        scope = SyncScope(groups=("canonical",), pattern="app*")
+
+        with (
+            patch.object(psql_client, "create_user") as create_user,
+            patch.object(psql_client, "create_group") as create_group,
+            patch.object(psql_client, "delete_users") as delete_users,
+            patch.object(psql_client, "delete_groups") as delete_groups,
+            patch.object(psql_client, "grant_group_memberships"),
+            patch.object(psql_client, "revoke_group_memberships"),
+        ):
+            changes = synchronizer.sync_scoped(
+                scope,
+                user_actions=["CREATE", "DELETE"],
+                group_actions=["CREATE", "DELETE"],
+                member_actions=["GRANT", "REVOKE"],
+            )
+
+        assert changes == 8
+        assert sorted(c.args[0] for c in create_user.call_args_list) == [
+            "brianna",
+            "charlie",
+            "wordpress",
+        ]
+        create_group.assert_called_once_with("canonical")
+        delete_users.assert_not_called()
+        delete_groups.assert_not_called()
+
+    def test_plan(self, synchronizer: Synchronizer):
+        """Test the planning of a sync, and its later execution."""
+        plan = synchronizer.plan(
+            user_actions=["CREATE", "DELETE"],
+            group_actions=["CREATE", "DELETE"],
+            member_actions=["GRANT", "REVOKE"],
+        )
+
+        assert plan.counts == {
+            "create_users": 2,
+            "create_groups": 2,
+            "grant_memberships": 5,
+            "revoke_memberships": 2,
+            "delete_users": 1,
+            "delete_groups": 1,
+        }
+        assert plan.changes == 13
+
+        manager = Mock()
+        psql_client = synchronizer._psql_client
+
+        with (
+            patch.object(psql_client, "create_user", manager.create_user),
+            patch.object(psql_client, "delete_users", manager.delete_users),
+        ):
+            synchronizer.execute(plan)
+
+        assert manager.create_user.call_count == 2
+        manager.delete_users.assert_called_once_with(["daniel"])
+
+    def test_plan_immutable(self, synchronizer: Synchronizer):
+        """Test the immutability of a plan, down to its membership batches."""
+        plan = synchronizer.plan(
+            user_actions=["CREATE"],
+            group_actions=["CREATE"],
+            member_actions=["GRANT"],
+        )
+
+        with pytest.raises(FrozenInstanceError):
+            plan.grant_batches[0].users = ()
+
+        assert isinstance(plan.grant_batches[0].users, tuple)
+
+    def test_plan_unrecorded(self, synchronizer: Synchronizer):
+        """Test the planning of a sync, when the PostgreSQL client cannot record changes."""
+        psql_client = synchronizer._psql_client
+
+        with (
+            patch.object(psql_client, "record", return_value=nullcontext(None)),
+            patch.object(psql_client, "create_user") as create_user,
+        ):
+            plan = synchronizer.plan(
+                user_actions=["CREATE"],
+                group_actions=["CREATE"],
+                member_actions=["GRANT"],
+            )
+
+        create_user.assert_not_called()
+        assert sorted(plan.create_users) == ["brianna", "charlie"]
+        assert plan.statements == ()
+        assert plan.cost is None
+
+    def test_execute_throttled(self, synchronizer: Synchronizer):
+        """Test the pacing of every applied operation by the throttler."""
+        throttler = Mock()
+        synchronizer = Synchronizer(
+            ldap_client=synchronizer._ldap_client,
+            psql_client=synchronizer._psql_client,
+            entity_matcher=DefaultMatcher(),
+            apply_throttler=throttler,
+        )
+
+        plan = synchronizer.plan(
+            user_actions=["CREATE", "DELETE"],
+            group_actions=["CREATE", "DELETE"],
+            member_actions=["GRANT", "REVOKE"],
+        )
+        synchronizer.execute(plan)
+
+        steps = len(plan.create_users) + len(plan.create_groups) + 2
+        steps += len(plan.grant_batches) + len(plan.revoke_batches)
+
+        assert throttler.throttle.call_count == steps
+        assert throttler.observe.call_count == steps
+
+    def test_sync_all_incremental(self, synchronizer: Synchronizer):
+        """Test the incremental sync of LDAP entities, with periodic full reconciliations."""
+        synchronizer = Synchronizer(
+            ldap_client=IncrementalLDAPClient(
+                users=synchronizer._ldap_client._users,
+                groups=synchronizer._ldap_client._groups,
+                memberships=synchronizer._ldap_client._group_memberships,
+            ),
+            psql_client=synchronizer._psql_client,
+            entity_matcher=DefaultMatcher(),
+            full_sync_interval=1,
+        )
+
+        actions = {
+            "user_actions": ["CREATE", "DELETE"],
+            "group_actions": ["CREATE", "DELETE"],
+            "member_actions": ["GRANT", "REVOKE"],
+            "incremental": True,
+        }
+
+        with (
+            patch.object(synchronizer._psql_client, "delete_users") as delete_users,
+            patch.object(synchronizer._psql_client, "grant_group_memberships") as grant_member,
+        ):
+            synchronizer.sync_all(**actions)
+            delete_users.assert_called_once()
+
+            delete_users.reset_mock()
+            grant_member.reset_mock()
+
+            synchronizer.sync_all(**actions)
+            delete_users.assert_not_called()
+            grant_member.assert_called_once_with(["canonical"], ["alice"])
+
+            delete_users.reset_mock()
+
+            synchronizer.sync_all(**actions)
+            delete_users.assert_called_once()
+
+    def test_listen(self, synchronizer: Synchronizer):
+        """Test the sync of notified LDAP changes, after a complete reconciliation."""
+        synchronizer = Synchronizer(
+            ldap_client=IncrementalLDAPClient(
+                users=synchronizer._ldap_client._users,
+                groups=synchronizer._ldap_client._groups,
+                memberships=synchronizer._ldap_client._group_memberships,
+            ),
+            psql_client=synchronizer._psql_client,
+            entity_matcher=DefaultMatcher(),
+        )
+
+        with (
+            patch("time.sleep"),
+            patch.object(synchronizer._psql_client, "delete_users") as delete_users,
+            patch.object(synchronizer._psql_client, "grant_group_memberships") as grant_member,
+        ):
+            changes = synchronizer.listen(
+                user_actions=["CREATE", "DELETE"],
+                group_actions=["CREATE", "DELETE"],
+                member_actions=["GRANT", "REVOKE"],
+            )
+
+            assert next(changes) == 13
+            delete_users.assert_called_once()
+
+            grant_member.reset_mock()
+
+            assert next(changes) == 2
+            grant_member.assert_called_once_with(["canonical"], ["alice"])
+
+    def test_sync_snapshot_empty(self, synchronizer: Synchronizer):
+        """Test the skipping of empty partial snapshots, without searching PostgreSQL."""
+        snapshot = Snapshot(users=[], groups=[], memberships=[], complete=False)
+
+        with patch.object(synchronizer._psql_client, "search_snapshot") as search_snapshot:
+            changes = synchronizer.sync_snapshot(snapshot, ["CREATE"], ["CREATE"], ["GRANT"])
+
+        assert changes == 0
+        search_snapshot.assert_not_called()
+
+    @pytest.fixture
+    def stored_synchronizer(self, synchronizer: Synchronizer, tmp_path) -> Synchronizer:
+        """Synchronizer object, persisting its state on a snapshot store."""
+        return Synchronizer(
+            ldap_client=synchronizer._ldap_client,
+            psql_client=synchronizer._psql_client,
+            entity_matcher=DefaultMatcher(),
+            snapshot_store=SnapshotStore(str(tmp_path), "dc=glauth,dc=com", "dbname=postgres"),
+        )
+
+    def test_sync_all_stored(self, stored_synchronizer: Synchronizer):
+        """Test the skipping of unchanged sync cycles, once converged, using a snapshot store."""
+        actions = {
+            "user_actions": ["CREATE"],
+            "group_actions": ["CREATE"],
+            "member_actions": ["GRANT"],
+        }
+
+        ldap_snapshot = stored_synchronizer._ldap_client.search_snapshot()
+        psql_client = stored_synchronizer._psql_client
+        psql_snapshots = [
+            psql_client.search_snapshot(),
+            Snapshot(
+                users=[*ldap_snapshot.users, "daniel"],
+                groups=ldap_snapshot.groups,
+                memberships=ldap_snapshot.memberships,
+            ),
+        ]
+
+        with (
+            patch.object(psql_client, "search_checksum", return_value="checksum"),
+            patch.object(psql_client, "search_snapshot", side_effect=psql_snapshots) as search,
+            patch.object(psql_client, "create_user") as create_user,
+            patch.object(psql_client, "delete_users") as delete_users,
+        ):
+            assert stored_synchronizer.sync_all(**actions) > 0
+            assert stored_synchronizer.sync_all(**actions) == 0
+            assert search.call_count == 2
+
+            create_user.reset_mock()
+            search.reset_mock()
+
+            assert stored_synchronizer.sync_all(**actions) == 0
+            create_user.assert_not_called()
+            search.assert_not_called()
+
+            stored_synchronizer.sync_all(**(actions | {"user_actions": ["CREATE", "DELETE"]}))
+            delete_users.assert_called_once_with(["daniel"])
+            search.assert_not_called()
+
+    def test_sync_all_stored_unconverged(self, stored_synchronizer: Synchronizer):
+        """Test the retrying of changes not reflected on PostgreSQL, using a snapshot store."""
+        actions = {
+            "user_actions": ["CREATE"],
+            "group_actions": ["CREATE"],
+            "member_actions": ["GRANT"],
+        }
+
+        psql_client = stored_synchronizer._psql_client
+
+        with (
+            patch.object(psql_client, "search_checksum", return_value="checksum"),
+            patch.object(psql_client, "create_user") as create_user,
+        ):
+            changes = [stored_synchronizer.sync_all(**actions) for _ in range(3)]
+
+        assert changes[0] > 0
+        assert changes == [changes[0]] * 3
+        assert create_user.call_count == 6
@@ -0,0 +1,64 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from unittest.mock import patch
+
+import pytest
+
+from postgresql_ldap_sync.throttler import DefaultThrottler
+
+
+@pytest.mark.unit
+class TestDefaultThrottler:
+    """Class to group all the DefaultThrottler tests."""
+
+    def test_invalid_rates(self):
+        """Test the rejection of invalid rates and factors."""
+        with pytest.raises(ValueError):
+            DefaultThrottler(max_rate=1, min_rate=10)
+        with pytest.raises(ValueError):
+            DefaultThrottler(backoff_factor=2)
+
+    def test_throttle(self):
+        """Test the pacing of the operations by the current rate."""
+        throttler = DefaultThrottler(max_rate=10)
+
+        with (
+            patch("time.monotonic", return_value=100.0),
+            patch("time.sleep") as sleep,
+        ):
+            throttler.throttle()
+            throttler.throttle()
+            throttler.throttle()
+
+        assert [call.args[0] for call in sleep.call_args_list] == pytest.approx([0.1, 0.2])
+
+    def test_observe_latency(self):
+        """Test the backoff and recovery of the rate, based on the operations latency."""
+        throttler = DefaultThrottler(max_rate=100, min_rate=10, max_latency=0.5)
+
+        throttler.observe(latency=1.0)
+        assert throttler.rate == 50
+        throttler.observe(latency=1.0)
+        throttler.observe(latency=1.0)
+        assert throttler.rate == 12.5
+        throttler.observe(latency=1.0)
+        assert throttler.rate == 10
+
+        for _ in range(100):
+            throttler.observe(latency=0.1)
+        assert throttler.rate == 100
+
+    def test_observe_lock_waits(self):
+        """Test the backoff of the rate, based on the periodically checked lock waits."""
+        throttler = DefaultThrottler(max_rate=100, max_lock_waits=2, lock_check_interval=2)
+        lock_waits = iter([5, 0])
+
+        throttler.observe(latency=0.1, lock_waits_func=lambda: next(lock_waits))
+        assert throttler.rate == 100
+        throttler.observe(latency=0.1, lock_waits_func=lambda: next(lock_waits))
+        assert throttler.rate == 50
+        throttler.observe(latency=0.1, lock_waits_func=lambda: next(lock_waits))
+        assert throttler.rate == pytest.approx(55)
+        throttler.observe(latency=0.1, lock_waits_func=lambda: next(lock_waits))
+        assert throttler.rate == pytest.approx(60.5)